@@ -0,0 +1,116 @@
+"""
+Performance benchmarks for the simulation core.
+
+Run from the repository root:
+
+    python benchmarks/benchmark.py --final-time 2
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# make the package root importable
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, REPO_ROOT.as_posix())
+
+import numpy as np
+
+from main import load_configurations
+from src.simulation import dynamics
+from src.simulation.integrate import INTEGRATION_METHODS, solve_step
+from src.simulation.precision import PRECISION_DRIFT_TOLERANCE, measure_precision_drift
+
+
+def benchmark_precision(configs: list[dict[str, Any]]) -> None:
+    """Report memory, step time and drift of float32 against float64 for every network configuration."""
+    print("== Precision: float64 reference vs float32 network/logging ==")
+    for config in configs:
+        if config['ID'] == "Proportional": continue
+        report = measure_precision_drift(config)
+        status = "ok" if report['relative_rms_drift'] <= PRECISION_DRIFT_TOLERANCE else "DRIFT"
+        print(f"{config['ID']}:")
+        print(f"  memory     float64 {report['memory_bytes_float64'] / 2**20:10.2f} MiB | float32 {report['memory_bytes_float32'] / 2**20:10.2f} MiB")
+        print(f"  step time  float64 {report['step_time_float64'] * 1e3:10.3f} ms  | float32 {report['step_time_float32'] * 1e3:10.3f} ms")
+        print(f"  RMS error  float64 {report['rms_tracking_error_float64']:.6f} | float32 {report['rms_tracking_error_float32']:.6f} "
+              f"| relative drift {report['relative_rms_drift']:.2e} ({status})")
+        print(f"  max weight drift {report['max_weight_drift']:.2e}")
+
+
+# Modules each CLI subcommand imports before doing any work, and the heavy dependencies to watch
+STARTUP_PROBES = {
+    'main.py --help': 'main.build_parser()',
+    'run --no-plot': 'import src.simulation.runner',
+    'plot': 'import src.visualization.plotter',
+    'export': 'import src.visualization.export',
+    'sweep': 'import src.simulation.scheduler',
+}
+HEAVY_MODULES = ('scipy', 'pandas', 'matplotlib', 'scienceplots')
+
+
+def benchmark_startup(repeats: int = 5) -> None:
+    """Report the import time of every CLI subcommand in a fresh interpreter and which heavy modules it loads."""
+    print("== Startup: imports per CLI subcommand (fresh interpreter, median) ==")
+    for name, extra_import in STARTUP_PROBES.items():
+        probe = (f"import sys, time; start = time.perf_counter(); import main; {extra_import}; "
+                 f"print(time.perf_counter() - start, *[m in sys.modules for m in {HEAVY_MODULES!r}])")
+        samples, loaded = [], []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', probe], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.split()
+            samples.append(float(output[0]))
+            loaded = [module for module, flag in zip(HEAVY_MODULES, output[1:]) if flag == 'True']
+        print(f"  {name:<16} {statistics.median(samples) * 1e3:8.1f} ms  loads: {', '.join(loaded) or '-'}")
+
+
+# Target settings for the integrator comparison: the defaults and parameter regimes with a fast, stiff mode
+STIFF_SETTINGS: list[tuple[str, dict[str, Any]]] = [
+    ('chua', {}),
+    ('chua', {'alpha': 1e5}),
+    ('trophic_dynamics', {}),
+    ('trophic_dynamics', {'r_h': 1e5}),
+]
+
+
+def benchmark_stiff(final_time: float, time_step_delta: float = 0.01) -> None:
+    """Integrate the target with every method and report internal steps, evaluations, wall time and deviation from RK45."""
+    print("== Stiff targets: explicit RK45 vs implicit methods with analytic Jacobians ==")
+    time_steps = int(final_time / time_step_delta)
+    for dynamics_type, parameters in STIFF_SETTINGS:
+        dynamics_function = dynamics.get_dynamics_function(dynamics_type, parameters)
+        jacobian_function = dynamics.get_jacobian_function(dynamics_type, parameters)
+        print(f"{dynamics_type} {parameters or '(defaults)'}:")
+        reference = None
+        for method in INTEGRATION_METHODS:
+            state = np.array(dynamics.get_initial_conditions(dynamics_type))
+            internal_steps = evaluations = jacobians = 0
+            start = time.perf_counter()
+            for step in range(1, time_steps):
+                sol = solve_step(state, step, time_step_delta, lambda t, y: dynamics_function(y), method, lambda t, y: jacobian_function(y))
+                state = sol.y[:, -1]
+                internal_steps += len(sol.t) - 1
+                evaluations += sol.nfev
+                jacobians += sol.njev
+            elapsed = time.perf_counter() - start
+            if reference is None: reference = state
+            deviation = np.max(np.abs(state - reference) / np.maximum(np.abs(reference), 1.0))
+            print(f"  {method:<6} {elapsed:8.3f} s | {internal_steps:8d} steps | {evaluations:9d} f evals | {jacobians:6d} J evals | deviation {deviation:.1e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--final-time", type=float, default=2.0, help="Simulated seconds per benchmark run")
+    parser.add_argument("--sections", nargs='+', choices=('startup', 'precision', 'stiff'), default=['startup', 'precision', 'stiff'], help="Benchmarks to run")
+    args = parser.parse_args()
+    if 'startup' in args.sections: benchmark_startup()
+    if 'stiff' in args.sections: benchmark_stiff(args.final_time)
+    if 'precision' in args.sections:
+        configs = [{**config, 'final_time': args.final_time} for config in load_configurations()]
+        benchmark_precision(configs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,62 @@
+"""
+Online adaptive ResNet control simulations.
+
+    python main.py                                   run configurations/ and plot
+    python main.py run --config configs/ --no-plot   headless batch run
+    python main.py plot --output-dir simulation_data
+    python main.py live --output-dir simulation_data   watch a running simulation
+    python main.py export --format png --format pdf    write every figure to simulation_data/figures
+    python main.py sweep --scenario chua --scenario trophic_dynamics --workers 4
+    python main.py catalog --metric final_fae --dynamics-type chua   rank cataloged runs
+"""
+
 from __future__ import annotations
 
+import argparse
 import json
-import os
 from pathlib import Path
-from typing import Any
-
-import numpy as np
-from numpy.typing import NDArray
-
-from src.core.entity import Agent, Target
-from src.io.data_manager import close_all_files, save_nn_to_csv, save_state_to_csv
-from src.simulation import dynamics
-from src.visualization.plotter import results
-
-
-def run_simulation_from_configs(configs: list[dict[str, Any]]) -> None:
-    base_config = configs[0]
-    
-    # Setup simulation parameters
-    final_time: float = base_config['final_time']
-    time_step_delta: float = base_config['time_step_delta']
-    time_steps: int = int(final_time / time_step_delta)
-    num_states: int = base_config['num_states']
-    np.random.seed(base_config['seed'])
-    dynamics_type = base_config['dynamics_type']
-    target_position = np.array(dynamics.get_initial_conditions(dynamics_type))
-    target: Target = Target(target_position, time_steps, base_config)
-
-    # Initialize agents from all configurations
-    agents: list[Agent] = []
-    for config in configs:
-        agent_position: NDArray[np.float64] = np.zeros(num_states)
-        agent: Agent = Agent(agent_position, time_steps, config, target, config['ID'])
-        agents.append(agent)
-
-    # Main simulation loop
-    for step in range(1, time_steps):
-        # Update all agents
-        for agent in agents: agent.compute_control_output(step)
-        for agent in agents: agent.update_dynamics(step)
-        target.update_dynamics(step)
-
-        # Save data
-        time_sim: float = step * time_step_delta
-        save_state_to_csv(step, time_sim, agents, target)
-        save_nn_to_csv(step, time_sim, agents)
-
-        # Progress display
-        print(f'Progress: {step / time_steps * 100:6.2f}%', end='\r', flush=True)
-
-    print("\nSimulation completed.")
-    close_all_files()
+from typing import TYPE_CHECKING, Any, Optional
+
+# Simulation (scipy) and plotting (matplotlib, pandas) modules are imported by the functions that
+# need them, so `plot` never loads the integrator and headless runs never load matplotlib
+if TYPE_CHECKING:
+    from src.core.entity import Agent, Target
+    from src.io.data_manager import RunLogger
+
+CONFIG_DIR = 'configurations'
+BASELINE_CONFIG_FILE = 'config_common.json'
+
+
+def run_simulation_from_configs(configs: list[dict[str, Any]], target: Optional[Target] = None, logger: Optional[RunLogger] = None) -> list[Agent]:
+    from src.simulation.runner import run_simulation_from_configs as run_configs
+    return run_configs(configs, target, logger)
 
 def run_simulation(config: dict[str, Any]) -> None:
     run_simulation_from_configs([config])
 
+def results(max_points: int | None = None, method: str = 'minmax', envelope: bool = False) -> None:
+    from src.visualization.plotter import results as plot_results
+    plot_results(max_points, method, envelope)
+
 def run_simulation_with_results(config: dict[str, Any]) -> None:
     run_simulation(config)
     results()
 
-def load_configurations() -> list[dict[str, Any]]:
-    config_dir = Path("configurations")
-    config_files = list(config_dir.glob("*.json"))
-    baseline_file = config_dir / "config_common.json"
+def load_configurations(config_path: str | Path = CONFIG_DIR) -> list[dict[str, Any]]:
+    """Load agent configurations from a directory of JSON files or a single JSON file.
+
+    A `config_common.json` in the same directory is merged under every agent configuration.
+    """
+    config_path = Path(config_path)
+    config_dir = config_path if config_path.is_dir() else config_path.parent
+    config_files = list(config_dir.glob("*.json")) if config_path.is_dir() else [config_path]
+    baseline_file = config_dir / BASELINE_CONFIG_FILE
     baseline_config = {}
     if baseline_file.exists():
         with open(baseline_file, 'r') as f: baseline_config = json.load(f)
     configs = []
     for config_file in sorted(config_files):
-        if config_file.name == "config_common.json": continue    
+        if config_file.name == BASELINE_CONFIG_FILE: continue
         with open(config_file, 'r') as f:
             config = json.load(f)
             merged_config = {**baseline_config, **config}
@@ -80,5 +68,113 @@ def run_batch_simulation_with_results() -> None:
     run_simulation_from_configs(configs)
     results()
 
+def _plot(args: argparse.Namespace) -> None:
+    from src.visualization import plotter
+    plotter.results(args.max_points, args.method, args.envelope, args.output_dir)
+
+def _live(args: argparse.Namespace) -> None:
+    from src.visualization.live import watch
+    watch(args.output_dir, args.refresh, args.max_points)
+
+def _run(args: argparse.Namespace) -> None:
+    from src.simulation.preflight import estimate_resources, format_report
+    configs = load_configurations(args.config)
+    if not configs: raise SystemExit(f"No configurations found in {args.config}")
+    print(format_report([estimate_resources(config) for config in configs]))
+    if args.dry_run: return
+    from src.io.data_manager import RunLogger
+    from src.io.weight_store import WEIGHT_STORE_DIR_NAME
+    # Every output, the weight store included, goes to --output-dir
+    configs = [{'weight_store_dir': str(Path(args.output_dir) / WEIGHT_STORE_DIR_NAME), **config} for config in configs]
+    with RunLogger(args.output_dir) as logger:
+        if args.successive_halving:
+            from src.simulation.halving import run_successive_halving
+            run_successive_halving(configs, logger)
+        else:
+            run_simulation_from_configs(configs, logger=logger)
+    if not args.no_plot: _plot(args)
+
+def _export(args: argparse.Namespace) -> None:
+    from src.visualization.export import export_figures
+    report = export_figures(args.output_dir, args.figure_dir, args.format or ['png'], args.workers, args.max_points, args.method, args.envelope, args.latex, args.force)
+    print(f"Exported {len(report.rendered)} figures, {len(report.skipped)} unchanged, to {args.figure_dir or Path(args.output_dir) / 'figures'}")
+
+def _sweep(args: argparse.Namespace) -> None:
+    from src.simulation.scheduler import run_scenarios
+    configs = load_configurations(args.config)
+    if not configs: raise SystemExit(f"No configurations found in {args.config}")
+    scenarios: list[dict[str, Any]] = [{'dynamics_type': dynamics_type} for dynamics_type in args.scenario]
+    if args.scenarios:
+        with open(args.scenarios, 'r') as f: scenarios += json.load(f)
+    if not scenarios: raise SystemExit("sweep needs at least one --scenario or a --scenarios file")
+    for result in run_scenarios(scenarios, configs, args.workers, args.output_dir, args.executor):
+        print(f"{result.scenario:>20} | {result.ID:<30} | {result.elapsed:8.2f} s | {result.output_dir}")
+
+def _catalog(args: argparse.Namespace) -> None:
+    from src.io.catalog import CATALOG_FILE, format_ranking, rank_runs
+    catalog_path = args.catalog or f'{args.output_dir}/{CATALOG_FILE}'
+    filters = {column: value for column, value in (('agent_id', args.id), ('dynamics_type', args.dynamics_type), ('config_hash', args.config_hash)) if value is not None}
+    print(format_ranking(rank_runs(catalog_path, args.metric, args.limit, args.descending, **filters), args.metric))
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command')
+
+    config_options = argparse.ArgumentParser(add_help=False)
+    config_options.add_argument('--config', default=CONFIG_DIR, help="Configuration directory or single JSON file (default: %(default)s)")
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument('--output-dir', default='simulation_data', help="Directory of the CSV output (default: %(default)s)")
+    plot_options = argparse.ArgumentParser(add_help=False)
+    plot_options.add_argument('--max-points', type=int, default=None, help="Downsample every plotted series to this many points")
+    plot_options.add_argument('--method', choices=('minmax', 'lttb'), default='minmax', help="Downsampling method (default: %(default)s)")
+    plot_options.add_argument('--envelope', action='store_true', help="Draw weights as min/max and percentile bands")
+
+    run_parser = subparsers.add_parser('run', parents=[config_options, output_options, plot_options], help="Run all configurations against one target")
+    run_parser.add_argument('--no-plot', action='store_true', help="Skip plotting (no matplotlib import)")
+    run_parser.add_argument('--dry-run', action='store_true', help="Only print the preflight memory, output size and runtime estimates")
+    run_parser.add_argument('--successive-halving', action='store_true', help="Race the configurations and drop the worst half at the end of each growing horizon")
+    run_parser.set_defaults(handler=_run)
+
+    plot_parser = subparsers.add_parser('plot', parents=[output_options, plot_options], help="Plot the CSV output of a previous run")
+    plot_parser.set_defaults(handler=_plot)
+
+    live_parser = subparsers.add_parser('live', parents=[output_options], help="Plot tracking error and learning-rate norm while a run writes them")
+    live_parser.add_argument('--refresh', type=float, default=1.0, help="Seconds between updates (default: %(default)s)")
+    live_parser.add_argument('--max-points', type=int, default=2000, help="Points kept per series (default: %(default)s)")
+    live_parser.set_defaults(handler=_live)
+
+    export_parser = subparsers.add_parser('export', parents=[output_options, plot_options], help="Write every figure of a run to files in parallel, without a display")
+    export_parser.add_argument('--figure-dir', default=None, help="Directory of the figure files (default: <output-dir>/figures)")
+    export_parser.add_argument('--format', action='append', choices=('png', 'pdf'), default=None, help="Figure format; repeatable (default: png)")
+    export_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count; 1 renders in-process)")
+    export_parser.add_argument('--force', action='store_true', help="Redraw figures whose inputs are unchanged")
+    export_parser.add_argument('--latex', action='store_true', help="Render text with LaTeX (needs a TeX installation)")
+    export_parser.set_defaults(handler=_export)
+
+    sweep_parser = subparsers.add_parser('sweep', parents=[config_options, output_options], help="Run every configuration on several scenarios across worker processes")
+    sweep_parser.add_argument('--scenario', action='append', default=[], metavar='DYNAMICS_TYPE', help="Scenario by dynamics type; repeatable")
+    sweep_parser.add_argument('--scenarios', default=None, help="JSON file with a list of scenario override dicts")
+    sweep_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count; 1 runs in-process)")
+    sweep_parser.add_argument('--executor', choices=('process', 'thread'), default='process', help="Run jobs in worker processes or in threads of this process")
+    sweep_parser.set_defaults(handler=_sweep)
+
+    catalog_parser = subparsers.add_parser('catalog', parents=[output_options], help="Rank the runs registered in the SQLite catalog")
+    catalog_parser.add_argument('--catalog', default=None, help="Catalog file (default: catalog.sqlite in the output directory)")
+    catalog_parser.add_argument('--metric', choices=('rms_tracking_error', 'final_fae', 'projection_fraction', 'wall_time', 'steps'), default='rms_tracking_error', help="Ranking metric (default: %(default)s)")
+    catalog_parser.add_argument('--descending', action='store_true', help="Largest values first")
+    catalog_parser.add_argument('--limit', type=int, default=10, help="Rows to show (default: %(default)s)")
+    catalog_parser.add_argument('--id', default=None, help="Only runs of this controller ID")
+    catalog_parser.add_argument('--dynamics-type', default=None, help="Only runs on this dynamics type")
+    catalog_parser.add_argument('--config-hash', default=None, help="Only runs of this config hash")
+    catalog_parser.set_defaults(handler=_catalog)
+    return parser
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # Without a subcommand, behave like `run` with its defaults
+    if args.command is None: args = parser.parse_args(['run', *(argv or [])])
+    args.handler(args)
+
 if __name__ == "__main__":
-    run_batch_simulation_with_results()
\ No newline at end of file
+    main()
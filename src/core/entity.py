@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
 from numpy.typing import NDArray
@@ -9,19 +9,25 @@ from numpy.typing import NDArray
 from ..simulation import dynamics
 from ..simulation.integrate import integrate_step
 from .neural_network import NeuralNetwork
+from .storage import Trajectory, create_trajectory
 
 
 class Entity:
-    def __init__(self, initial_position: NDArray[np.float64], time_steps: int, config: dict[str, Any]) -> None:
+    def __init__(self, initial_position: NDArray[np.float64], time_steps: int, config: dict[str, Any], name: str = 'entity') -> None:
         self.num_states: int = config['num_states']
         self.time_step_delta: float = config['time_step_delta']
-        self.positions: NDArray[np.float64] = np.zeros((self.num_states, time_steps))
-        self.velocities: NDArray[np.float64] = np.zeros((self.num_states, time_steps))
+        self.positions: Trajectory = create_trajectory(self.num_states, time_steps, config, f'{name}_positions')
+        self.velocities: Trajectory = create_trajectory(self.num_states, time_steps, config, f'{name}_velocities')
         self.positions[:, 0] = initial_position
 
+    def close_storage(self) -> None:
+        """Flush and release disk-backed trajectory storage."""
+        for trajectory in (self.positions, self.velocities):
+            if not isinstance(trajectory, np.ndarray): trajectory.close()
+
 class Agent(Entity):
     def __init__(self, initial_position: NDArray[np.float64], time_steps: int, config: dict[str, Any], target: "Target", agent_type: str) -> None:
-        super().__init__(initial_position, time_steps, config)
+        super().__init__(initial_position, time_steps, config, agent_type)
         self.target: "Target" = target
         self.agent_type: str = agent_type
         self.k1: float = config['k1']
@@ -29,36 +35,118 @@ class Agent(Entity):
         self.tracking_error: NDArray[np.float64] = np.zeros(self.num_states)
         self.neural_network: NeuralNetwork = NeuralNetwork(self._input_func, config)
         self.neural_network_output: NDArray[np.float64] = np.zeros(self.num_states)
+        self.stop_reason: Optional[str] = None
+        self.stop_time: Optional[float] = None
+        self.last_step: int = 0
+        self.fused_integration: bool = config.get('fused_integration', False) and agent_type != "Proportional"
+        self._loss: NDArray[np.float64] = np.zeros((self.num_states, 1))
+        # Event-triggered learning: weights and learning rate only adapt on steps where the trigger holds
+        self.event_triggered: bool = config.get('event_triggered', False) and agent_type != "Proportional"
+        self.trigger_error_threshold: float = config.get('trigger_error_threshold', 0.01)
+        self.trigger_error_growth: float = config.get('trigger_error_growth', 2.0)
+        self.hold_output: bool = config.get('event_hold_output', False)
+        self.learning_updates: int = 0
+        self.adaptive_steps: int = 0
+        self._learning: bool = True
+        self._update_error_norm: float = 0.0
+        # Magnitude pruning once the warm-up window `prune_time` has passed
+        self.prune_threshold: Optional[float] = config.get('prune_threshold') if agent_type != "Proportional" else None
+        self.prune_step: int = max(1, round(config.get('prune_time', 1.0) / self.time_step_delta))
 
     def _input_func(self, step: int) -> NDArray[np.float64]: return self.target.positions[:, step - 1]
 
-    def compute_control_output(self, step: int) -> None:
+    def compute_control_output(self, step: int, adapt: bool = True) -> None:
+        """Control for `step`; with `adapt` false (a degraded real-time step) the network is only evaluated."""
         self.tracking_error = (self.target.positions[:, step - 1] - self.positions[:, step - 1])
         self.control_output = self.k1*self.tracking_error
 
         if self.agent_type == "Proportional": return
 
         loss = self.tracking_error
-        nn_output = self.neural_network.train_step(step, loss.reshape(-1, 1))
+        if self.prune_threshold is not None and step == self.prune_step: self.neural_network.prune_by_magnitude(self.prune_threshold, step)
+        self._learning = adapt and self._learning_triggered()
+        self.adaptive_steps += 1
+        if not self._learning:
+            # Between events: cheap forward pass at frozen weights, or the output held from the last step
+            if self.hold_output: self.neural_network.hold_learning_rate(step)
+            else: self.neural_network_output = self.neural_network.predict(step).reshape(-1)
+            self.control_output += self.neural_network_output
+            return
+        self.learning_updates += 1
+        if self.fused_integration:
+            # Weights and learning rate advance together with the position in update_dynamics
+            self._loss = loss.reshape(-1, 1)
+            nn_output = self.neural_network.compute_gradient(step)
+        else:
+            nn_output = self.neural_network.train_step(step, loss.reshape(-1, 1))
         self.neural_network_output = nn_output.reshape(-1)
         self.control_output += self.neural_network_output
 
+    def _learning_triggered(self) -> bool:
+        """Whether this step adapts: always without event triggering, otherwise when the tracking-error norm
+        exceeds the threshold or has grown by `trigger_error_growth` since the last update."""
+        if not self.event_triggered: return True
+        error_norm = float(np.linalg.norm(self.tracking_error))
+        if error_norm <= self.trigger_error_threshold and error_norm <= self.trigger_error_growth * self._update_error_norm: return False
+        self._update_error_norm = error_norm
+        return True
+
+    @property
+    def learning_fraction(self) -> float:
+        """Fraction of simulated steps on which the network adapted."""
+        return self.learning_updates / self.adaptive_steps if self.adaptive_steps else 0.0
+
     def update_dynamics(self, step: int) -> None: 
         def control_wrapper(t: float, y: NDArray[np.float64]) -> NDArray[np.float64]:
             return self.control_output
         self.velocities[:, step] = self.control_output
-        result = integrate_step(self.positions[:, step - 1], step, self.time_step_delta, control_wrapper)
-        self.positions[:, step] = result
+        self.last_step = step
+        if self.fused_integration and self._learning:
+            self._update_fused_state(step)
+        else:
+            result = integrate_step(self.positions[:, step - 1], step, self.time_step_delta, control_wrapper)
+            self.positions[:, step] = result
+
+    def _update_fused_state(self, step: int) -> None:
+        """Advance position, weights and the packed symmetric learning rate in one solver call.
+
+        The state vector is [position | weights | upper triangle of the learning rate]. The weight
+        derivative uses the learning rate carried in the same state, so the coupled system is
+        integrated under a single adaptive error control.
+        """
+        network = self.neural_network
+        num_weights = network.num_active
+        weights_end = self.num_states + num_weights
+        normalized_regressor = network.normalized_regressor()
+        state = np.concatenate((self.positions[:, step - 1], np.ravel(network.active_weights()), network.pack_learning_rate(network.learning_rate[step - 1])))
+
+        def fused_derivative(t: float, y: NDArray[np.float64]) -> NDArray[np.float64]:
+            learning_rate = network.unpack_learning_rate(y[weights_end:])
+            derivative = np.empty_like(y)
+            derivative[:self.num_states] = self.control_output
+            derivative[self.num_states:weights_end] = np.ravel(network.weights_derivative(y[self.num_states:weights_end].reshape(-1, 1), learning_rate, self._loss))
+            derivative[weights_end:] = network.pack_learning_rate(network.learning_rate_derivative(learning_rate, normalized_regressor))
+            return derivative
+
+        result = integrate_step(state, step, self.time_step_delta, fused_derivative)
+        self.positions[:, step] = result[:self.num_states]
+        network.set_active_weights(result[self.num_states:weights_end].reshape(-1, 1))
+        network.learning_rate[step] = network.unpack_learning_rate(result[weights_end:])
 
 class Target(Entity):
     def __init__(self, initial_position: NDArray[np.float64], time_steps: int, config: dict[str, Any]) -> None:
-        super().__init__(initial_position, time_steps, config)
+        super().__init__(initial_position, time_steps, config, 'target')
         dynamics_type = config['dynamics_type']
-        self.dynamics_function: Callable[[NDArray[np.float64]], NDArray[np.float64]] = dynamics.get_dynamics_function(dynamics_type)
+        parameters: Optional[dict[str, Any]] = config.get('dynamics_parameters')
+        self.dynamics_function: Callable[[NDArray[np.float64]], NDArray[np.float64]] = dynamics.get_dynamics_function(dynamics_type, parameters)
+        self.jacobian_function: Callable[[NDArray[np.float64]], NDArray[np.float64]] = dynamics.get_jacobian_function(dynamics_type, parameters)
+        self.integration_method: str = config.get('integration_method', 'RK45')
         
     def update_dynamics(self, step: int) -> None: 
         def dynamics_wrapper(t: float, pos: NDArray[np.float64]) -> NDArray[np.float64]:
             return self.dynamics_function(pos)
+        def jacobian_wrapper(t: float, pos: NDArray[np.float64]) -> NDArray[np.float64]:
+            return self.jacobian_function(pos)
         self.velocities[:, step] = self.dynamics_function(self.positions[:, step - 1])
-        result = integrate_step(self.positions[:, step - 1], step, self.time_step_delta, dynamics_wrapper)
+        result = integrate_step(self.positions[:, step - 1], step, self.time_step_delta, dynamics_wrapper, self.integration_method, jacobian_wrapper)
         self.positions[:, step] = result
\ No newline at end of file
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .neural_network import NeuralNetwork, activate, batch_weight_matrices, parameter_count
+
+
+class ArchitecturePlan(NamedTuple):
+    num_inputs: int
+    num_neurons: int
+    num_layers: int
+    num_outputs: int
+    num_blocks: int
+    inner_activation: str
+    output_activation: str
+    shortcut_activation: str
+
+    @property
+    def num_weights(self) -> int:
+        return parameter_count({'num_neurons': self.num_neurons, 'output_size': self.num_outputs, 'num_blocks': self.num_blocks, 'num_layers': self.num_layers}, self.num_inputs)
+
+    @classmethod
+    def of(cls, network: NeuralNetwork) -> ArchitecturePlan:
+        return cls(network.num_inputs, network.num_neurons, network.num_layers, network.num_outputs, network.num_blocks,
+                   network.inner_layer_activation_function, network.outer_layer_activation_function, network.shortcut_activation_function)
+
+
+class FrozenNetwork:
+    """Inference-only residual network: fixed weights, no gradient, Jacobian or learning-rate state.
+
+    The layer matrices are views of `weights`, so weights memory-mapped from an artifact are read
+    straight from the page cache. `learning_rate` and `mask` are only carried to restore training.
+    """
+
+    def __init__(self, plan: ArchitecturePlan, weights: NDArray[Any], learning_rate: Optional[NDArray[Any]] = None, mask: Optional[NDArray[np.bool_]] = None,
+                 metadata: Optional[dict[str, Any]] = None) -> None:
+        if weights.shape != (plan.num_weights,): raise ValueError(f"Expected {plan.num_weights} weights, got shape {weights.shape}")
+        self.plan = plan
+        self.weights = weights
+        self.learning_rate = learning_rate
+        self.mask = mask
+        self.metadata: dict[str, Any] = {} if metadata is None else metadata
+        self.dtype = weights.dtype
+        # (weight, bias) views per layer, so a sample never gets a bias entry appended
+        weight_blocks = batch_weight_matrices(np.asarray(weights), plan.num_inputs, plan.num_neurons, plan.num_layers, plan.num_outputs, plan.num_blocks)
+        self._layers = [[(matrix[:, :-1], matrix[:, -1]) for matrix in matrices] for matrices in weight_blocks]
+
+    def _forward(self, inputs: NDArray[Any]) -> NDArray[Any]:
+        """The residual recursion of `NeuralNetwork` for one input vector or a batch of input rows."""
+        plan = self.plan
+        running_sum: Any = 0
+        for block_index, layers in enumerate(self._layers):
+            layer_input = inputs if block_index == 0 else activate(running_sum, plan.shortcut_activation)
+            for layer_index, (weights, bias) in enumerate(layers):
+                preactivation = layer_input @ weights.T + bias
+                if layer_index < plan.num_layers: layer_input = activate(preactivation, plan.output_activation if layer_index == plan.num_layers - 1 else plan.inner_activation)
+            running_sum = running_sum + preactivation
+        output: NDArray[Any] = running_sum
+        return output
+
+    def predict_batch(self, inputs: NDArray[Any]) -> NDArray[Any]:
+        """Outputs (N, num_outputs) for N input rows."""
+        return self._forward(np.atleast_2d(np.asarray(inputs, dtype=self.dtype)))
+
+    def predict(self, state: NDArray[Any]) -> NDArray[Any]:
+        """Output (num_outputs,) for one input vector; `NeuralNetwork.forward_raw` of the same input, up to rounding."""
+        return self._forward(np.ravel(np.asarray(state, dtype=self.dtype)))
+
+    def restore(self, network: NeuralNetwork) -> None:
+        """Load the weights, mask and (if stored) learning rate into a network of the same architecture, to continue training."""
+        if ArchitecturePlan.of(network) != self.plan: raise ValueError(f"Network architecture {ArchitecturePlan.of(network)} does not match {self.plan}")
+        if self.mask is not None: network.apply_mask(np.array(self.mask, dtype=bool))
+        network.set_weights(np.array(self.weights, dtype=np.float64).reshape(-1, 1))
+        if self.learning_rate is not None: network.set_learning_rate(np.array(self.learning_rate))
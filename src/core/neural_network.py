@@ -1,12 +1,189 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
 from numpy.typing import NDArray
 
 from ..simulation.integrate import integrate_step
+from .storage import History, create_learning_rate_history
+
+ForwardPass = tuple[int, NDArray[np.float64], list[list[NDArray[np.float64]]], list[list[NDArray[np.float64]]], list[list[NDArray[np.float64]]], list[NDArray[np.float64]]]
+CacheKey = tuple[int, bytes]
+
+
+def parameter_count(config: dict[str, Any], num_inputs: Optional[int] = None) -> int:
+    """Number of weights (biases included) of the network described by `config`, without building it."""
+    num_inputs = config['num_states'] if num_inputs is None else num_inputs
+    num_neurons, num_outputs = config['num_neurons'], config['output_size']
+    count = 0
+    for block in range(config['num_blocks'] + 1):
+        input_size = num_inputs if block == 0 else num_outputs
+        count += num_neurons * (input_size + 1) + (config['num_layers'] - 1) * num_neurons * (num_neurons + 1) + num_outputs * (num_neurons + 1)
+    return count
+
+def activate(x: NDArray[np.float64], activation_function: str) -> NDArray[np.float64]:
+    """Elementwise activation, for single samples and batches alike."""
+    if activation_function == 'tanh': 
+        result = np.tanh(x)
+    elif activation_function == 'swish': 
+        result = x * (1.0 / (1.0 + np.exp(-x)))
+    elif activation_function == 'identity': 
+        result = x
+    elif activation_function == 'relu': 
+        result = np.maximum(0, x)
+    elif activation_function == 'sigmoid': 
+        result = 1 / (1 + np.exp(-x))
+    elif activation_function == 'leaky_relu': 
+        result = np.where(x > 0, x, 0.01 * x)
+    else:
+        raise ValueError(f"Unknown activation function: {activation_function}")
+    return result
+
+def activation_derivative(x: NDArray[np.float64], activation_function: str) -> NDArray[np.float64]:
+    """Elementwise derivative of `activate`."""
+    if activation_function == 'tanh': 
+        result = 1 - np.tanh(x)**2
+    elif activation_function == 'swish':
+        sigmoid = 1.0 / (1.0 + np.exp(-x))
+        swish = x * sigmoid
+        result = swish + sigmoid * (1 - swish)
+    elif activation_function == 'identity': 
+        result = np.ones_like(x)
+    elif activation_function == 'relu': 
+        result = (x > 0).astype(x.dtype)
+    elif activation_function == 'sigmoid':
+        sigmoid = 1 / (1 + np.exp(-x))
+        result = sigmoid * (1 - sigmoid)
+    elif activation_function == 'leaky_relu': 
+        result = np.where(x > 0, 1, 0.01).astype(x.dtype)
+    else:
+        raise ValueError(f"Unknown activation function: {activation_function}")
+    return result
+
+def layer_shapes(input_size: int, num_neurons: int, num_layers: int, num_outputs: int) -> list[tuple[int, int]]:
+    """(biased inputs, outputs) of every layer matrix of one block, in weight-vector order."""
+    return [(input_size + 1, num_neurons)] + [(num_neurons + 1, num_neurons)] * (num_layers - 1) + [(num_neurons + 1, num_outputs)]
+
+def layer_weight_indices(num_inputs: int, num_neurons: int, num_layers: int, num_outputs: int, num_blocks: int) -> list[list[NDArray[np.intp]]]:
+    """Position in the weight vector of every (biased input, output) entry of every layer matrix, per block."""
+    blocks: list[list[NDArray[np.intp]]] = []
+    start = 0
+    for block in range(num_blocks + 1):
+        layers: list[NDArray[np.intp]] = []
+        for rows, cols in layer_shapes(num_inputs if block == 0 else num_outputs, num_neurons, num_layers, num_outputs):
+            layers.append(start + np.arange(rows * cols).reshape(rows, cols, order='F'))
+            start += rows * cols
+        blocks.append(layers)
+    return blocks
+
+def prune_structure(mask: NDArray[np.bool_], index_blocks: list[list[NDArray[np.intp]]], inner_activation: str, output_activation: str) -> tuple[NDArray[np.bool_], list[list[tuple[NDArray[np.intp], NDArray[np.intp]]]]]:
+    """Extend a weight mask to whole neurons and return the kept (input rows, output columns) of every layer.
+
+    A hidden neuron is pruned when all of its outgoing weights are masked, or when all of its incoming
+    weights and its bias are masked and its activation is zero at zero. The weights of pruned neurons are
+    masked as well, repeatedly until nothing changes, so the kept layers compute the same output.
+    """
+    mask = mask.copy()
+    num_layers = len(index_blocks[0]) - 1
+    silent = {name: bool(activate(np.zeros(1), name)[0] == 0) for name in (inner_activation, output_activation)}
+    dead_neurons = [[np.zeros(layers[layer].shape[1], dtype=bool) for layer in range(num_layers)] for layers in index_blocks]
+    changed = True
+    while changed:
+        changed = False
+        for layers, dead in zip(index_blocks, dead_neurons):
+            for layer in range(num_layers):
+                incoming, outgoing = layers[layer], layers[layer + 1][:-1]
+                silent_at_zero = silent[output_activation if layer == num_layers - 1 else inner_activation]
+                pruned: NDArray[np.bool_] = np.asarray(~mask[outgoing].any(axis=1) | (~mask[incoming].any(axis=0) & silent_at_zero))
+                if np.array_equal(pruned, dead[layer]): continue
+                dead[layer] = pruned
+                mask[incoming[:, pruned]] = False
+                mask[outgoing[pruned]] = False
+                changed = True
+
+    kept: list[list[tuple[NDArray[np.intp], NDArray[np.intp]]]] = []
+    for layers, dead in zip(index_blocks, dead_neurons):
+        kept_layers = []
+        for layer, indices in enumerate(layers):
+            rows = np.arange(indices.shape[0]) if layer == 0 else np.append(np.flatnonzero(~dead[layer - 1]), indices.shape[0] - 1)
+            cols = np.arange(indices.shape[1]) if layer == num_layers else np.flatnonzero(~dead[layer])
+            kept_layers.append((rows, cols))
+        kept.append(kept_layers)
+    return mask, kept
+
+def batch_weight_matrices(weights: NDArray[np.float64], num_inputs: int, num_neurons: int, num_layers: int, num_outputs: int, num_blocks: int) -> list[list[NDArray[np.float64]]]:
+    """Transposed layer matrices (outputs × biased inputs) per block from a (P,) weight vector or a (N, P) weight history.
+
+    A history gives (N, outputs, biased inputs) stacks, one matrix per sample.
+    """
+    blocks: list[list[NDArray[np.float64]]] = []
+    index = 0
+    for block in range(num_blocks + 1):
+        matrices: list[NDArray[np.float64]] = []
+        for rows, cols in layer_shapes(num_inputs if block == 0 else num_outputs, num_neurons, num_layers, num_outputs):
+            # column-major (rows, cols) layout of the weight vector, transposed: a row-major (cols, rows) view
+            matrices.append(weights[..., index:index + rows * cols].reshape(*weights.shape[:-1], cols, rows))
+            index += rows * cols
+        blocks.append(matrices)
+    return blocks
+
+def _with_bias(activations: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.hstack((activations, np.ones((activations.shape[0], 1), dtype=activations.dtype)))
+
+def _layer_product(matrix: NDArray[np.float64], activations: NDArray[np.float64]) -> NDArray[np.float64]:
+    """`matrix @ a` for every sample: one matrix shared by the batch or one per sample."""
+    if matrix.ndim == 2: return activations @ matrix.T
+    product: NDArray[np.float64] = np.matmul(matrix, activations[:, :, np.newaxis])[:, :, 0]
+    return product
+
+def batch_forward(weight_blocks: list[list[NDArray[np.float64]]], inputs: NDArray[np.float64], activation_functions: tuple[str, str, str], jacobian: bool = False) -> tuple[NDArray[np.float64], Optional[NDArray[np.float64]]]:
+    """Outputs (N, num_outputs) of the residual network for N input rows, and optionally the Jacobians
+    (N, num_outputs, P) with respect to the weights, in the same weight order as the per-step pass.
+
+    `activation_functions` is (inner, output, shortcut); the batch runs the per-step recursion with every
+    vector replaced by a row per sample.
+    """
+    inner_activation, output_activation, shortcut_activation = activation_functions
+    num_layers = len(weight_blocks[0]) - 1
+    running_sum = np.zeros((inputs.shape[0], weight_blocks[0][-1].shape[-2]), dtype=inputs.dtype)
+    block_inputs: list[list[NDArray[np.float64]]] = []        # biased input of every layer
+    block_preactivations: list[list[NDArray[np.float64]]] = []
+    residual_sums: list[NDArray[np.float64]] = []
+    for block_index, matrices in enumerate(weight_blocks):
+        if block_index > 0: residual_sums.append(running_sum)
+        layer_input = _with_bias(inputs if block_index == 0 else activate(running_sum, shortcut_activation))
+        layer_inputs, preactivations = [layer_input], []
+        for layer_index, matrix in enumerate(matrices):
+            preactivation = _layer_product(matrix, layer_input)
+            preactivations.append(preactivation)
+            if layer_index < num_layers:
+                layer_input = _with_bias(activate(preactivation, output_activation if layer_index == num_layers - 1 else inner_activation))
+                layer_inputs.append(layer_input)
+        block_inputs.append(layer_inputs)
+        block_preactivations.append(preactivations)
+        running_sum = running_sum + preactivations[-1]
+    if not jacobian: return running_sum, None
+
+    num_samples, num_outputs = running_sum.shape
+    outer_product = np.broadcast_to(np.eye(num_outputs, dtype=inputs.dtype), (num_samples, num_outputs, num_outputs))
+    gradient_blocks: list[NDArray[np.float64]] = []
+    for block_index in range(len(weight_blocks) - 1, -1, -1):
+        matrices = weight_blocks[block_index]
+        layer_gradients: list[NDArray[np.float64]] = []
+        output_gradient: NDArray[np.float64] = outer_product          # d output / d preactivation of the current layer
+        for layer_index in range(num_layers, -1, -1):
+            layer_input = block_inputs[block_index][layer_index]
+            layer_gradients.append((output_gradient[:, :, :, np.newaxis] * layer_input[:, np.newaxis, np.newaxis, :]).reshape(num_samples, num_outputs, -1))
+            if layer_index > 0:
+                derivative = activation_derivative(block_preactivations[block_index][layer_index - 1], output_activation if layer_index == num_layers else inner_activation)
+                output_gradient = np.matmul(output_gradient, matrices[layer_index][..., :-1]) * derivative[:, np.newaxis, :]
+        gradient_blocks.append(np.concatenate(list(reversed(layer_gradients)), axis=2))
+        if block_index > 0:
+            shortcut_derivative = activation_derivative(residual_sums[block_index - 1], shortcut_activation)
+            outer_product = outer_product + np.matmul(output_gradient, matrices[0][..., :-1]) * shortcut_derivative[:, np.newaxis, :]
+    return running_sum, np.concatenate(list(reversed(gradient_blocks)), axis=2)
 
 
 class NeuralNetwork:
@@ -23,16 +200,88 @@ class NeuralNetwork:
         self.num_inputs: int = input_func(1).shape[0]
         self.num_outputs: int = config['output_size']
         self.weight_bounds: float = config['weight_bounds'] 
-        np.random.seed(config['seed'])
+        self.dtype: np.dtype[Any] = np.dtype(config.get('dtype', 'float64'))
+        self.weights_version: int = 0
+        self._forward_cache: Optional[tuple[CacheKey, ForwardPass]] = None
+        self._jacobian_cache: Optional[tuple[CacheKey, NDArray[np.float64]]] = None
+        # A generator per network, so networks built in concurrent runs draw the same weights as alone
+        self._rng = np.random.RandomState(config['seed'])
         self.initialize_weights()
-        self.neural_network_gradient_wrt_weights: NDArray[np.float64] = np.zeros((self.num_outputs, np.size(self.weights)))
+        # Weight-derivative evaluations, and those the projection corrected at the weight bound
+        self.projection_calls: int = 0
+        self.projection_active: int = 0
+        self._output_eye: NDArray[np.float64] = np.eye(self.num_outputs, dtype=self.dtype)
         mu_min = config['minimum_singular_value']
         mu_max = config['maximum_singular_value']
         self.alpha: float = (mu_max * mu_min**3) / (mu_max**2 - mu_min**2)
         self.beta: float = mu_min
         self.gamma: float = (mu_min * mu_max) / (mu_max**2 - mu_min**2)
-        initial_lr_matrix = config['initial_learning_rate'] * np.eye(np.size(self.weights))
-        self.learning_rate = np.stack([initial_lr_matrix] * self.time_steps, axis=0)
+        # Sparsity mask: only the active weights enter the gradient, the weight ODE and the learning rate
+        self.mask: Optional[NDArray[np.bool_]] = None
+        self._kept_layers: Optional[list[list[tuple[NDArray[np.intp], NDArray[np.intp]]]]] = None
+        self._active_index: Optional[NDArray[np.intp]] = None
+        self._active_positions: Optional[NDArray[np.intp]] = None
+        self._storage_config: dict[str, Any] = config
+        self.initial_learning_rate: float = config['initial_learning_rate']
+        self.learning_rate: History = self._allocate_active_structures()
+        if config.get('weight_mask') is not None: self.apply_mask(np.load(config['weight_mask']).astype(bool).ravel())
+
+    @property
+    def num_active(self) -> int:
+        """Number of adapted weights: all of them without a mask."""
+        return np.size(self.weights) if self._active_index is None else len(self._active_index)
+
+    def _allocate_active_structures(self, learning_rate: Optional[NDArray[np.float64]] = None) -> History:
+        """Size the gradient, the packing maps and a new learning-rate history (default `initial_learning_rate * I`) for the active weights."""
+        self.neural_network_gradient_wrt_weights: NDArray[np.float64] = np.zeros((self.num_outputs, self.num_active), dtype=self.dtype)
+        self._upper_triangle: tuple[NDArray[np.intp], NDArray[np.intp]] = np.triu_indices(self.num_active)
+        packed_position = np.empty((self.num_active, self.num_active), dtype=np.intp)
+        packed_position[self._upper_triangle] = np.arange(len(self._upper_triangle[0]))
+        packed_position.T[self._upper_triangle] = packed_position[self._upper_triangle]
+        self._unpack_index: NDArray[np.intp] = packed_position
+        if learning_rate is None: learning_rate = self.initial_learning_rate * np.eye(self.num_active, dtype=self.dtype)
+        return create_learning_rate_history(learning_rate, self.time_steps, self._storage_config)
+
+    def apply_mask(self, mask: NDArray[np.bool_], step: Optional[int] = None) -> None:
+        """Restrict adaptation to the weights where `mask` is true and skip neurons left without effect.
+
+        Masked weights are set to zero and stay there. The learning rate restarts from its initial value,
+        or with `step` from the matrix of step - 1 reduced to the kept weights (pruning during a run).
+        """
+        if mask.shape != (np.size(self.weights),): raise ValueError(f"Mask has shape {mask.shape}, expected ({np.size(self.weights)},)")
+        previous_active = self.active_weights_index()
+        index_blocks = layer_weight_indices(self.num_inputs, self.num_neurons, self.num_layers, self.num_outputs, self.num_blocks)
+        self.mask, self._kept_layers = prune_structure(mask, index_blocks, self.inner_layer_activation_function, self.outer_layer_activation_function)
+        compact_index = np.concatenate([indices[np.ix_(rows, cols)].ravel(order='F') for layers, kept in zip(index_blocks, self._kept_layers) for indices, (rows, cols) in zip(layers, kept)])
+        self._active_positions = np.flatnonzero(self.mask[compact_index])
+        self._active_index = compact_index[self._active_positions]
+        self.weights = np.where(self.mask.reshape(-1, 1), self.weights, 0).astype(self.dtype)
+        kept = np.flatnonzero(np.isin(previous_active, self._active_index))
+        current = None if step is None else np.ascontiguousarray(self.learning_rate[step - 1][np.ix_(kept, kept)])
+        self.learning_rate = self._allocate_active_structures(current)
+
+    def prune_by_magnitude(self, threshold: float, step: int) -> None:
+        """Mask every weight whose magnitude is below `threshold` (on top of any existing mask)."""
+        mask = np.abs(np.ravel(self.weights)) >= threshold
+        if self.mask is not None: mask &= self.mask
+        self.apply_mask(mask, step)
+
+    def active_weights_index(self) -> NDArray[np.intp]:
+        """Positions of the adapted weights in the full weight vector."""
+        return np.arange(np.size(self.weights)) if self._active_index is None else self._active_index
+
+    def active_weights(self) -> NDArray[np.float64]:
+        """The adapted weights as a column: all weights without a mask."""
+        if self._active_index is None: return self.weights
+        return self.weights[self._active_index]
+
+    def set_active_weights(self, active_weights: NDArray[np.float64]) -> None:
+        if self._active_index is None:
+            self.weights = active_weights.astype(self.dtype)
+            return
+        weights = self.weights.copy()
+        weights[self._active_index] = active_weights
+        self.weights = weights.astype(self.dtype)
 
     def initialize_weights(self) -> None:
         activation_to_variance: dict[str, int] = {'tanh': 1, 'sigmoid': 1, 'identity': 1, 'swish': 2, 'relu': 2, 'leaky_relu': 2}
@@ -46,22 +295,32 @@ class NeuralNetwork:
                 weights.append(self.generate_initialized_weights(self.num_neurons, self.num_neurons, inner_variance))
             weights.append(
                 self.generate_initialized_weights(self.num_neurons, self.num_outputs, output_variance))
-        self.weights: NDArray[np.float64] = np.vstack(weights)
+        self.weights = np.vstack(weights).astype(self.dtype)
+
+    @property
+    def weights(self) -> NDArray[np.float64]:
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: NDArray[np.float64]) -> None:
+        # Every assignment starts a new weight version, invalidating cached forward passes and Jacobians
+        self._weights: NDArray[np.float64] = weights
+        self.weights_version += 1
 
     def generate_initialized_weights(self, input_size: int, output_size: int, variance_factor: int) -> NDArray[np.float64]:
         variance = variance_factor / input_size  # Applies either Xavier (1/input) or He (2/input) initialization
-        return np.random.normal(0, np.sqrt(variance), output_size * (input_size + 1)).reshape(-1, 1)    # input_size + 1 accounts for bias term
+        return self._rng.normal(0, np.sqrt(variance), output_size * (input_size + 1)).reshape(-1, 1)    # input_size + 1 accounts for bias term
 
     def get_input_with_bias(self, step: int) -> NDArray[np.float64]: 
-        return np.append(self.input_func(step), 1).reshape(-1, 1)
+        return np.append(self.input_func(step), 1).reshape(-1, 1).astype(self.dtype, copy=False)
 
-    def construct_transposed_weight_matrices(self, weight_index: int) -> tuple[int, list[NDArray[np.float64]]]:
+    def construct_transposed_weight_matrices(self, weight_index: int, block_index: int = 0) -> tuple[int, list[NDArray[np.float64]]]:
         weight_matrices: list[NDArray[np.float64]] = []
-        biased_input_size = self.num_inputs + 1 if weight_index == 0 else self.num_outputs + 1
-        biased_neuron_size = self.num_neurons + 1
-        layer_shapes = [(biased_input_size, self.num_neurons)] + [(biased_neuron_size, self.num_neurons)] * (self.num_layers - 1) + [(biased_neuron_size, self.num_outputs)]
-        for rows, cols in layer_shapes:
+        input_size = self.num_inputs if weight_index == 0 else self.num_outputs
+        for layer_index, (rows, cols) in enumerate(layer_shapes(input_size, self.num_neurons, self.num_layers, self.num_outputs)):
             matrix = np.array(self.weights[weight_index:weight_index + rows * cols]).reshape(rows, cols, order='F')
+            # With a mask, pruned neurons are dropped from both of the layers they connect
+            if self._kept_layers is not None: matrix = matrix[np.ix_(*self._kept_layers[block_index][layer_index])]
             weight_matrices.append(matrix.T)
             weight_index += rows * cols
         return weight_index, weight_matrices
@@ -78,100 +337,187 @@ class NeuralNetwork:
         return activated_layers, unactivated_layers
 
     def perform_backward_propagation(self, activated_layers: list[NDArray[np.float64]], unactivated_layers: list[NDArray[np.float64]], transposed_weight_matrices: list[NDArray[np.float64]], outer_product: NDArray[np.float64]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
-        transposed_output_last_layer = activated_layers[self.num_layers].T
-        gradient_base = np.kron(np.eye(self.num_outputs), transposed_output_last_layer)
-        last_layer_gradient = outer_product @ gradient_base
+        last_layer_gradient = self._kron_identity_product(outer_product, activated_layers[self.num_layers])
         layer_gradients: list[NDArray[np.float64]] = [last_layer_gradient]
         product = (transposed_weight_matrices[self.num_layers] @ self.apply_activation_function_derivative_and_bias(unactivated_layers[self.num_layers - 1], self.outer_layer_activation_function))
         for layer_index in range(self.num_layers - 1, -1, -1):
-            transposed_output = activated_layers[layer_index].T
-            kron_product = np.kron(np.eye(self.num_neurons), transposed_output)
-            hidden_layer_gradient = outer_product @ product @ kron_product
+            hidden_layer_gradient = self._kron_identity_product(outer_product @ product, activated_layers[layer_index])
             layer_gradients.append(hidden_layer_gradient)
             if layer_index > 0:
                 product = (product @ transposed_weight_matrices[layer_index] @ self.apply_activation_function_derivative_and_bias(unactivated_layers[layer_index - 1], self.inner_layer_activation_function))
         gradient = np.hstack(list(reversed(layer_gradients)))
         return gradient, product
 
-    def _run_forward_pass(self, step: int) -> tuple[int, NDArray[np.float64], list[list[NDArray[np.float64]]], list[list[NDArray[np.float64]]], list[list[NDArray[np.float64]]]]:
+    @staticmethod
+    def _kron_identity_product(matrix: NDArray[np.float64], layer_output: NDArray[np.float64]) -> NDArray[np.float64]:
+        """`matrix @ np.kron(I, layer_output.T)` without forming the Kronecker product: column block j is `matrix[:, j] * layer_output.T`."""
+        product: NDArray[np.float64] = (matrix[:, :, np.newaxis] * layer_output.reshape(1, 1, -1)).reshape(matrix.shape[0], -1)
+        return product
+
+    def _run_forward_pass(self, input_with_bias: NDArray[np.float64]) -> ForwardPass:
         weight_index = 0
-        neural_network_output: NDArray[np.float64] = np.zeros(self.num_outputs).reshape(-1, 1)
+        neural_network_output: NDArray[np.float64] = np.zeros(self.num_outputs, dtype=self.dtype).reshape(-1, 1)
         activated_layers_blocks: list[list[NDArray[np.float64]]] = [[] for _ in range(self.num_blocks + 1)]
         unactivated_layers_blocks: list[list[NDArray[np.float64]]] = [[] for _ in range(self.num_blocks + 1)]
         transposed_weights_blocks: list[list[NDArray[np.float64]]] = [[] for _ in range(self.num_blocks + 1)]
+        residual_sums: list[NDArray[np.float64]] = []    # running output entering each block after the first
         
         for block_index in range(self.num_blocks + 1):
-            weight_index, weights_block = self.construct_transposed_weight_matrices(weight_index)
+            weight_index, weights_block = self.construct_transposed_weight_matrices(weight_index, block_index)
             transposed_weights_blocks[block_index] = weights_block
-            input_data = self.get_input_with_bias(step) if block_index == 0 else self.apply_activation_function_and_bias(neural_network_output, self.shortcut_activation_function)
+            if block_index > 0: residual_sums.append(neural_network_output.copy())
+            input_data = input_with_bias if block_index == 0 else self.apply_activation_function_and_bias(neural_network_output, self.shortcut_activation_function)
             activated_block, unactivated_block = self.perform_forward_propagation(weights_block, input_data)
             activated_layers_blocks[block_index] = activated_block
             unactivated_layers_blocks[block_index] = unactivated_block
             neural_network_output += unactivated_block[-1]
-        return weight_index, neural_network_output, activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks
+        return weight_index, neural_network_output, activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks, residual_sums
 
-    def _run_backward_pass(self, activated_layers_blocks: list[list[NDArray[np.float64]]], unactivated_layers_blocks: list[list[NDArray[np.float64]]], transposed_weights_blocks: list[list[NDArray[np.float64]]]) -> NDArray[np.float64]:
-        outer_product: NDArray[np.float64] = np.eye(self.num_outputs)
+    def _run_backward_pass(self, activated_layers_blocks: list[list[NDArray[np.float64]]], unactivated_layers_blocks: list[list[NDArray[np.float64]]], transposed_weights_blocks: list[list[NDArray[np.float64]]], residual_sums: list[NDArray[np.float64]]) -> NDArray[np.float64]:
+        # Single sweep from the last block: the block inputs come from the running sums recorded by the forward pass
+        outer_product: NDArray[np.float64] = self._output_eye
         gradient_blocks: list[NDArray[np.float64]] = []
         for block_index in range(self.num_blocks, -1, -1):
             block_gradient, inner_product = self.perform_backward_propagation(activated_layers_blocks[block_index], unactivated_layers_blocks[block_index], transposed_weights_blocks[block_index], outer_product)
             gradient_blocks.append(block_gradient)
 
             if block_index > 0:
-                block_output = sum((unactivated_layers_blocks[i][-1] for i in range(block_index)), start=np.array(0.0))
-                preactivation_derivative = self.apply_activation_function_derivative_and_bias(block_output, self.shortcut_activation_function)
+                preactivation_derivative = self.apply_activation_function_derivative_and_bias(residual_sums[block_index - 1], self.shortcut_activation_function)
                 update_term = inner_product @ transposed_weights_blocks[block_index][0] @ preactivation_derivative
-                outer_product = outer_product @ (np.eye(self.num_outputs) + update_term)
+                outer_product = outer_product + outer_product @ update_term
         
         total_gradient = np.hstack(list(reversed(gradient_blocks)))
+        # the gradient of the kept layers, restricted to the unmasked weights
+        if self._active_positions is not None: total_gradient = total_gradient[:, self._active_positions]
         return total_gradient
 
-    def predict(self, step: int) -> NDArray[np.float64]:
+    def _cache_key(self, input_with_bias: NDArray[np.float64]) -> CacheKey:
+        return self.weights_version, input_with_bias.tobytes()
+
+    def _forward(self, step: int) -> tuple[CacheKey, ForwardPass]:
+        """Forward pass for `step`, reused while the input and the weight version are unchanged."""
+        input_with_bias = self.get_input_with_bias(step)
+        key = self._cache_key(input_with_bias)
+        if self._forward_cache is None or self._forward_cache[0] != key:
+            self._forward_cache = (key, self._run_forward_pass(input_with_bias))
+        return key, self._forward_cache[1]
+
+    def _jacobian(self, step: int) -> NDArray[np.float64]:
+        """Output Jacobian w.r.t. the weights for `step`, cached under the same key as the forward pass."""
+        key, (_, _, activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks, residual_sums) = self._forward(step)
+        if self._jacobian_cache is None or self._jacobian_cache[0] != key:
+            self._jacobian_cache = (key, self._run_backward_pass(activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks, residual_sums))
+        return self._jacobian_cache[1]
+
+    def hold_learning_rate(self, step: int) -> None:
+        """Carry the learning rate over a step without adaptation."""
         self.learning_rate[step] = self.learning_rate[step - 1]
-        _, neural_network_output, _, _, _ = self._run_forward_pass(step)
-        return neural_network_output
+
+    def predict(self, step: int) -> NDArray[np.float64]:
+        self.hold_learning_rate(step)
+        _, (_, neural_network_output, _, _, _, _) = self._forward(step)
+        return neural_network_output.copy()
 
     def train_step(self, step: int, loss: NDArray[np.float64]) -> NDArray[np.float64]:
-        _, neural_network_output, activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks = self._run_forward_pass(step)
-        total_gradient = self._run_backward_pass(activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks)
-        self.neural_network_gradient_wrt_weights = total_gradient
+        _, (_, neural_network_output, _, _, _, _) = self._forward(step)
+        self.neural_network_gradient_wrt_weights = self._jacobian(step)
         self.update_neural_network_weights(step, loss)
         self.update_learning_rate(step)
-        return neural_network_output
+        return neural_network_output.copy()
 
     def set_weights(self, weights: NDArray[np.float64]) -> None:
-        self.weights = weights.copy()
+        if self.mask is not None: weights = np.where(self.mask.reshape(-1, 1), weights, 0)
+        self.weights = weights.astype(self.dtype)
+
+    def set_learning_rate(self, learning_rate: NDArray[np.float64]) -> None:
+        """Replace the learning-rate matrix at every step, as the initial value does.
+
+        A masked network also accepts a P × P matrix and keeps its rows and columns of the active weights.
+        """
+        if self._active_index is not None and learning_rate.shape[0] == np.size(self.weights): learning_rate = learning_rate[np.ix_(self._active_index, self._active_index)]
+        if learning_rate.shape != (self.num_active, self.num_active): raise ValueError(f"Learning rate has shape {learning_rate.shape}, expected {(self.num_active, self.num_active)}")
+        if isinstance(self.learning_rate, np.ndarray): self.learning_rate[:] = learning_rate.astype(self.dtype)
+        else: self.learning_rate.reset(learning_rate)
 
     def forward_raw(self, step: int) -> NDArray[np.float64]:
-        _, neural_network_output, _, _, _ = self._run_forward_pass(step)
-        return neural_network_output
+        _, (_, neural_network_output, _, _, _, _) = self._forward(step)
+        return neural_network_output.copy()
 
     def jacobian_raw(self, step: int) -> NDArray[np.float64]:
-        _, _, activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks = self._run_forward_pass(step)
-        total_gradient = self._run_backward_pass(activated_layers_blocks, unactivated_layers_blocks, transposed_weights_blocks)
-        return total_gradient
+        return self._jacobian(step).copy()
+
+    def forward_batch(self, inputs: NDArray[np.float64], weights: Optional[NDArray[np.float64]] = None, jacobian: bool = False) -> tuple[NDArray[np.float64], Optional[NDArray[np.float64]]]:
+        """Evaluate N samples at once: `inputs` is (N, num_inputs), `weights` a (P,) or (P, 1) vector shared
+        by all samples (default: the current weights) or a (N, P) weight history, one row per sample.
+
+        Returns the (N, num_outputs) outputs and, with `jacobian`, the Jacobians that `forward_raw` and
+        `jacobian_raw` give one step at a time: (N, num_outputs, P), or on a masked network
+        (N, num_outputs, num_active) over `active_weights_index()`. Nothing is cached or stored.
+        """
+        weights = self.weights if weights is None else weights
+        weights = np.asarray(weights, dtype=self.dtype)
+        if weights.shape[-1] == 1: weights = weights[..., 0]
+        if weights.shape[-1] != np.size(self.weights): raise ValueError(f"Expected {np.size(self.weights)} weights per sample, got shape {weights.shape}")
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=self.dtype))
+        if weights.ndim == 2 and weights.shape[0] != inputs.shape[0]: raise ValueError(f"Weight history has {weights.shape[0]} rows for {inputs.shape[0]} samples")
+        weight_blocks = batch_weight_matrices(weights, self.num_inputs, self.num_neurons, self.num_layers, self.num_outputs, self.num_blocks)
+        activation_functions = (self.inner_layer_activation_function, self.outer_layer_activation_function, self.shortcut_activation_function)
+        outputs, jacobians = batch_forward(weight_blocks, inputs, activation_functions, jacobian)
+        if jacobians is not None and self._active_index is not None: jacobians = jacobians[:, :, self._active_index]
+        return outputs, jacobians
+
+    def memory_nbytes(self) -> int:
+        """Bytes held by the weights, gradient and learning-rate history."""
+        return int(self.weights.nbytes + self.neural_network_gradient_wrt_weights.nbytes + self.learning_rate.nbytes)
+
+    def normalized_regressor(self) -> NDArray[np.float64]:
+        normalized: NDArray[np.float64] = self.neural_network_gradient_wrt_weights / np.linalg.norm(self.neural_network_gradient_wrt_weights, 2)
+        return normalized
+
+    def learning_rate_derivative(self, learning_rate: NDArray[np.float64], normalized_regressor: Optional[NDArray[np.float64]] = None) -> NDArray[np.float64]:
+        # The regressor is constant over a step, so integrators pass it in instead of recomputing its SVD-based norm per evaluation
+        if normalized_regressor is None: normalized_regressor = self.normalized_regressor()
+        product = normalized_regressor @ learning_rate
+        least_square_term = product.T @ product
+        forgetting_term = self.alpha * self.num_active + self.beta*learning_rate - self.gamma* learning_rate @ learning_rate
+        result = -least_square_term + forgetting_term
+        return 0.5 * (result.T + result)
+
+    def weights_derivative(self, weights: NDArray[np.float64], learning_rate: NDArray[np.float64], loss: NDArray[np.float64]) -> NDArray[np.float64]:
+        weight_derivative = learning_rate @ (self.neural_network_gradient_wrt_weights.T @ loss)
+        return self.proj(weight_derivative, weights, self.weight_bounds, learning_rate)
 
     def update_learning_rate(self, step: int) -> None:
     
+        normalized_regressor = self.normalized_regressor()
+
         def learning_rate_dynamics(t: float, learning_rate: NDArray[np.float64]) -> NDArray[np.float64]:
-            normalized_regressor = self.neural_network_gradient_wrt_weights / np.linalg.norm(self.neural_network_gradient_wrt_weights, 2)
-            product = normalized_regressor @ learning_rate
-            least_square_term = product.T @ product
-            forgetting_term = self.alpha * np.size(self.weights) + self.beta*learning_rate - self.gamma* learning_rate @ learning_rate
-            result = -least_square_term + forgetting_term
-            return 0.5 * (result.T + result)
+            return self.learning_rate_derivative(learning_rate, normalized_regressor)
     
         new_lr = integrate_step(self.learning_rate[step - 1], step, self.time_step_delta, learning_rate_dynamics)
         self.learning_rate[step] = new_lr
 
     def update_neural_network_weights(self, step: int, loss: NDArray[np.float64]) -> None:
         def weights_deriv(t: float, weights: NDArray[np.float64]) -> NDArray[np.float64]:
-            weight_derivative = self.learning_rate[step] @ (self.neural_network_gradient_wrt_weights.T @ loss)
-            projected_weights = self.proj(weight_derivative, weights, self.weight_bounds, self.learning_rate[step])
-            return projected_weights
+            return self.weights_derivative(weights, self.learning_rate[step], loss)
         
-        new_weights = integrate_step(self.weights, step, self.time_step_delta, weights_deriv)
-        self.weights = new_weights
+        new_weights = integrate_step(self.active_weights(), step, self.time_step_delta, weights_deriv)
+        self.set_active_weights(new_weights)
+
+    def compute_gradient(self, step: int) -> NDArray[np.float64]:
+        """Forward and backward pass only: stores the weight gradient for `step` and returns the output."""
+        _, (_, neural_network_output, _, _, _, _) = self._forward(step)
+        self.neural_network_gradient_wrt_weights = self._jacobian(step)
+        return neural_network_output.copy()
+
+    def pack_learning_rate(self, learning_rate: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Upper triangle of the symmetric learning-rate matrix as a flat vector."""
+        packed: NDArray[np.float64] = learning_rate[self._upper_triangle]
+        return packed
+
+    def unpack_learning_rate(self, packed: NDArray[np.float64]) -> NDArray[np.float64]:
+        learning_rate: NDArray[np.float64] = packed[self._unpack_index]
+        return learning_rate
 
     def proj(self, Theta: NDArray[np.float64], thetaHat: NDArray[np.float64], thetaBar: float, Gamma: NDArray[np.float64]) -> NDArray[np.float64]:
         result: NDArray[np.float64] = Theta
@@ -180,7 +526,9 @@ class NeuralNetwork:
         outgoing_component = thetaHat.T @ Theta
         if outgoing_component > 0.0: is_pointing_outward = True
         else:  is_pointing_outward = False
+        self.projection_calls += 1
         if is_on_or_outside_boundary and is_pointing_outward:
+            self.projection_active += 1
             denominator = thetaHat.T @ Gamma @ thetaHat
             scalar_multiplier = outgoing_component / denominator
             correction_term: NDArray[np.float64] = scalar_multiplier * (Gamma @ thetaHat)
@@ -189,42 +537,11 @@ class NeuralNetwork:
 
     @staticmethod
     def apply_activation_function_and_bias(x: NDArray[np.float64], activation_function: str) -> NDArray[np.float64]:
-        if activation_function == 'tanh': 
-            result = np.tanh(x)
-        elif activation_function == 'swish': 
-            result = x * (1.0 / (1.0 + np.exp(-x)))
-        elif activation_function == 'identity': 
-            result = x
-        elif activation_function == 'relu': 
-            result = np.maximum(0, x)
-        elif activation_function == 'sigmoid': 
-            result = 1 / (1 + np.exp(-x))
-        elif activation_function == 'leaky_relu': 
-            result = np.where(x > 0, x, 0.01 * x)
-        else:
-            raise ValueError(f"Unknown activation function: {activation_function}")
-        return np.vstack((result, [[1]]))
+        result = activate(x, activation_function)
+        return np.vstack((result, np.ones((1, 1), dtype=result.dtype)))
 
     @staticmethod
     def apply_activation_function_derivative_and_bias(x: NDArray[np.float64], activation_function: str) -> NDArray[np.float64]:
-        if activation_function == 'tanh': 
-            result = 1 - np.tanh(x)**2
-        elif activation_function == 'swish':
-            sigmoid = 1.0 / (1.0 + np.exp(-x))
-            swish = x * sigmoid
-            result = swish + sigmoid * (1 - swish)
-        elif activation_function == 'identity': 
-            result = np.ones_like(x)
-        elif activation_function == 'relu': 
-            result = (x > 0).astype(float)
-        elif activation_function == 'sigmoid':
-            sigmoid = 1 / (1 + np.exp(-x))
-            result = sigmoid * (1 - sigmoid)
-        elif activation_function == 'leaky_relu': 
-            result = np.where(x > 0, 1, 0.01)
-        else:
-            raise ValueError(f"Unknown activation function: {activation_function}")
-        diag_result = np.diag(result.flatten())
-        zeros_shape = (1, diag_result.shape[1]) if diag_result.shape[1] > 0 else (1, 1)
-        zeros_array = np.zeros(zeros_shape)
-        return np.vstack((diag_result, zeros_array))
\ No newline at end of file
+        diag_result = np.diag(activation_derivative(x, activation_function).flatten())
+        zeros_array = np.zeros((1, diag_result.shape[1]), dtype=diag_result.dtype)    # a fully pruned layer has no columns
+        return np.vstack((diag_result, zeros_array))
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+TRAJECTORY_STORAGE_MODES = ('full', 'ring', 'memmap')
+LEARNING_RATE_STORAGE_MODES = ('full', 'ring')
+DEFAULT_BUFFER_SIZE = 16
+TRAJECTORY_DIR_NAME = 'trajectories'    # memmap files go to <run output dir>/trajectories unless `trajectory_dir` is set
+
+
+class StepRing:
+    """Fixed-capacity ring of per-step frames.
+
+    Reads of a step inside the current window that has not been written return the fill frame,
+    mirroring a preallocated history array; reads of steps older than the window raise IndexError.
+    """
+
+    def __init__(self, frame_shape: tuple[int, ...], capacity: int, fill: Optional[NDArray[Any]] = None, dtype: Any = np.float64) -> None:
+        self.capacity: int = max(2, capacity)
+        self.frame_shape: tuple[int, ...] = frame_shape
+        self.dtype: np.dtype[Any] = np.dtype(dtype)
+        self._fill: NDArray[Any] = np.zeros(frame_shape, dtype=self.dtype) if fill is None else np.asarray(fill, dtype=self.dtype)
+        self._frames: NDArray[Any] = np.empty((self.capacity, *frame_shape), dtype=self.dtype)
+        self._frames[:] = self._fill
+        self._steps: NDArray[np.int64] = np.full(self.capacity, -1, dtype=np.int64)
+        self.latest_step: int = -1
+
+    def _read_evicted(self, step: int) -> NDArray[Any]:
+        raise IndexError(f"Step {step} is no longer held in memory (ring capacity {self.capacity})")
+
+    def _evict(self, step: int, frame: NDArray[Any]) -> None:
+        """Hook called before a frame is overwritten; the plain ring drops it."""
+
+    def get(self, step: int) -> NDArray[Any]:
+        slot = step % self.capacity
+        if self._steps[slot] == step:
+            frame: NDArray[Any] = self._frames[slot]
+            return frame
+        if step > self.latest_step - self.capacity: return self._fill.copy()
+        return self._read_evicted(step)
+
+    def set(self, step: int, value: Any, index: Any = Ellipsis) -> None:
+        slot = step % self.capacity
+        held_step = int(self._steps[slot])
+        if held_step != step:
+            if held_step >= 0: self._evict(held_step, self._frames[slot])
+            self._frames[slot] = self.get(step)
+            self._steps[slot] = step
+        self._frames[slot][index] = value
+        self.latest_step = max(self.latest_step, step)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._frames.nbytes)
+
+
+class RingHistory(StepRing):
+    """Step-major `(time_steps, *frame_shape)` history, such as the learning-rate tensor, that keeps
+    only the most recent steps in RAM. Supports `hist[step]` reads and assignments."""
+
+    def __init__(self, frame_shape: tuple[int, ...], time_steps: int, capacity: int, fill: Optional[NDArray[Any]] = None, dtype: Any = np.float64) -> None:
+        super().__init__(frame_shape, capacity, fill, dtype)
+        self.shape: tuple[int, ...] = (time_steps, *frame_shape)
+
+    def __getitem__(self, step: int) -> NDArray[Any]:
+        return self.get(int(step))
+
+    def __setitem__(self, step: int, value: Any) -> None:
+        self.set(int(step), value)
+
+    def reset(self, fill: NDArray[Any]) -> None:
+        """Make `fill` the value of every step, as if the history had been preallocated with it."""
+        self._fill = np.asarray(fill, dtype=self.dtype).copy()
+        self._frames[:] = self._fill
+        self._steps[:] = -1
+        self.latest_step = -1
+
+
+class RingTrajectory(StepRing):
+    """State-major `(num_states, time_steps)` trajectory that keeps only the most recent steps in RAM.
+
+    Supports the single-step indexing used by the control loop: `traj[:, step]`, `traj[i, step]`
+    and the matching assignments.
+    """
+
+    def __init__(self, num_states: int, time_steps: int, capacity: int) -> None:
+        super().__init__((num_states,), capacity)
+        self.shape: tuple[int, int] = (num_states, time_steps)
+
+    @staticmethod
+    def _split_key(key: Any) -> tuple[Any, int]:
+        if not isinstance(key, tuple) or len(key) != 2 or not isinstance(key[1], (int, np.integer)):
+            raise TypeError("Ring trajectories only support [states, step] indexing with a single integer step")
+        return key[0], int(key[1])
+
+    def __getitem__(self, key: Any) -> Any:
+        rows, step = self._split_key(key)
+        return self.get(step)[rows]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        rows, step = self._split_key(key)
+        self.set(step, value, rows)
+
+    def history(self) -> Optional[NDArray[np.float64]]:
+        """Full trajectory, if it is still available; a plain ring has dropped it."""
+        return None
+
+    def close(self) -> None:
+        """Release any resources held by the storage."""
+
+
+class MemmapTrajectory(RingTrajectory):
+    """Ring trajectory that spills evicted steps to a memory-mapped `.npy` file on disk."""
+
+    def __init__(self, num_states: int, time_steps: int, capacity: int, path: str) -> None:
+        super().__init__(num_states, time_steps, capacity)
+        self.path: str = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file: Any = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(time_steps, num_states))
+
+    def _read_evicted(self, step: int) -> NDArray[Any]:
+        return np.array(self._file[step])
+
+    def _evict(self, step: int, frame: NDArray[Any]) -> None:
+        self._file[step] = frame
+
+    def flush(self) -> None:
+        """Write the steps still held in RAM to disk."""
+        for slot, step in enumerate(self._steps):
+            if step >= 0: self._file[step] = self._frames[slot]
+        self._file.flush()
+
+    def history(self) -> Optional[NDArray[np.float64]]:
+        self.flush()
+        return np.asarray(self._file).T
+
+    def close(self) -> None:
+        self.flush()
+        del self._file
+
+
+Trajectory = Union[NDArray[np.float64], RingTrajectory]
+History = Union[NDArray[np.float64], RingHistory]
+
+
+def create_trajectory(num_states: int, time_steps: int, config: dict[str, Any], name: str) -> Trajectory:
+    """Allocate trajectory storage according to `config['trajectory_storage']` (default 'full')."""
+    mode = config.get('trajectory_storage', 'full')
+    capacity = config.get('trajectory_buffer_size', DEFAULT_BUFFER_SIZE)
+    if mode == 'full':
+        return np.zeros((num_states, time_steps))
+    elif mode == 'ring':
+        return RingTrajectory(num_states, time_steps, capacity)
+    elif mode == 'memmap':
+        if 'trajectory_dir' not in config: raise ValueError("Memory-mapped trajectory storage needs a trajectory_dir")
+        file_name = re.sub(r'[^\w.-]+', '_', name) + '.npy'
+        return MemmapTrajectory(num_states, time_steps, capacity, os.path.join(config['trajectory_dir'], file_name))
+    raise ValueError(f"Unknown trajectory storage mode: {mode}")
+
+
+def create_learning_rate_history(initial_matrix: NDArray[np.float64], time_steps: int, config: dict[str, Any]) -> History:
+    """Allocate the learning-rate history according to `config['learning_rate_storage']` (default 'full')."""
+    mode = config.get('learning_rate_storage', 'full')
+    if mode == 'full':
+        return np.stack([initial_matrix] * time_steps, axis=0)
+    elif mode == 'ring':
+        return RingHistory(initial_matrix.shape, time_steps, config.get('trajectory_buffer_size', DEFAULT_BUFFER_SIZE), initial_matrix, initial_matrix.dtype)
+    raise ValueError(f"Unknown learning rate storage mode: {mode}")
@@ -0,0 +1,82 @@
+import datetime
+import json
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..core.frozen_network import ArchitecturePlan, FrozenNetwork
+from .catalog import code_version
+
+if TYPE_CHECKING:
+    from src.core.neural_network import NeuralNetwork
+
+# Inference artifact: magic, format version and JSON header length, the JSON header, then aligned raw arrays
+ARTIFACT_MAGIC = b'RESNETFZ'
+ARTIFACT_VERSION = 1
+ARTIFACT_SUFFIX = '.nnart'
+_PREAMBLE = struct.Struct('<8sII')
+_ALIGNMENT = 64
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+def export_artifact(network: "NeuralNetwork", path: str, learning_rate_step: Optional[int] = None, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Write the architecture plan, activations, weights (in the network's dtype), sparsity mask and,
+    with `learning_rate_step`, the learning-rate matrix of that step to a versioned binary artifact."""
+    arrays: Dict[str, NDArray[Any]] = {'weights': np.ascontiguousarray(np.ravel(network.weights))}
+    if network.mask is not None: arrays['mask'] = np.asarray(network.mask, dtype=np.uint8)
+    if learning_rate_step is not None: arrays['learning_rate'] = np.ascontiguousarray(network.learning_rate[learning_rate_step], dtype=network.dtype)
+
+    header: Dict[str, Any] = {
+        'plan': ArchitecturePlan.of(network)._asdict(),
+        'metadata': {'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'), 'code_version': code_version(),
+                     'learning_rate_step': learning_rate_step, **(metadata or {})},
+        'arrays': {},
+    }
+    # Offsets are relative to the end of the header, so they do not depend on the header's own length
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = {'offset': offset, 'shape': list(array.shape), 'dtype': array.dtype.str}
+        offset = _aligned(offset + array.nbytes)
+    encoded = json.dumps(header).encode()
+    data_start = _aligned(_PREAMBLE.size + len(encoded))
+
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, len(encoded)))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(data_start + header['arrays'][name]['offset'])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+def read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """JSON header of an artifact and the file offset of its array data."""
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size: raise ValueError(f"{path} is not an inference artifact")
+        magic, version, header_length = _PREAMBLE.unpack(preamble)
+        if magic != ARTIFACT_MAGIC: raise ValueError(f"{path} is not an inference artifact")
+        if version > ARTIFACT_VERSION: raise ValueError(f"{path} has artifact format version {version}; this code reads up to {ARTIFACT_VERSION}")
+        header: Dict[str, Any] = json.loads(f.read(header_length))
+    return header, _aligned(_PREAMBLE.size + header_length)
+
+def load_artifact(path: str, mmap: bool = True) -> FrozenNetwork:
+    """Frozen network from an artifact; with `mmap` the arrays are read-only memory maps of the file."""
+    header, data_start = read_header(path)
+    arrays: Dict[str, NDArray[Any]] = {}
+    for name, spec in header['arrays'].items():
+        dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+        if mmap: arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=data_start + spec['offset'], shape=shape)
+        else:
+            with open(path, 'rb') as f:
+                f.seek(data_start + spec['offset'])
+                arrays[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+    mask = arrays['mask'].astype(bool) if 'mask' in arrays else None
+    return FrozenNetwork(ArchitecturePlan(**header['plan']), arrays['weights'], arrays.get('learning_rate'), mask, header['metadata'])
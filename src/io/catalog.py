@@ -0,0 +1,178 @@
+import datetime
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.core.entity import Agent
+
+# Run catalog: one row per agent of every run, in a SQLite file next to the run outputs
+CATALOG_FILE = 'catalog.sqlite'
+METRICS = ('rms_tracking_error', 'final_fae', 'projection_fraction', 'wall_time', 'steps')
+FILTER_COLUMNS = ('run_id', 'agent_id', 'dynamics_type', 'config_hash', 'code_version', 'stop_reason', 'output_dir')
+# Bookkeeping keys that do not change the simulated result are left out of the config hash
+UNHASHED_KEYS = ('catalog', 'catalog_path', 'progress', 'progress_interval', 'progress_log', 'progress_socket', 'store_weights', 'weight_store_max_mb', 'export_artifact', 'trajectory_dir', 'weight_store_dir')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    created TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    dynamics_type TEXT,
+    config_hash TEXT NOT NULL,
+    config TEXT NOT NULL,
+    code_version TEXT,
+    wall_time REAL,
+    steps INTEGER,
+    rms_tracking_error REAL,
+    final_fae REAL,
+    projection_fraction REAL,
+    stop_reason TEXT,
+    output_dir TEXT,
+    state_file TEXT,
+    nn_file TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_config_hash ON runs (config_hash);
+CREATE INDEX IF NOT EXISTS runs_run_id ON runs (run_id);
+CREATE INDEX IF NOT EXISTS runs_agent ON runs (agent_id, dynamics_type);
+CREATE INDEX IF NOT EXISTS runs_dynamics_rms ON runs (dynamics_type, rms_tracking_error);
+CREATE INDEX IF NOT EXISTS runs_rms ON runs (rms_tracking_error);
+CREATE INDEX IF NOT EXISTS runs_final_fae ON runs (final_fae);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+"""
+
+class RunRecord(NamedTuple):
+    run_id: str
+    created: str
+    agent_id: str
+    dynamics_type: Optional[str]
+    config_hash: str
+    config: str
+    code_version: str
+    wall_time: float
+    steps: int
+    rms_tracking_error: float
+    final_fae: Optional[float]
+    projection_fraction: Optional[float]
+    stop_reason: Optional[str]
+    output_dir: str
+    state_file: str
+    nn_file: Optional[str]
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray): return value.tolist()
+    if isinstance(value, np.generic): return value.item()
+    return str(value)
+
+def config_json(config: Dict[str, Any]) -> str:
+    """Canonical JSON of a merged config (sorted keys, arrays as lists)."""
+    return json.dumps(config, sort_keys=True, default=_json_default)
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Hash of every setting that shapes the run; equal hashes mean the same simulation."""
+    relevant = {key: value for key, value in config.items() if key not in UNHASHED_KEYS}
+    return hashlib.sha1(config_json(relevant).encode()).hexdigest()[:16]
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """`git describe --always --dirty` of the source tree, or 'unknown' outside a git checkout."""
+    try:
+        result = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+    return result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else 'unknown'
+
+class RunMetrics:
+    """Summary metrics accumulated while a run steps: RMS tracking-error norm and the last function
+    approximation error norm of each agent. The projection activity is read from the networks at the end."""
+
+    def __init__(self, agents: Sequence["Agent"]) -> None:
+        self.squared_error: Dict[int, float] = {id(agent): 0.0 for agent in agents}
+        self.steps: Dict[int, int] = {id(agent): 0 for agent in agents}
+        self.final_fae: Dict[int, Optional[float]] = {id(agent): None for agent in agents}
+
+    def update(self, step: int, agents: Iterable["Agent"]) -> None:
+        for agent in agents:
+            key = id(agent)
+            self.squared_error[key] += float(agent.tracking_error @ agent.tracking_error)
+            self.steps[key] += 1
+            if agent.agent_type != "Proportional":
+                self.final_fae[key] = float(np.linalg.norm(agent.neural_network_output - agent.target.velocities[:, step - 1]))
+
+    def rms_tracking_error(self, agent: "Agent") -> float:
+        steps = self.steps[id(agent)]
+        return float(np.sqrt(self.squared_error[id(agent)] / steps)) if steps else 0.0
+
+def run_records(agents: Sequence["Agent"], configs: Sequence[Dict[str, Any]], metrics: RunMetrics, wall_time: float, output_dir: str,
+                run_id: Optional[str] = None) -> List[RunRecord]:
+    """Catalog rows of one finished run, one per agent."""
+    run_id = uuid.uuid4().hex if run_id is None else run_id
+    created = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    records = []
+    for agent, config in zip(agents, configs):
+        network = agent.neural_network
+        neural = agent.agent_type != "Proportional"
+        projection = network.projection_active / network.projection_calls if neural and network.projection_calls else None
+        records.append(RunRecord(
+            run_id, created, agent.agent_type, config.get('dynamics_type'), config_hash(config), config_json(config), code_version(),
+            wall_time, metrics.steps[id(agent)], metrics.rms_tracking_error(agent), metrics.final_fae[id(agent)], projection, agent.stop_reason,
+            os.path.abspath(output_dir), f'{agent.agent_type}_state_data.csv', f'{agent.agent_type}_nn_data.csv' if neural else None,
+        ))
+    return records
+
+def connect(catalog_path: str) -> sqlite3.Connection:
+    """Open (and create, if needed) the catalog; concurrent writers wait for each other."""
+    directory = os.path.dirname(catalog_path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(catalog_path, timeout=60)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(_SCHEMA)
+    return connection
+
+def register_runs(catalog_path: str, records: Iterable[RunRecord]) -> None:
+    """Append the records of a run in one transaction."""
+    columns = ', '.join(RunRecord._fields)
+    placeholders = ', '.join('?' for _ in RunRecord._fields)
+    connection = connect(catalog_path)
+    try:
+        with connection:
+            connection.executemany(f'INSERT INTO runs ({columns}) VALUES ({placeholders})', list(records))
+    finally:
+        connection.close()
+
+def rank_runs(catalog_path: str, metric: str = 'rms_tracking_error', limit: Optional[int] = 10, descending: bool = False,
+              **filters: Any) -> List[Dict[str, Any]]:
+    """Catalog rows ordered by `metric` (best first), optionally filtered by equality on `FILTER_COLUMNS`.
+
+    Rows without the metric (e.g. the FAE of a Proportional agent) are left out.
+    """
+    if metric not in METRICS: raise ValueError(f"Unknown metric: {metric}")
+    unknown = set(filters) - set(FILTER_COLUMNS)
+    if unknown: raise ValueError(f"Unknown filter: {', '.join(sorted(unknown))}")
+    conditions = [f'{metric} IS NOT NULL', *(f'{column} = ?' for column in filters)]
+    query = f"SELECT * FROM runs WHERE {' AND '.join(conditions)} ORDER BY {metric} {'DESC' if descending else 'ASC'}"
+    parameters: List[Any] = list(filters.values())
+    if limit is not None:
+        query += ' LIMIT ?'
+        parameters.append(limit)
+    connection = connect(catalog_path)
+    try:
+        return [dict(row) for row in connection.execute(query, parameters)]
+    finally:
+        connection.close()
+
+def format_ranking(rows: Sequence[Dict[str, Any]], metric: str = 'rms_tracking_error') -> str:
+    lines = [f"{'ID':<30} {'dynamics':<18} {'config':<16} {metric:>20} {'steps':>8} {'wall (s)':>9}  output"]
+    for row in rows:
+        lines.append(f"{row['agent_id']:<30} {str(row['dynamics_type']):<18} {row['config_hash']:<16} {row[metric]:>20.6g} {row['steps']:>8} "
+                     f"{row['wall_time']:>9.2f}  {os.path.join(row['output_dir'], row['state_file'])}")
+    return '\n'.join(lines)
@@ -0,0 +1,69 @@
+import csv
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+# Sidecar caches live next to the CSV files they mirror
+CACHE_DIR_NAME = '.cache'
+CACHE_SUFFIX = '.npz'
+_SIGNATURE_KEY = '__signature__'
+
+def cache_path(file_path: str) -> str:
+    """Return the sidecar cache path for a CSV file."""
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, CACHE_DIR_NAME, name + CACHE_SUFFIX)
+
+def read_header(file_path: str) -> List[str]:
+    """Read only the header row of a CSV file."""
+    with open(file_path, 'r', newline='') as f:
+        return next(csv.reader(f), [])
+
+def _file_signature(file_path: str) -> Tuple[int, int]:
+    """Modification time and size used to invalidate the cache."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _load_cached_columns(file_path: str, signature: Tuple[int, int], names: Optional[Sequence[str]] = None) -> Dict[str, NDArray[np.float64]]:
+    """Load the requested (default: all) columns of a valid cache; stale or missing caches yield nothing."""
+    path = cache_path(file_path)
+    if not os.path.exists(path): return {}
+    try:
+        with np.load(path, allow_pickle=False) as cache:
+            if tuple(cache[_SIGNATURE_KEY]) != signature: return {}
+            available = [name for name in cache.files if name != _SIGNATURE_KEY]
+            return {name: cache[name] for name in (available if names is None else names) if name in available}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def _store_cached_columns(file_path: str, signature: Tuple[int, int], columns: Dict[str, NDArray[np.float64]]) -> None:
+    """Merge `columns` into the cache, writing atomically so concurrent readers never see a partial file."""
+    merged: Dict[str, Any] = {**_load_cached_columns(file_path, signature), **columns}
+    merged[_SIGNATURE_KEY] = np.array(signature, dtype=np.int64)
+    path = cache_path(file_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **merged)
+    os.replace(tmp_path, path)
+
+def read_columns(file_path: str, columns: Optional[Sequence[str]] = None, use_cache: bool = True) -> pd.DataFrame:
+    """Load only the requested columns of a CSV file, served from its sidecar cache when still valid."""
+    header = read_header(file_path)
+    wanted = list(header) if columns is None else list(columns)
+    unknown = [c for c in wanted if c not in header]
+    if unknown:
+        raise ValueError(f"Columns {unknown} not found in {file_path}")
+
+    signature = _file_signature(file_path)
+    cached = _load_cached_columns(file_path, signature, wanted) if use_cache else {}
+    missing = [c for c in wanted if c not in cached]
+    if missing:
+        parsed = pd.read_csv(file_path, usecols=missing)
+        parsed_columns = {c: parsed[c].to_numpy() for c in missing}
+        cached.update(parsed_columns)
+        if use_cache and _file_signature(file_path) == signature:
+            _store_cached_columns(file_path, signature, parsed_columns)
+    return pd.DataFrame({c: cached[c] for c in wanted})
@@ -1,139 +1,199 @@
 import csv
 import os
 from collections import defaultdict
-from csv import DictWriter
-from typing import TYPE_CHECKING, Any, Dict, List, TextIO
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
 
 import numpy as np
 
 if TYPE_CHECKING:
+    from _csv import Writer as CSVWriter
+
     from src.core.entity import Agent, Target
-    # For mypy, use the modern, specific type hint
-    CSVDictWriter = DictWriter[Any]
 else:
-    # For older Python runtimes, use the non-subscriptable class
-    CSVDictWriter = DictWriter
+    CSVWriter = Any
 
 # Constants for data management
 DATA_DIR = 'simulation_data'
 STATE_DATA_SUFFIX = '_state_data.csv'
 NN_DATA_SUFFIX = '_nn_data.csv'
-TARGET_FILE = f'{DATA_DIR}/target_state_data.csv'
-
-# Global file handles and data buffers for efficient writing
-_file_handles: Dict[str, TextIO] = {}
-_csv_writers: Dict[str, CSVDictWriter] = {}
-_data_buffers: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+TARGET_STATE_FILE = 'target_state_data.csv'
+RUN_SUMMARY_FILE = 'run_summary.csv'
+PACING_SUMMARY_FILE = 'pacing_summary.csv'
+HALVING_SCHEDULE_FILE = 'halving_schedule.csv'
+AXIS_NAMES = ('X', 'Y', 'Z')
+
+# Loggers behind the module-level functions, one per output directory they were called with
+_default_loggers: Dict[str, "RunLogger"] = {}
 _buffer_size: int = 100
 
 def ensure_directory_exists(directory: str) -> None:
     """Create directory if it doesn't exist."""
     os.makedirs(directory, exist_ok=True)
 
-def _get_csv_writer(file_path: str, headers: List[str], step: int) -> CSVDictWriter:
-    """Get or create a CSV writer for the given file path."""
-    if file_path not in _file_handles:
-        if step == 1 and os.path.exists(file_path): 
-            os.remove(file_path)
-        _file_handles[file_path] = open(file_path, 'w', newline='', buffering=8192)
-        _csv_writers[file_path] = csv.DictWriter(_file_handles[file_path], fieldnames=headers)
-        _csv_writers[file_path].writeheader()
-    return _csv_writers[file_path]
-
-def _flush_buffer(file_path: str) -> None:
-    """Flush buffered data to file."""
-    if file_path in _data_buffers and _data_buffers[file_path]:
-        writer = _csv_writers[file_path]
-        writer.writerows(_data_buffers[file_path])
-        _file_handles[file_path].flush()
-        _data_buffers[file_path].clear()
-
-def save_state_to_csv(step: int, time: float, agents: List["Agent"], target: "Target") -> None:
-    """Save agent and target state data to CSV files."""
-    ensure_directory_exists(DATA_DIR)
-
-    target_row: Dict[str, Any] = {
-        'Time': time, 
-        'Position X': target.positions[0, step - 1], 
-        'Position Y': target.positions[1, step - 1], 
-        'Position Z': target.positions[2, step - 1]
-    }
-
-    # Process agents
-    for i, agent in enumerate(agents):
-        tracking_error_norm = np.linalg.norm(agent.tracking_error)
-        agent_type = getattr(agent, 'agent_type', f'agent_{i}')
-        state_file_path = f'{DATA_DIR}/{agent_type}{STATE_DATA_SUFFIX}'
-
-        # Initialize writer if needed
-        headers = ['Time', 'Position X', 'Position Y', 'Position Z', 'Tracking Error Norm']
-        _get_csv_writer(state_file_path, headers, step)
-
-        # Buffer the data instead of writing immediately
-        row_data: Dict[str, Any] = {
-            'Time': time,
-            'Position X': agent.positions[0, step - 1],
-            'Position Y': agent.positions[1, step - 1],
-            'Position Z': agent.positions[2, step - 1],
-            'Tracking Error Norm': tracking_error_norm,
-        }
-        _data_buffers[state_file_path].append(row_data)
-
-        if len(_data_buffers[state_file_path]) >= _buffer_size: 
-            _flush_buffer(state_file_path)
-
-    target_headers = ['Time', 'Position X', 'Position Y', 'Position Z']
-    _get_csv_writer(TARGET_FILE, target_headers, step)
-    _data_buffers[TARGET_FILE].append(target_row)
-
-    if len(_data_buffers[TARGET_FILE]) >= _buffer_size:  
-        _flush_buffer(TARGET_FILE)
+def position_headers(num_states: int) -> List[str]:
+    """State column names: `Position X/Y/Z` for up to three states, `Position 1..n` beyond."""
+    if num_states <= len(AXIS_NAMES): return [f'Position {axis}' for axis in AXIS_NAMES[:num_states]]
+    return [f'Position {i + 1}' for i in range(num_states)]
+
+class RunLogger:
+    """CSV logging of one run: owns its output directory, file handles, writers and row buffers.
+
+    Runs that each hold their own logger can share an interpreter or a thread pool without touching
+    each other's files. Rows are buffered and flushed every `buffer_size` rows and on `close`; used
+    as a context manager, the logger closes itself on exit.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, buffer_size: int = _buffer_size) -> None:
+        self.data_dir: str = DATA_DIR if data_dir is None else data_dir
+        self.buffer_size = buffer_size
+        self._file_handles: Dict[str, TextIO] = {}
+        self._csv_writers: Dict[str, CSVWriter] = {}
+        self._data_buffers: Dict[str, List[Sequence[Any]]] = defaultdict(list)
+
+    def __enter__(self) -> "RunLogger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get_csv_writer(self, file_path: str, headers: List[str], step: int) -> CSVWriter:
+        """Get or create a CSV writer for the given file path."""
+        if file_path not in self._file_handles:
+            if step == 1 and os.path.exists(file_path): 
+                os.remove(file_path)
+            self._file_handles[file_path] = open(file_path, 'w', newline='', buffering=8192)
+            self._csv_writers[file_path] = csv.writer(self._file_handles[file_path])
+            self._csv_writers[file_path].writerow(headers)
+        return self._csv_writers[file_path]
+
+    def _buffer_row(self, file_path: str, row: Sequence[Any]) -> None:
+        """Buffer one row in header order, flushing once the buffer is full."""
+        self._data_buffers[file_path].append(row)
+        if len(self._data_buffers[file_path]) >= self.buffer_size:
+            self._flush_buffer(file_path)
+
+    def _flush_buffer(self, file_path: str) -> None:
+        """Flush buffered data to file."""
+        if file_path in self._data_buffers and self._data_buffers[file_path]:
+            writer = self._csv_writers[file_path]
+            writer.writerows(self._data_buffers[file_path])
+            self._file_handles[file_path].flush()
+            self._data_buffers[file_path].clear()
+
+    def save_state(self, step: int, time: float, agents: List["Agent"], target: Optional["Target"]) -> None:
+        """Save agent and target state data to CSV files; a `None` target is not logged."""
+        ensure_directory_exists(self.data_dir)
+
+        # Process agents: each row is the time, the whole state slice of the step and the tracking error norm
+        for i, agent in enumerate(agents):
+            tracking_error_norm = np.linalg.norm(agent.tracking_error)
+            agent_type = getattr(agent, 'agent_type', f'agent_{i}')
+            state_file_path = f'{self.data_dir}/{agent_type}{STATE_DATA_SUFFIX}'
+            self._get_csv_writer(state_file_path, ['Time', *position_headers(agent.num_states), 'Tracking Error Norm'], step)
+            self._buffer_row(state_file_path, [time, *agent.positions[:, step - 1], tracking_error_norm])
+
+        if target is None: return
+        target_file = f'{self.data_dir}/{TARGET_STATE_FILE}'
+        self._get_csv_writer(target_file, ['Time', *position_headers(target.num_states)], step)
+        self._buffer_row(target_file, [time, *target.positions[:, step - 1]])
+
+    def save_nn(self, step: int, time: float, agents: List["Agent"]) -> None:
+        """Save neural network data to CSV files."""
+        ensure_directory_exists(self.data_dir)
+
+        for agent in agents:
+            # Values are logged in the network's dtype, so float32 runs write float32-precision text
+            dtype = agent.neural_network.dtype.type
+            weights = np.ravel(agent.neural_network.weights).astype(dtype)
+
+            learning_rate_matrix = agent.neural_network.learning_rate[step]
+
+            nn_file_path = f'{self.data_dir}/{agent.agent_type}{NN_DATA_SUFFIX}'
+
+            headers = [
+                'Time', 
+                'Learning Rate Spectral Norm', 
+                'Function Approximation Error Norm', 
+                'Neural Network Output',
+            ] + [f'Weight_{j + 1}' for j in range(len(weights))]
+            
+            self._get_csv_writer(nn_file_path, headers, step)
+            
+            self._buffer_row(nn_file_path, [
+                time,
+                dtype(np.linalg.norm(learning_rate_matrix, 2)),
+                dtype(np.linalg.norm(agent.neural_network_output - agent.target.velocities[:, step - 1])),
+                dtype(np.linalg.norm(agent.neural_network_output)),
+                *weights,
+            ])
+
+    def save_stop_summary(self, agents: List["Agent"]) -> None:
+        """Save each agent's stop reason and stop time to the run summary CSV."""
+        self.write_stop_summary((agent.agent_type, agent.stop_reason, agent.stop_time) for agent in agents)
+
+    def write_stop_summary(self, rows: Iterable[Tuple[str, Optional[str], Optional[float]]]) -> None:
+        """Write (ID, stop reason, stop time) rows to the run summary CSV."""
+        ensure_directory_exists(self.data_dir)
+        with open(f'{self.data_dir}/{RUN_SUMMARY_FILE}', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ID', 'Stop Reason', 'Stop Time'])
+            writer.writerows(rows)
+
+    def write_pacing_summary(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Write per-agent and whole-step latency rows of a paced run to the pacing summary CSV."""
+        ensure_directory_exists(self.data_dir)
+        with open(f'{self.data_dir}/{PACING_SUMMARY_FILE}', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ID', 'Steps', 'Mean Latency', 'P99 Latency', 'Max Latency', 'Deadline Misses', 'Mean Jitter', 'Max Jitter', 'Degraded Steps'])
+            writer.writerows(rows)
+
+    def write_halving_schedule(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Write one (rung, end time, ID, RMS tracking error, rank, decision) row per candidate and rung of a successive-halving sweep."""
+        ensure_directory_exists(self.data_dir)
+        with open(f'{self.data_dir}/{HALVING_SCHEDULE_FILE}', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Rung', 'End Time', 'ID', 'RMS Tracking Error', 'Rank', 'Decision'])
+            writer.writerows(rows)
+
+    def close(self) -> None:
+        """Close all open file handles and flush remaining data."""
+        for file_path in list(self._data_buffers.keys()): 
+            self._flush_buffer(file_path)
+
+        for handle in self._file_handles.values(): 
+            handle.close()
+
+        self._file_handles.clear()
+        self._csv_writers.clear()
+        self._data_buffers.clear()
+
+def _default_logger() -> RunLogger:
+    """Logger of the module-level functions, bound to `DATA_DIR` as it is at call time."""
+    if DATA_DIR not in _default_loggers: _default_loggers[DATA_DIR] = RunLogger(DATA_DIR)
+    return _default_loggers[DATA_DIR]
+
+def save_state_to_csv(step: int, time: float, agents: List["Agent"], target: Optional["Target"]) -> None:
+    """Save agent and target state data to CSV files under `DATA_DIR`; a `None` target is not logged."""
+    _default_logger().save_state(step, time, agents, target)
 
 def save_nn_to_csv(step: int, time: float, agents: List["Agent"]) -> None:
-    """Save neural network data to CSV files."""
-    ensure_directory_exists(DATA_DIR)
-
-    for agent in agents:
-        weights = agent.neural_network.weights
-        if isinstance(weights[0], (list, np.ndarray)) and len(weights[0]) == 1: 
-            float_weights = [float(w[0]) for w in weights]
-        else: 
-            float_weights = [float(w) for w in weights]
-
-        learning_rate_matrix = agent.neural_network.learning_rate[step]
-
-        nn_file_path = f'{DATA_DIR}/{agent.agent_type}{NN_DATA_SUFFIX}'
-
-        headers = [
-            'Time', 
-            'Learning Rate Spectral Norm', 
-            'Function Approximation Error Norm', 
-            'Neural Network Output',
-        ] + [f'Weight_{j + 1}' for j in range(len(float_weights))]
-        
-        _get_csv_writer(nn_file_path, headers, step)
-        
-        row_data: Dict[str, Any] = {
-            'Time': time,
-            'Learning Rate Spectral Norm': np.linalg.norm(learning_rate_matrix, 2),
-            'Function Approximation Error Norm': np.linalg.norm(agent.neural_network_output - agent.target.velocities[:, step - 1]),
-            'Neural Network Output': np.linalg.norm(agent.neural_network_output)
-        }
-        row_data.update({f'Weight_{j + 1}': w for j, w in enumerate(float_weights)})
-
-        _data_buffers[nn_file_path].append(row_data)
-
-        if len(_data_buffers[nn_file_path]) >= _buffer_size: 
-            _flush_buffer(nn_file_path)
+    """Save neural network data to CSV files under `DATA_DIR`."""
+    _default_logger().save_nn(step, time, agents)
 
-def close_all_files() -> None:
-    """Close all open file handles and flush remaining data."""
-    for file_path in list(_data_buffers.keys()): 
-        _flush_buffer(file_path)
+def save_stop_summary(agents: List["Agent"]) -> None:
+    """Save each agent's stop reason and stop time to the run summary CSV under `DATA_DIR`."""
+    _default_logger().save_stop_summary(agents)
 
-    for handle in _file_handles.values(): 
-        handle.close()
+def write_stop_summary(rows: Iterable[Tuple[str, Optional[str], Optional[float]]]) -> None:
+    """Write (ID, stop reason, stop time) rows to the run summary CSV under `DATA_DIR`."""
+    _default_logger().write_stop_summary(rows)
 
-    _file_handles.clear()
-    _csv_writers.clear()
-    _data_buffers.clear()
\ No newline at end of file
+def write_pacing_summary(rows: Iterable[Sequence[Any]]) -> None:
+    """Write per-agent and whole-step latency rows of a paced run to the pacing summary CSV under `DATA_DIR`."""
+    _default_logger().write_pacing_summary(rows)
+
+def close_all_files() -> None:
+    """Close the files of every module-level logger and flush remaining data."""
+    for logger in _default_loggers.values(): 
+        logger.close()
+    _default_loggers.clear()
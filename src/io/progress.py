@@ -0,0 +1,81 @@
+import json
+import socket
+import time
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+# Progress reporting defaults
+DEFAULT_PROGRESS_INTERVAL = 0.5    # seconds of wall clock between updates
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """`host:port` of the UDP telemetry socket (`:port` means localhost)."""
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+class ProgressReporter:
+    """Throttled run progress: steps/s, per-agent step time and ETA at most once per `progress_interval`.
+
+    The same telemetry can be appended as JSON lines to `progress_log` and sent as UDP datagrams to
+    `progress_socket` (`host:port`). Step times are accumulated with `add_time` between updates.
+    """
+
+    def __init__(self, time_steps: int, config: Dict[str, Any], stream: Optional[TextIO] = None) -> None:
+        self.time_steps = time_steps
+        self.interval: float = config.get('progress_interval', DEFAULT_PROGRESS_INTERVAL)
+        self.enabled: bool = config.get('progress', True)
+        self.stream = stream
+        self._log: Optional[TextIO] = None
+        self._socket: Optional[socket.socket] = None
+        self._address: Optional[Tuple[str, int]] = None
+        if config.get('progress_log'): self._log = open(config['progress_log'], 'a')
+        if config.get('progress_socket'):
+            self._address = parse_address(config['progress_socket'])
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._agent_times: Dict[str, float] = {}
+        self._start = time.perf_counter()
+        self._last_report = self._start
+        self._last_step = 0
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self._agent_times[name] = self._agent_times.get(name, 0.0) + seconds
+
+    def update(self, step: int, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Report if the interval has elapsed (or `force`); returns the emitted record, if any."""
+        now = time.perf_counter()
+        if step == self._last_step or (not force and now - self._last_report < self.interval): return None
+        steps = step - self._last_step
+        elapsed = now - self._last_report
+        steps_per_second = steps / elapsed if elapsed > 0 else 0.0
+        remaining = self.time_steps - 1 - step
+        record: Dict[str, Any] = {
+            'step': step,
+            'time_steps': self.time_steps,
+            'progress': step / self.time_steps,
+            'elapsed': now - self._start,
+            'steps_per_second': steps_per_second,
+            'eta': 0.0 if remaining <= 0 else remaining / steps_per_second if steps_per_second > 0 else None,
+            'agent_step_ms': {name: 1000 * total / steps for name, total in self._agent_times.items()} if steps else {},
+        }
+        self._agent_times.clear()
+        self._last_report, self._last_step = now, step
+        self._emit(record)
+        return record
+
+    def _emit(self, record: Dict[str, Any]) -> None:
+        if self.enabled:
+            eta = f"{record['eta']:7.1f} s" if record['eta'] is not None else '      -'
+            slowest = max(record['agent_step_ms'].items(), key=lambda item: item[1], default=None)
+            agents = f" | slowest {slowest[0]} {slowest[1]:.2f} ms/step" if slowest else ''
+            print(f"Progress: {record['progress'] * 100:6.2f}% | {record['steps_per_second']:8.1f} steps/s | ETA {eta}{agents}", end='\r', flush=True, file=self.stream)
+        if self._log is not None or self._socket is not None:
+            line = json.dumps(record)
+            if self._log is not None:
+                self._log.write(line + '\n')
+                self._log.flush()
+            if self._socket is not None and self._address is not None:
+                try: self._socket.sendto(line.encode(), self._address)
+                except OSError: pass    # telemetry must never stop a run
+
+    def close(self) -> None:
+        if self._log is not None: self._log.close()
+        if self._socket is not None: self._socket.close()
+        self._log = self._socket = None
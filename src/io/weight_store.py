@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import data_manager
+
+if TYPE_CHECKING:
+    from src.core.neural_network import NeuralNetwork
+
+# Converged weights and learning-rate matrices, one .npz entry per architecture/dynamics/config hash
+WEIGHT_STORE_DIR_NAME = 'weight_store'    # under DATA_DIR unless `weight_store_dir` is set
+DEFAULT_MAX_STORE_MB = 64.0
+ARCHITECTURE_KEYS = ('num_states', 'num_blocks', 'num_layers', 'num_neurons', 'output_size')
+CONFIG_HASH_KEYS = ('dynamics_type', 'inner_activation', 'output_activation', 'shortcut_activation', 'initial_learning_rate',
+                    'minimum_singular_value', 'maximum_singular_value', 'weight_bounds', 'k1', 'time_step_delta')
+_METADATA_KEY = 'metadata'
+
+def architecture_key(config: Dict[str, Any]) -> str:
+    """Key of the weight layout; only entries with the same key can be loaded into a network."""
+    return '-'.join(f'{key}{config[key]}' for key in ARCHITECTURE_KEYS)
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Short hash of the architecture and the settings that shape the converged weights."""
+    relevant = {key: config.get(key) for key in ARCHITECTURE_KEYS + CONFIG_HASH_KEYS}
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode()).hexdigest()[:12]
+
+def default_store_dir() -> str:
+    """`<DATA_DIR>/weight_store`, resolved at call time so a redirected output directory also moves the store."""
+    return os.path.join(data_manager.DATA_DIR, WEIGHT_STORE_DIR_NAME)
+
+def entry_path(config: Dict[str, Any], store_dir: Optional[str] = None) -> str:
+    """Path of the store entry for `config`."""
+    return os.path.join(default_store_dir() if store_dir is None else store_dir, f"{architecture_key(config)}_{config['dynamics_type']}_{config_hash(config)}.npz")
+
+def read_metadata(path: str) -> Optional[Dict[str, Any]]:
+    """Metadata of a store entry, or None if the file is not a readable entry."""
+    try:
+        with np.load(path, allow_pickle=False) as entry:
+            metadata: Dict[str, Any] = json.loads(str(entry[_METADATA_KEY]))
+            return metadata
+    except (OSError, ValueError, KeyError):
+        return None
+
+def list_entries(store_dir: Optional[str] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """All readable entries of the store with their metadata."""
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    if not os.path.isdir(store_dir): return []
+    entries = []
+    for name in sorted(os.listdir(store_dir)):
+        if not name.endswith('.npz'): continue
+        path = os.path.join(store_dir, name)
+        metadata = read_metadata(path)
+        if metadata is not None: entries.append((path, metadata))
+    return entries
+
+def find_closest(config: Dict[str, Any], store_dir: Optional[str] = None) -> Optional[str]:
+    """Best stored entry for `config`: same architecture required, then exact config hash, same dynamics,
+    most matching settings and most recent use, in that order."""
+    architecture, digest = architecture_key(config), config_hash(config)
+    candidates = [(path, metadata) for path, metadata in list_entries(store_dir) if metadata['architecture'] == architecture]
+    if not candidates: return None
+
+    def score(candidate: Tuple[str, Dict[str, Any]]) -> Tuple[bool, bool, int, int]:
+        path, metadata = candidate
+        matching = sum(metadata['settings'].get(key) == config.get(key) for key in CONFIG_HASH_KEYS)
+        return metadata['config_hash'] == digest, metadata['settings'].get('dynamics_type') == config['dynamics_type'], matching, os.stat(path).st_mtime_ns
+    return max(candidates, key=score)[0]
+
+def load_entry(path: str) -> Tuple[NDArray[np.float64], NDArray[np.float64], Dict[str, Any]]:
+    """Load weights, learning-rate matrix and metadata, marking the entry as recently used."""
+    with np.load(path, allow_pickle=False) as entry:
+        weights, learning_rate, metadata = entry['weights'], entry['learning_rate'], json.loads(str(entry[_METADATA_KEY]))
+    os.utime(path)
+    return weights, learning_rate, metadata
+
+def save_entry(config: Dict[str, Any], weights: NDArray[np.float64], learning_rate: NDArray[np.float64], steps: int, store_dir: Optional[str] = None, max_mb: float = DEFAULT_MAX_STORE_MB) -> str:
+    """Store converged weights and learning rate for `config`, replacing its previous entry, then evict down to `max_mb`."""
+    store_dir = default_store_dir() if store_dir is None else store_dir
+    metadata = {
+        'architecture': architecture_key(config),
+        'config_hash': config_hash(config),
+        'settings': {key: config.get(key) for key in CONFIG_HASH_KEYS},
+        'ID': config.get('ID'),
+        'steps': steps,
+    }
+    path = entry_path(config, store_dir)
+    os.makedirs(store_dir, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, weights=np.asarray(weights, dtype=np.float64), learning_rate=np.asarray(learning_rate, dtype=np.float64), metadata=np.array(json.dumps(metadata)))
+    os.replace(tmp_path, path)
+    evict(store_dir, int(max_mb * 2**20), keep=path)
+    return path
+
+def evict(store_dir: str, max_bytes: int, keep: Optional[str] = None) -> List[str]:
+    """Delete least recently used entries until the store fits in `max_bytes`; `keep` is never deleted."""
+    if not os.path.isdir(store_dir): return []
+    paths = [os.path.join(store_dir, name) for name in os.listdir(store_dir) if name.endswith('.npz')]
+    stats = {path: os.stat(path) for path in paths}
+    total = sum(stat.st_size for stat in stats.values())
+    removed = []
+    for path in sorted(paths, key=lambda p: stats[p].st_mtime_ns):
+        if total <= max_bytes: break
+        if path == keep: continue
+        os.remove(path)
+        total -= stats[path].st_size
+        removed.append(path)
+    return removed
+
+def warm_start(network: "NeuralNetwork", config: Dict[str, Any]) -> Optional[str]:
+    """Initialize `network` from the closest stored entry; returns the entry used, if any."""
+    path = find_closest(config, config.get('weight_store_dir'))
+    if path is None: return None
+    weights, learning_rate, _ = load_entry(path)
+    network.set_weights(weights)
+    # an entry stored under a different sparsity mask keeps the initial learning rate
+    if learning_rate.shape[0] in (np.size(network.weights), network.num_active): network.set_learning_rate(learning_rate)
+    return path
+
+def store_network(network: "NeuralNetwork", config: Dict[str, Any], step: int) -> str:
+    """Store the weights and the learning rate of `network` at `step`."""
+    return save_entry(config, network.weights, network.learning_rate[step], step,
+                      config.get('weight_store_dir'), config.get('weight_store_max_mb', DEFAULT_MAX_STORE_MB))
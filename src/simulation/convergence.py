@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+EARLY_STOPPING_SCOPES = ('agent', 'run')
+DEFAULT_SETTLING_WINDOW = 1.0
+DEFAULT_ERROR_TOLERANCE = 1e-2
+DEFAULT_WEIGHT_RATE_TOLERANCE = 1e-2
+
+
+class ConvergenceMonitor:
+    """Windowed settling test on the tracking error and the rate of change of the weights.
+
+    An agent is settled once a full window of `settling_window` seconds has an RMS tracking
+    error at most `settling_error_tolerance` and a peak weight rate ||dθ/dt|| at most
+    `settling_weight_rate_tolerance`.
+    """
+
+    def __init__(self, config: dict[str, Any], initial_weights: Optional[NDArray[np.float64]] = None) -> None:
+        self.time_step_delta: float = config['time_step_delta']
+        self.window_steps: int = max(1, int(round(config.get('settling_window', DEFAULT_SETTLING_WINDOW) / self.time_step_delta)))
+        self.error_tolerance: float = config.get('settling_error_tolerance', DEFAULT_ERROR_TOLERANCE)
+        self.weight_rate_tolerance: float = config.get('settling_weight_rate_tolerance', DEFAULT_WEIGHT_RATE_TOLERANCE)
+        self._squared_errors: deque[float] = deque()
+        self._squared_error_sum: float = 0.0
+        self._weight_rate_peaks: deque[tuple[int, float]] = deque()    # monotonic queue of (step, rate) for the windowed maximum
+        self._previous_weights: Optional[NDArray[np.float64]] = None if initial_weights is None else np.ravel(initial_weights).astype(np.float64)
+        self.settled_step: Optional[int] = None
+
+    def update(self, step: int, tracking_error: NDArray[np.float64], weights: NDArray[np.float64]) -> bool:
+        """Add one step of data and return whether the settling criteria hold over the last window."""
+        squared_error = float(np.dot(tracking_error, tracking_error))
+        self._squared_errors.append(squared_error)
+        self._squared_error_sum += squared_error
+        if len(self._squared_errors) > self.window_steps:
+            self._squared_error_sum -= self._squared_errors.popleft()
+
+        flat_weights = np.ravel(weights).astype(np.float64)
+        weight_rate = 0.0 if self._previous_weights is None else float(np.linalg.norm(flat_weights - self._previous_weights)) / self.time_step_delta
+        self._previous_weights = flat_weights
+        while self._weight_rate_peaks and self._weight_rate_peaks[-1][1] <= weight_rate: self._weight_rate_peaks.pop()
+        self._weight_rate_peaks.append((step, weight_rate))
+        while self._weight_rate_peaks[0][0] <= step - self.window_steps: self._weight_rate_peaks.popleft()
+
+        settled = self.is_settled()
+        if settled and self.settled_step is None: self.settled_step = step
+        return settled
+
+    @property
+    def rms_error(self) -> float:
+        return float(np.sqrt(max(self._squared_error_sum, 0.0) / max(len(self._squared_errors), 1)))
+
+    @property
+    def peak_weight_rate(self) -> float:
+        return self._weight_rate_peaks[0][1] if self._weight_rate_peaks else 0.0
+
+    def is_settled(self) -> bool:
+        if len(self._squared_errors) < self.window_steps: return False
+        return self.rms_error <= self.error_tolerance and self.peak_weight_rate <= self.weight_rate_tolerance
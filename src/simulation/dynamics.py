@@ -1,11 +1,26 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, List
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
 from numpy.typing import NDArray
 
 # ---------------------------------------------------------------------
+def _skew(v: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Return the 3x3 skew-symmetric matrix of vector v (rad/s)."""
+    x, y, z = v
+    return np.array([[0.0, -z, y],
+                     [z, 0.0, -x],
+                     [-y, x, 0.0]])
+
+def _attitude_body_rate() -> NDArray[np.float64]:
+    """Constant body rate of the attitude model, rad/s."""
+    j_inertia: NDArray[np.float64] = np.diag([2.0, 1.2, 1.6])             # kg·m^2
+    tau_body: NDArray[np.float64] = np.array([0.0, 0.15, 0.0])            # N·m
+    omega_body: NDArray[np.float64] = np.linalg.inv(j_inertia) @ tau_body  # rad/s
+    return omega_body
+
 def attitude_mrp(state: NDArray[np.float64]) -> NDArray[np.float64]:
     """
     Rigid-body attitude kinematics in Modified Rodrigues Parameters.
@@ -16,27 +31,23 @@ def attitude_mrp(state: NDArray[np.float64]) -> NDArray[np.float64]:
     Returns
         r_dot : np.ndarray, shape (3,)  -- time derivative of r, 1/s
     """
-
-    def _skew(v: NDArray[np.float64]) -> NDArray[np.float64]:
-        """Return the 3x3 skew-symmetric matrix of vector v (rad/s)."""
-        x, y, z = v
-        return np.array([[0.0, -z, y],
-                         [z, 0.0, -x],
-                         [-y, x, 0.0]])
-
     r: NDArray[np.float64] = state
     r_sq: float = float(np.dot(r, r))
     b_mat: NDArray[np.float64] = (1.0 - r_sq) * np.eye(3) + 2.0 * _skew(r) + 2.0 * np.outer(r, r)
-
-    j_inertia: NDArray[np.float64] = np.diag([2.0, 1.2, 1.6])             # kg·m^2
-    tau_body: NDArray[np.float64] = np.array([0.0, 0.15, 0.0])            # N·m
-    omega_body: NDArray[np.float64] = np.linalg.inv(j_inertia) @ tau_body  # rad/s
+    omega_body = _attitude_body_rate()
 
     r_dot: NDArray[np.float64] = 0.5 * b_mat @ omega_body
     return r_dot
 
+def attitude_mrp_jacobian(state: NDArray[np.float64]) -> NDArray[np.float64]:
+    """d r_dot / d r = (r·ω) I + r ωᵀ - ω rᵀ - [ω]×"""
+    r: NDArray[np.float64] = state
+    omega_body = _attitude_body_rate()
+    jacobian: NDArray[np.float64] = float(np.dot(r, omega_body)) * np.eye(3) + np.outer(r, omega_body) - np.outer(omega_body, r) - _skew(omega_body)
+    return jacobian
+
 # ---------------------------------------------------------------------
-def chua(state: NDArray[np.float64]) -> NDArray[np.float64]:
+def chua(state: NDArray[np.float64], alpha: float = 15.6, beta: float = 28.0, m0: float = -1.143, m1: float = -0.714) -> NDArray[np.float64]:
     """
     Dimensionless Chua double-scroll circuit.
 
@@ -44,13 +55,13 @@ def chua(state: NDArray[np.float64]) -> NDArray[np.float64]:
         x : capacitor voltage proxy, unitless
         y : capacitor voltage proxy, unitless
         z : inductor current proxy, unitless
+
+    Parameters (unitless)
+        alpha, beta : circuit gains; a large alpha makes x a fast, stiff mode
+        m0, m1      : inner and outer slopes of the piecewise-linear diode
     """
 
     x, y, z = state
-    alpha: float = 15.6          # unitless
-    beta: float = 28.0           # unitless
-    m0: float = -1.143           # unitless
-    m1: float = -0.714           # unitless
 
     g: float = m1 * x + 0.5 * (m0 - m1) * (abs(x + 1.0) - abs(x - 1.0))
 
@@ -59,8 +70,15 @@ def chua(state: NDArray[np.float64]) -> NDArray[np.float64]:
     z_dot: float = -beta * y
     return np.array([x_dot, y_dot, z_dot], dtype=np.float64)
 
+def chua_jacobian(state: NDArray[np.float64], alpha: float = 15.6, beta: float = 28.0, m0: float = -1.143, m1: float = -0.714) -> NDArray[np.float64]:
+    """Jacobian of `chua`; the diode slope is m0 inside |x| < 1 and m1 outside."""
+    slope: float = m0 if abs(state[0]) < 1.0 else m1
+    return np.array([[-alpha * (1.0 + slope), alpha, 0.0],
+                     [1.0, -1.0, 1.0],
+                     [0.0, -beta, 0.0]])
+
 # ---------------------------------------------------------------------
-def trophic_dynamics(state: NDArray[np.float64]) -> NDArray[np.float64]:
+def trophic_dynamics(state: NDArray[np.float64], r_h: float = 0.6, k_cap: float = 100.0, a_hp: float = 0.02, a_pt: float = 0.01, d_p: float = 0.3, d_t: float = 0.1) -> NDArray[np.float64]:
     """
     Three-tier ecological food chain.
 
@@ -68,21 +86,55 @@ def trophic_dynamics(state: NDArray[np.float64]) -> NDArray[np.float64]:
         H : prey (herbivore) population, individuals
         P : predator population, individuals
         T : top-predator population, individuals
+
+    Parameters
+        r_h        : prey growth rate, 1/day; a large r_h makes the logistic relaxation stiff
+        k_cap      : prey carrying capacity, individuals
+        a_hp, a_pt : predation rates, 1/(individual·day)
+        d_p, d_t   : predator and top-predator death rates, 1/day
     """
 
     h_pop, p_pop, t_pop = state
-    r_h: float = 0.6               # 1/day
-    k_cap: float = 100.0           # individuals
-    a_hp: float = 0.02             # 1/(individual·day)
-    a_pt: float = 0.01             # 1/(individual·day)
-    d_p: float = 0.3               # 1/day
-    d_t: float = 0.1               # 1/day
 
     h_dot: float = r_h * h_pop * (1.0 - h_pop / k_cap) - a_hp * h_pop * p_pop
     p_dot: float = -d_p * p_pop + a_hp * h_pop * p_pop - a_pt * p_pop * t_pop
     t_dot: float = -d_t * t_pop + a_pt * p_pop * t_pop
     return np.array([h_dot, p_dot, t_dot], dtype=np.float64)
 
+def trophic_dynamics_jacobian(state: NDArray[np.float64], r_h: float = 0.6, k_cap: float = 100.0, a_hp: float = 0.02, a_pt: float = 0.01, d_p: float = 0.3, d_t: float = 0.1) -> NDArray[np.float64]:
+    """Jacobian of `trophic_dynamics`."""
+    h_pop, p_pop, t_pop = state
+    return np.array([[r_h * (1.0 - 2.0 * h_pop / k_cap) - a_hp * p_pop, -a_hp * h_pop, 0.0],
+                     [a_hp * p_pop, -d_p + a_hp * h_pop - a_pt * t_pop, -a_pt * p_pop],
+                     [0.0, a_pt * t_pop, -d_t + a_pt * p_pop]])
+
+# ---------------------------------------------------------------------
+LORENZ96_FORCING: float = 8.0    # unitless, chaotic for F >= 8
+
+def lorenz96(state: NDArray[np.float64], forcing: float = LORENZ96_FORCING) -> NDArray[np.float64]:
+    """
+    Lorenz-96 ring of any dimension n >= 4.
+
+    State vector
+        x : np.ndarray, shape (n,)  -- sites on a periodic latitude circle, unitless
+
+    Returns
+        x_dot_i = (x_{i+1} - x_{i-2}) * x_{i-1} - x_i + F
+    """
+    if state.shape[0] < 4: raise ValueError("lorenz96 needs at least 4 states")
+    x_dot: NDArray[np.float64] = (np.roll(state, -1) - np.roll(state, 2)) * np.roll(state, 1) - state + forcing
+    return x_dot
+
+def lorenz96_jacobian(state: NDArray[np.float64], forcing: float = LORENZ96_FORCING) -> NDArray[np.float64]:
+    """Jacobian of `lorenz96`: row i is nonzero at i-2, i-1, i and i+1 (periodic)."""
+    n = state.shape[0]
+    rows = np.arange(n)
+    jacobian: NDArray[np.float64] = -np.eye(n)
+    jacobian[rows, (rows + 1) % n] += np.roll(state, 1)
+    jacobian[rows, (rows - 2) % n] -= np.roll(state, 1)
+    jacobian[rows, (rows - 1) % n] += np.roll(state, -1) - np.roll(state, 2)
+    return jacobian
+
 # ---------------------------------------------------------------------
 def custom(state: NDArray[np.float64]) -> NDArray[np.float64]:
     """
@@ -91,24 +143,43 @@ def custom(state: NDArray[np.float64]) -> NDArray[np.float64]:
     """
     return np.zeros_like(state, dtype=np.float64)
 
+def custom_jacobian(state: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.zeros((state.shape[0], state.shape[0]))
+
 # ---------------------------------------------------------------------
-def get_dynamics_function(dynamics_type: str) -> Callable[[NDArray[np.float64]], NDArray[np.float64]]:
-    """Return the dynamics function associated with `dynamics_type`."""
-    dynamics_map: Dict[str, Callable[[NDArray[np.float64]], NDArray[np.float64]]] = {
+def get_dynamics_function(dynamics_type: str, parameters: Optional[Dict[str, Any]] = None) -> Callable[[NDArray[np.float64]], NDArray[np.float64]]:
+    """Return the dynamics function associated with `dynamics_type`, with `parameters` overriding its defaults."""
+    dynamics_map: Dict[str, Callable[..., NDArray[np.float64]]] = {
         "attitude_mrp": attitude_mrp,
         "chua": chua,
         "trophic_dynamics": trophic_dynamics,
+        "lorenz96": lorenz96,
         "custom": custom,
     }
-    return dynamics_map[dynamics_type]
+    if not parameters: return dynamics_map[dynamics_type]
+    return partial(dynamics_map[dynamics_type], **parameters)
+
+# ---------------------------------------------------------------------
+def get_jacobian_function(dynamics_type: str, parameters: Optional[Dict[str, Any]] = None) -> Callable[[NDArray[np.float64]], NDArray[np.float64]]:
+    """Return the analytic state Jacobian of `dynamics_type`, with the same `parameters` as its dynamics."""
+    jacobian_map: Dict[str, Callable[..., NDArray[np.float64]]] = {
+        "attitude_mrp": attitude_mrp_jacobian,
+        "chua": chua_jacobian,
+        "trophic_dynamics": trophic_dynamics_jacobian,
+        "lorenz96": lorenz96_jacobian,
+        "custom": custom_jacobian,
+    }
+    if not parameters: return jacobian_map[dynamics_type]
+    return partial(jacobian_map[dynamics_type], **parameters)
 
 # ---------------------------------------------------------------------
-def get_initial_conditions(dynamics_type: str) -> List[float]:
-    """Return a list of reasonable initial conditions for the chosen model."""
+def get_initial_conditions(dynamics_type: str, num_states: int = 3) -> List[float]:
+    """Return a list of reasonable initial conditions for the chosen model; `num_states` sizes the dimension-generic ones."""
     initial_conditions_map: Dict[str, List[float]] = {
         "attitude_mrp": [0.25, 0.10, -0.30],      # unitless
         "chua": [0.2, 0.0, 0.0],                  # unitless
         "trophic_dynamics": [40.0, 9.0, 2.0],     # individuals
-        "custom": [0.0, 0.0, 0.0],
+        "lorenz96": [LORENZ96_FORCING + 0.01] + [LORENZ96_FORCING] * (num_states - 1),    # unitless, perturbed equilibrium
+        "custom": [0.0] * num_states,
     }
     return initial_conditions_map[dynamics_type]
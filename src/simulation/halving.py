@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, NamedTuple, Optional
+
+from ..core.entity import Agent
+from ..io.catalog import RunMetrics
+from ..io.data_manager import RunLogger
+from ..io.progress import ProgressReporter
+from .preflight import preflight
+from .runner import create_agents, create_target, finish_run, with_trajectory_dir
+
+# Successive-halving defaults
+DEFAULT_KEEP_FRACTION = 0.5     # share of candidates that survives each rung
+DEFAULT_INITIAL_FRACTION = 0.125    # first rung horizon as a fraction of final_time
+# Run modes of the plain runner that a race cannot honour: it ranks and stops agents itself, as fast as it can
+UNSUPPORTED_KEYS = ('early_stopping', 'real_time')
+
+
+class RungEntry(NamedTuple):
+    rung: int
+    end_time: float
+    ID: str
+    rms_tracking_error: float
+    rank: int
+    decision: str    # 'kept', 'eliminated' or 'final'
+
+
+class HalvingResult(NamedTuple):
+    agents: list[Agent]        # every candidate; eliminated ones stopped early with stop_reason 'eliminated'
+    survivors: list[Agent]     # candidates that reached final_time, best first
+    schedule: list[RungEntry]
+    agent_steps: int           # simulated agent steps, against len(agents) * steps for full runs
+
+
+def rung_end_times(final_time: float, initial_time: float, growth: float) -> list[float]:
+    """Rung horizons initial_time * growth**r, ending with final_time."""
+    if initial_time <= 0 or growth <= 1: raise ValueError("Successive halving needs a positive initial time and a growth factor above 1")
+    times = []
+    end_time = initial_time
+    while end_time < final_time * (1 - 1e-9):    # a rung that lands on final_time is the final rung
+        times.append(end_time)
+        end_time *= growth
+    return times + [final_time]
+
+def rung_end_steps(end_times: list[float], time_step_delta: float, time_steps: int) -> list[int]:
+    """Last step of each rung. A rung that rounds to step 0 or to the next rung's step merges into the next,
+    so every rung simulates at least one step before it ranks."""
+    if time_steps < 2: raise ValueError("Successive halving needs at least one step to simulate")
+    steps = [min(int(round(end_time / time_step_delta)), time_steps - 1) for end_time in end_times]
+    return [end_step for end_step, next_step in zip(steps, steps[1:] + [time_steps]) if 0 < end_step < next_step]
+
+def survivors_count(num_candidates: int, keep_fraction: float, min_survivors: int) -> int:
+    return max(min(min_survivors, num_candidates), math.ceil(num_candidates * keep_fraction))
+
+def run_successive_halving(configs: list[dict[str, Any]], logger: Optional[RunLogger] = None) -> HalvingResult:
+    """Race all controller configurations against one target and drop the worst at the end of each rung.
+
+    All candidates start together and are ranked by tracking-error RMS since t = 0 at every rung end
+    (`halving_initial_time`, then growing by `halving_growth` up to `final_time`). The best
+    `halving_keep_fraction` (at least `halving_min_survivors`) continue from their in-memory state;
+    the others stop with stop reason 'eliminated'. Survivors' output is identical to a full run of
+    their configuration. The schedule is printed and written to the halving schedule CSV.
+    """
+    start_time = time.perf_counter()
+    unsupported = [key for key in UNSUPPORTED_KEYS if any(config.get(key, False) for config in configs)]
+    if unsupported: raise ValueError(f"Successive halving does not support {', '.join(unsupported)}")
+    configs = preflight(configs)
+    owns_logger = logger is None
+    run_logger = RunLogger() if logger is None else logger
+    configs = with_trajectory_dir(configs, run_logger.data_dir)
+    base_config = configs[0]
+
+    final_time: float = base_config['final_time']
+    time_step_delta: float = base_config['time_step_delta']
+    time_steps: int = int(final_time / time_step_delta)
+    keep_fraction: float = base_config.get('halving_keep_fraction', DEFAULT_KEEP_FRACTION)
+    if not 0 < keep_fraction < 1: raise ValueError(f"halving_keep_fraction must be in (0, 1), got {keep_fraction}")
+    min_survivors: int = base_config.get('halving_min_survivors', 1)
+    initial_time: float = base_config.get('halving_initial_time', final_time * DEFAULT_INITIAL_FRACTION)
+    growth: float = base_config.get('halving_growth', 1 / keep_fraction)
+    end_steps = rung_end_steps(rung_end_times(final_time, initial_time, growth), time_step_delta, time_steps)
+
+    target = create_target(base_config, time_steps)
+    agents = create_agents(configs, target, time_steps)
+    metrics = RunMetrics(agents)
+    progress = ProgressReporter(time_steps, base_config)
+    active_agents: list[Agent] = list(agents)
+    schedule: list[RungEntry] = []
+    agent_steps = 0
+
+    print(f"Successive halving: {len(agents)} candidates, rungs ending at " + ', '.join(f'{end_step * time_step_delta:g} s' for end_step in end_steps))
+    step = 0
+    for rung, end_step in enumerate(end_steps):
+        for step in range(step + 1, end_step + 1):
+            for agent in active_agents:
+                start = time.perf_counter()
+                agent.compute_control_output(step)
+                agent.update_dynamics(step)
+                progress.add_time(agent.agent_type, time.perf_counter() - start)
+            target.update_dynamics(step)
+            metrics.update(step, active_agents)
+            agent_steps += len(active_agents)
+
+            time_sim: float = step * time_step_delta
+            run_logger.save_state(step, time_sim, active_agents, target)
+            run_logger.save_nn(step, time_sim, active_agents)
+            progress.update(step)
+
+        # Rank by RMS since the start; ties keep configuration order
+        ranked = sorted(active_agents, key=metrics.rms_tracking_error)
+        final = rung == len(end_steps) - 1
+        keep = len(ranked) if final else survivors_count(len(ranked), keep_fraction, min_survivors)
+        for rank, agent in enumerate(ranked, 1):
+            decision = 'final' if final else 'kept' if rank <= keep else 'eliminated'
+            schedule.append(RungEntry(rung, step * time_step_delta, agent.agent_type, metrics.rms_tracking_error(agent), rank, decision))
+            if decision == 'eliminated': agent.stop_reason, agent.stop_time = 'eliminated', step * time_step_delta
+        active_agents = ranked[:keep]
+        progress.update(step, force=True)
+        ranking = ', '.join(f"{entry.ID} {entry.rms_tracking_error:.4g}" + (' (eliminated)' if entry.decision == 'eliminated' else '') for entry in schedule if entry.rung == rung)
+        print(f"\nRung {rung} (t = {step * time_step_delta:g} s): {ranking}")
+
+    progress.close()
+    for agent in active_agents: agent.stop_reason, agent.stop_time = 'final_time', step * time_step_delta
+    print(f"Successive halving completed: {agent_steps} of {len(agents) * (time_steps - 1)} agent steps simulated, best {active_agents[0].agent_type}.")
+    run_logger.write_halving_schedule(schedule)
+    run_logger.save_stop_summary(agents)
+    if owns_logger: run_logger.close()
+    finish_run(agents, configs, target, run_logger, metrics if base_config.get('catalog', True) else None, start_time)
+    return HalvingResult(agents, active_agents, schedule, agent_steps)
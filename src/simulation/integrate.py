@@ -1,11 +1,19 @@
 from collections.abc import Callable
+from typing import Any, Optional
 
 import numpy as np
 from numpy.typing import NDArray
 from scipy.integrate import solve_ivp
 
+# Explicit RK45 is the default; the implicit methods use an analytic Jacobian when one is given
+INTEGRATION_METHODS = ('RK45', 'Radau', 'BDF', 'LSODA')
+IMPLICIT_METHODS = ('Radau', 'BDF', 'LSODA')
 
-def integrate_step(state: NDArray[np.float64], step: int, dt: float,  derivative: Callable[[float, NDArray[np.float64]], NDArray[np.float64]]) -> NDArray[np.float64]:
+
+def solve_step(state: NDArray[np.float64], step: int, dt: float, derivative: Callable[[float, NDArray[np.float64]], NDArray[np.float64]],
+               method: str = 'RK45', jacobian: Optional[Callable[[float, NDArray[np.float64]], NDArray[np.float64]]] = None) -> Any:
+    """Integrate one step and return the full `solve_ivp` result (internal steps in `t`, `nfev`, `njev`, `nlu`)."""
+    if method not in INTEGRATION_METHODS: raise ValueError(f"Unknown integration method: {method}")
     orig_shape = state.shape
     y0 = state.ravel()
 
@@ -13,6 +21,14 @@ def integrate_step(state: NDArray[np.float64], step: int, dt: float,  derivative
         y_reshaped = y.reshape(orig_shape)
         return np.asarray(derivative(t, y_reshaped)).ravel()
 
+    options: dict[str, Any] = {}
+    if jacobian is not None and method in IMPLICIT_METHODS:
+        options['jac'] = lambda t, y: jacobian(t, y.reshape(orig_shape))
     t0 = step * dt
-    sol = solve_ivp(wrapped_derivative, [t0, t0 + dt], y0, rtol=1e-9, atol=1e-12)
-    return sol.y[:, -1].reshape(orig_shape)
\ No newline at end of file
+    return solve_ivp(wrapped_derivative, [t0, t0 + dt], y0, method=method, rtol=1e-9, atol=1e-12, **options)
+
+def integrate_step(state: NDArray[np.float64], step: int, dt: float,  derivative: Callable[[float, NDArray[np.float64]], NDArray[np.float64]],
+                   method: str = 'RK45', jacobian: Optional[Callable[[float, NDArray[np.float64]], NDArray[np.float64]]] = None) -> NDArray[np.float64]:
+    sol = solve_step(state, step, dt, derivative, method, jacobian)
+    result: NDArray[np.float64] = sol.y[:, -1].reshape(state.shape)
+    return result
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from typing import Any, NamedTuple
+
+import numpy as np
+
+OVERRUN_POLICIES = ('record', 'degrade')
+DEFAULT_SPIN_MARGIN = 0.002    # seconds before a deadline at which sleeping turns into spinning
+
+
+class LatencyStats(NamedTuple):
+    ID: str
+    steps: int
+    mean: float
+    p99: float
+    maximum: float
+
+
+class PacingReport(NamedTuple):
+    period: float
+    steps: int
+    deadline_misses: int
+    mean_jitter: float
+    max_jitter: float
+    degraded_steps: int
+    latencies: list[LatencyStats]    # per agent, then the whole step as 'step'
+
+
+class Pacer:
+    """Holds the loop to one step per `time_step_delta * real_time_scale` seconds of wall clock.
+
+    Step k is released at t0 + (k - 1) * period and is due at t0 + k * period. The pacer sleeps until
+    shortly before the release and spins for the rest, records how late each step started (jitter),
+    each agent's compute latency and every step that finished after its deadline. The schedule is
+    absolute, so after an overrun the following steps start at once until the loop has caught up.
+    With the 'degrade' policy, a step released late skips adaptation; 'record' only counts the miss.
+    """
+
+    def __init__(self, config: dict[str, Any], time_steps: int) -> None:
+        self.period: float = config['time_step_delta'] * config.get('real_time_scale', 1.0)
+        self.policy: str = config.get('overrun_policy', 'record')
+        if self.policy not in OVERRUN_POLICIES: raise ValueError(f"Unknown overrun policy: {self.policy}")
+        self.spin_margin: float = config.get('pacing_spin_margin', DEFAULT_SPIN_MARGIN)
+        self.jitter = np.zeros(time_steps)
+        self.step_latency = np.zeros(time_steps)
+        self.agent_latency: dict[str, list[float]] = {}
+        self.deadline_misses = 0
+        self.degraded_steps = 0
+        self.steps = 0
+        self._late = False
+        self._step_start = 0.0
+        self._start = time.perf_counter()
+
+    def wait(self, step: int) -> None:
+        """Block until the release time of `step`."""
+        release = self._start + (step - 1) * self.period
+        remaining = release - time.perf_counter()
+        if remaining > self.spin_margin: time.sleep(remaining - self.spin_margin)
+        while time.perf_counter() < release: pass
+        self._step_start = time.perf_counter()
+        self.jitter[step] = self._step_start - release
+        self._late = self.jitter[step] > self.spin_margin
+
+    def allow_adaptation(self) -> bool:
+        """False when the current step was released late under the 'degrade' policy."""
+        degrade = self._late and self.policy == 'degrade'
+        self.degraded_steps += degrade
+        return not degrade
+
+    def add_latency(self, name: str, seconds: float) -> None:
+        self.agent_latency.setdefault(name, []).append(seconds)
+
+    def end_step(self, step: int) -> None:
+        """Close `step`: its latency since release and whether it finished after its deadline."""
+        now = time.perf_counter()
+        self.step_latency[step] = now - self._step_start
+        self.deadline_misses += now > self._start + step * self.period
+        self.steps += 1
+
+    def report(self) -> PacingReport:
+        def stats(name: str, samples: Any) -> LatencyStats:
+            samples = np.asarray(samples)
+            if not samples.size: return LatencyStats(name, 0, 0.0, 0.0, 0.0)
+            return LatencyStats(name, int(samples.size), float(samples.mean()), float(np.percentile(samples, 99)), float(samples.max()))
+        jitter = self.jitter[1:self.steps + 1]
+        latencies = [stats(name, samples) for name, samples in self.agent_latency.items()]
+        latencies.append(stats('step', self.step_latency[1:self.steps + 1]))
+        return PacingReport(self.period, self.steps, self.deadline_misses, float(jitter.mean()) if jitter.size else 0.0,
+                            float(jitter.max()) if jitter.size else 0.0, self.degraded_steps, latencies)
+
+
+def format_pacing_report(report: PacingReport) -> str:
+    lines = [f"Real time: period {report.period * 1e3:.3f} ms, {report.deadline_misses}/{report.steps} deadline misses, "
+             f"jitter mean {report.mean_jitter * 1e3:.3f} ms / max {report.max_jitter * 1e3:.3f} ms, {report.degraded_steps} degraded steps"]
+    for stats in report.latencies:
+        lines.append(f"  {stats.ID:<30} latency mean {stats.mean * 1e3:8.3f} ms | p99 {stats.p99 * 1e3:8.3f} ms | max {stats.maximum * 1e3:8.3f} ms")
+    return '\n'.join(lines)
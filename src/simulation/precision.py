@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..core.entity import Agent, Target
+from . import dynamics
+
+# Relative RMS tracking-error drift allowed between a float32 run and its float64 reference
+PRECISION_DRIFT_TOLERANCE = 1e-3
+
+def run_precision_probe(config: dict[str, Any], dtype: str) -> Dict[str, Any]:
+    """Run a single agent without logging and collect its tracking errors, weights, memory and step time."""
+    probe_config = {**config, 'dtype': dtype}
+    time_steps = int(probe_config['final_time'] / probe_config['time_step_delta'])
+    target = Target(np.array(dynamics.get_initial_conditions(probe_config['dynamics_type'], probe_config['num_states'])), time_steps, probe_config)
+    agent = Agent(np.zeros(probe_config['num_states']), time_steps, probe_config, target, probe_config['ID'])
+
+    tracking_error_norms: NDArray[np.float64] = np.zeros(time_steps - 1)
+    start = time.perf_counter()
+    for step in range(1, time_steps):
+        agent.compute_control_output(step)
+        agent.update_dynamics(step)
+        target.update_dynamics(step)
+        tracking_error_norms[step - 1] = np.linalg.norm(agent.tracking_error)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'tracking_error_norms': tracking_error_norms,
+        'weights': np.ravel(agent.neural_network.weights).astype(np.float64),
+        'memory_bytes': agent.neural_network.memory_nbytes(),
+        'step_time': elapsed / max(time_steps - 1, 1),
+    }
+
+def measure_precision_drift(config: dict[str, Any]) -> Dict[str, float]:
+    """Compare a float32 run against its float64 reference.
+
+    The network and logging run in float32 while plant and target integration stay in float64,
+    so the tracking error of both runs is driven by the same reference trajectory. The drift is
+    acceptable when `relative_rms_drift` stays below `PRECISION_DRIFT_TOLERANCE`.
+    """
+    reference = run_precision_probe(config, 'float64')
+    single = run_precision_probe(config, 'float32')
+    error_drift = single['tracking_error_norms'] - reference['tracking_error_norms']
+    reference_rms = float(np.sqrt(np.mean(reference['tracking_error_norms']**2)))
+    single_rms = float(np.sqrt(np.mean(single['tracking_error_norms']**2)))
+    return {
+        'rms_tracking_error_float64': reference_rms,
+        'rms_tracking_error_float32': single_rms,
+        'relative_rms_drift': abs(single_rms - reference_rms) / max(reference_rms, np.finfo(np.float64).tiny),
+        'max_tracking_error_drift': float(np.max(np.abs(error_drift))),
+        'max_weight_drift': float(np.max(np.abs(single['weights'] - reference['weights']))),
+        'memory_bytes_float64': float(reference['memory_bytes']),
+        'memory_bytes_float32': float(single['memory_bytes']),
+        'step_time_float64': float(reference['step_time']),
+        'step_time_float32': float(single['step_time']),
+    }
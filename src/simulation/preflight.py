@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import csv
+import io
+import time
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from ..core.neural_network import parameter_count
+from ..core.storage import DEFAULT_BUFFER_SIZE
+from .integrate import integrate_step
+
+# Cost model: RK45 evaluations per solver call at the default tolerances and numpy calls per evaluation
+RHS_EVALUATIONS_PER_SOLVE = 8
+LEARNING_RATE_RHS_CALLS = 12
+WEIGHTS_RHS_CALLS = 16
+CALLS_PER_LAYER = 12          # forward and backward numpy calls per layer of every block
+SPECTRAL_NORM_FLOPS = 10      # × P³ for the logged learning-rate spectral norm (SVD)
+CSV_BYTES_PER_VALUE = {'float64': 20, 'float32': 12}
+MEMORY_BUDGET_ACTIONS = ('auto', 'refuse')
+
+
+class OpCosts(NamedTuple):
+    solver_call: float     # seconds of solve_ivp set-up per call, excluding right-hand-side work
+    numpy_call: float      # seconds of overhead per small numpy call
+    flop: float            # seconds per floating-point operation of dense matrix products
+    logged_value: float    # seconds per value written to CSV
+
+
+class ResourceEstimate(NamedTuple):
+    ID: str
+    parameter_count: int
+    time_steps: int
+    learning_rate_bytes: int
+    trajectory_bytes: int
+    network_bytes: int
+    output_bytes: int
+    runtime_seconds: float
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.learning_rate_bytes + self.trajectory_bytes + self.network_bytes
+
+
+_calibrated_costs: Optional[OpCosts] = None
+
+def calibrate_op_costs(repeats: int = 20) -> OpCosts:
+    """Time the primitive operations of the cost model on this machine (about 0.1 s, cached per process)."""
+    global _calibrated_costs
+    if _calibrated_costs is not None: return _calibrated_costs
+
+    def per_call(func: Any) -> float:
+        func()
+        start = time.perf_counter()
+        for _ in range(repeats): func()
+        return (time.perf_counter() - start) / repeats
+
+    small = np.ones((3, 3))
+    numpy_call = per_call(lambda: small @ small)
+    zero = np.zeros(3)
+    solve = per_call(lambda: integrate_step(zero, 1, 1e-3, lambda t, y: zero))
+    solver_call = max(solve - RHS_EVALUATIONS_PER_SOLVE * numpy_call, 0.0)
+    size = 256
+    dense = np.random.default_rng(0).random((size, size))
+    flop = max(per_call(lambda: dense @ dense) - numpy_call, 0.0) / (2 * size**3)
+    row = list(np.random.default_rng(0).random(100))
+    logged_value = per_call(lambda: csv.writer(io.StringIO()).writerows([row] * 10)) / 1000
+    _calibrated_costs = OpCosts(solver_call, numpy_call, flop, logged_value)
+    return _calibrated_costs
+
+def trajectory_bytes(config: dict[str, Any]) -> int:
+    """RAM held by one entity's positions and velocities."""
+    time_steps = int(config['final_time'] / config['time_step_delta'])
+    steps = time_steps if config.get('trajectory_storage', 'full') == 'full' else max(2, config.get('trajectory_buffer_size', DEFAULT_BUFFER_SIZE))
+    num_states: int = config['num_states']
+    return 2 * num_states * steps * 8
+
+def estimate_resources(config: dict[str, Any], costs: Optional[OpCosts] = None) -> ResourceEstimate:
+    """Predict peak memory per storage structure, CSV output size and runtime of one agent configuration.
+
+    Every agent, Proportional ones included, allocates a network and its learning-rate history; the
+    runtime is an order-of-magnitude estimate from the calibrated per-operation costs.
+    """
+    costs = calibrate_op_costs() if costs is None else costs
+    time_steps = int(config['final_time'] / config['time_step_delta'])
+    num_states: int = config['num_states']
+    capacity = max(2, config.get('trajectory_buffer_size', DEFAULT_BUFFER_SIZE))
+    dtype = np.dtype(config.get('dtype', 'float64'))
+    itemsize = dtype.itemsize
+    num_parameters = parameter_count(config)
+    if config.get('weight_mask') is not None: num_parameters = int(np.count_nonzero(np.load(config['weight_mask'])))
+    adaptive = config['ID'] != "Proportional"
+
+    learning_rate_steps = time_steps if config.get('learning_rate_storage', 'full') == 'full' else capacity
+    learning_rate_bytes = learning_rate_steps * num_parameters**2 * itemsize
+    network_bytes = (num_parameters + 3 * config['output_size'] * num_parameters) * itemsize    # weights, gradient and cached Jacobians
+
+    state_values = num_states + 2
+    nn_values = num_parameters + 4
+    output_bytes = time_steps * (state_values * CSV_BYTES_PER_VALUE['float64'] + nn_values * CSV_BYTES_PER_VALUE[dtype.name])
+
+    # Per step: plant solve, then for adaptive agents the network pass, weight and learning-rate solves
+    step_time = costs.solver_call + RHS_EVALUATIONS_PER_SOLVE * costs.numpy_call
+    step_time += (state_values + nn_values) * costs.logged_value + SPECTRAL_NORM_FLOPS * num_parameters**3 * costs.flop
+    if adaptive:
+        solver_calls = 1 if config.get('fused_integration', False) else 2
+        learning_rate_flops = 2 * num_parameters**3 + 4 * config['output_size'] * num_parameters**2
+        weights_flops = 2 * num_parameters**2 + 2 * config['output_size'] * num_parameters
+        step_time += solver_calls * costs.solver_call
+        step_time += RHS_EVALUATIONS_PER_SOLVE * ((LEARNING_RATE_RHS_CALLS + WEIGHTS_RHS_CALLS) * costs.numpy_call + (learning_rate_flops + weights_flops) * costs.flop)
+        step_time += (config['num_blocks'] + 1) * (config['num_layers'] + 1) * CALLS_PER_LAYER * costs.numpy_call
+    return ResourceEstimate(config['ID'], num_parameters, time_steps, learning_rate_bytes, trajectory_bytes(config), network_bytes, output_bytes, time_steps * step_time)
+
+def format_report(estimates: list[ResourceEstimate]) -> str:
+    """Table of the estimates with totals."""
+    lines = [f"{'ID':<30} {'P':>6} {'LR MiB':>10} {'traj MiB':>9} {'net MiB':>8} {'CSV MiB':>9} {'runtime':>10}"]
+    for e in estimates:
+        lines.append(f"{e.ID:<30} {e.parameter_count:>6} {e.learning_rate_bytes / 2**20:>10.1f} {e.trajectory_bytes / 2**20:>9.1f} "
+                     f"{e.network_bytes / 2**20:>8.2f} {e.output_bytes / 2**20:>9.1f} {e.runtime_seconds:>9.1f}s")
+    lines.append(f"{'total':<30} {'':>6} {sum(e.memory_bytes for e in estimates) / 2**20:>10.1f} MiB in memory, "
+                 f"{sum(e.output_bytes for e in estimates) / 2**20:.1f} MiB of CSV, {sum(e.runtime_seconds for e in estimates):.1f} s")
+    return '\n'.join(lines)
+
+def preflight(configs: list[dict[str, Any]], costs: Optional[OpCosts] = None) -> list[dict[str, Any]]:
+    """Check the predicted peak memory of a run against `memory_budget_mb` (first configuration).
+
+    Over budget, `memory_budget_action` 'auto' (default) switches the learning-rate histories and then
+    the trajectories to ring storage, largest first, until the run fits; 'refuse', or a run that does
+    not fit even then, raises ValueError. Returns the configurations to run.
+    """
+    budget_mb: Optional[float] = configs[0].get('memory_budget_mb')
+    if budget_mb is None: return configs
+    action = configs[0].get('memory_budget_action', 'auto')
+    if action not in MEMORY_BUDGET_ACTIONS: raise ValueError(f"Unknown memory budget action: {action}")
+    budget = budget_mb * 2**20
+
+    def total(candidate: list[dict[str, Any]]) -> int:
+        # the target is allocated with the first configuration's trajectory storage
+        return trajectory_bytes(candidate[0]) + sum(estimate_resources(config, costs).memory_bytes for config in candidate)
+
+    required = total(configs)
+    if required <= budget: return configs
+    if action == 'refuse':
+        raise ValueError(f"Run needs about {required / 2**20:.1f} MiB, over memory_budget_mb={budget_mb}:\n{format_report([estimate_resources(c, costs) for c in configs])}")
+
+    adjusted = [dict(config) for config in configs]
+    order = sorted(range(len(adjusted)), key=lambda i: estimate_resources(adjusted[i], costs).learning_rate_bytes, reverse=True)
+    changes = [(i, 'learning_rate_storage') for i in order] + [(i, 'trajectory_storage') for i in range(len(adjusted))]
+    for i, key in changes:
+        if adjusted[i].get(key, 'full') != 'full': continue
+        adjusted[i][key] = 'ring'
+        print(f"Preflight: {adjusted[i]['ID']} uses {key}='ring' to fit memory_budget_mb={budget_mb}")
+        if total(adjusted) <= budget: return adjusted
+    raise ValueError(f"Run needs about {total(adjusted) / 2**20:.1f} MiB even with ring storage, over memory_budget_mb={budget_mb}")
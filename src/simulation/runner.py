@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..core.entity import Agent, Target
+from ..core.storage import TRAJECTORY_DIR_NAME
+from ..io.artifact import ARTIFACT_SUFFIX, export_artifact
+from ..io.catalog import CATALOG_FILE, RunMetrics, register_runs, run_records
+from ..io.data_manager import RunLogger
+from ..io.progress import ProgressReporter
+from ..io.weight_store import store_network, warm_start
+from . import dynamics
+from .convergence import ConvergenceMonitor
+from .pacing import Pacer, format_pacing_report
+from .preflight import preflight
+
+
+def with_trajectory_dir(configs: list[dict[str, Any]], data_dir: str) -> list[dict[str, Any]]:
+    """Memory-mapped configurations without a `trajectory_dir` spill to `<data_dir>/trajectories`, next to the run's CSVs."""
+    return [{'trajectory_dir': os.path.join(data_dir, TRAJECTORY_DIR_NAME), **config} if config.get('trajectory_storage') == 'memmap' else config for config in configs]
+
+def create_target(config: dict[str, Any], time_steps: int) -> Target:
+    """Target at the initial conditions of `dynamics_type`, with storage for `time_steps` steps."""
+    target_position = np.array(dynamics.get_initial_conditions(config['dynamics_type'], config['num_states']))
+    return Target(target_position, time_steps, config)
+
+def create_agents(configs: list[dict[str, Any]], target: Target, time_steps: int) -> list[Agent]:
+    """One agent per configuration, starting at the origin and warm-started where configured."""
+    agents: list[Agent] = []
+    for config in configs:
+        agent_position: NDArray[np.float64] = np.zeros(target.num_states)
+        agent: Agent = Agent(agent_position, time_steps, config, target, config['ID'])
+        if config.get('warm_start', False) and agent.agent_type != "Proportional": warm_start(agent.neural_network, config)
+        agents.append(agent)
+    return agents
+
+def finish_run(agents: list[Agent], configs: list[dict[str, Any]], target: Optional[Target], run_logger: RunLogger, metrics: Optional[RunMetrics], start_time: float) -> None:
+    """Per-agent end of a run: event-trigger statistics, the weight store and inference artifacts where
+    configured, storage release (of the target too, unless it is None) and catalog registration when `metrics` is given."""
+    for agent in agents:
+        if agent.event_triggered: print(f"{agent.agent_type}: learning triggered on {agent.learning_updates}/{agent.adaptive_steps} steps ({agent.learning_fraction:.1%})")
+    for agent, config in zip(agents, configs):
+        if config.get('store_weights', False) and agent.agent_type != "Proportional": store_network(agent.neural_network, config, agent.last_step)
+        if config.get('export_artifact', False) and agent.agent_type != "Proportional":
+            export_artifact(agent.neural_network, f'{run_logger.data_dir}/{agent.agent_type}{ARTIFACT_SUFFIX}', agent.last_step, {'ID': agent.agent_type, 'dynamics_type': config['dynamics_type']})
+    for entity in [*agents, *([] if target is None else [target])]: entity.close_storage()
+    if metrics is not None:
+        catalog_path = configs[0].get('catalog_path', os.path.join(run_logger.data_dir, CATALOG_FILE))
+        register_runs(catalog_path, run_records(agents, configs, metrics, time.perf_counter() - start_time, run_logger.data_dir))
+
+def run_simulation_from_configs(configs: list[dict[str, Any]], target: Optional[Target] = None, logger: Optional[RunLogger] = None) -> list[Agent]:
+    """Simulate all controller configurations against one target and log them through `logger`.
+
+    Without a `logger` the run opens its own under `DATA_DIR` and closes it at the end; a logger
+    passed in stays open for the caller, so concurrent runs in one process each bring their own.
+    A `target` whose trajectory is already integrated over the whole horizon can be passed in;
+    it is then neither advanced nor logged by this run. With `memory_budget_mb` set, the preflight
+    check may switch storage modes or refuse the run before anything is allocated. Unless `catalog`
+    is false, the finished run is registered in the SQLite catalog at `catalog_path`.
+    """
+    start_time = time.perf_counter()
+    configs = preflight(configs)
+    owns_logger = logger is None
+    run_logger = RunLogger() if logger is None else logger
+    configs = with_trajectory_dir(configs, run_logger.data_dir)
+    base_config = configs[0]
+
+    # Setup simulation parameters
+    final_time: float = base_config['final_time']
+    time_step_delta: float = base_config['time_step_delta']
+    time_steps: int = int(final_time / time_step_delta)
+    precomputed_target = target is not None
+    if target is None: target = create_target(base_config, time_steps)
+    agents = create_agents(configs, target, time_steps)
+
+    # Optional steady-state detection: settled agents are frozen and stop being simulated
+    early_stopping: bool = base_config.get('early_stopping', False)
+    early_stopping_scope: str = base_config.get('early_stopping_scope', 'agent')
+    monitors: dict[int, ConvergenceMonitor] = {id(agent): ConvergenceMonitor(config, agent.neural_network.weights) for agent, config in zip(agents, configs)} if early_stopping else {}
+    active_agents: list[Agent] = list(agents)
+    metrics = RunMetrics(agents) if base_config.get('catalog', True) else None
+    progress = ProgressReporter(time_steps, base_config)
+    # Optional real-time pacing: one step per time_step_delta of wall clock, with deadline accounting
+    pacer = Pacer(base_config, time_steps) if base_config.get('real_time', False) else None
+
+    # Main simulation loop
+    step = 0
+    for step in range(1, time_steps):
+        if pacer is not None: pacer.wait(step)
+        adapt = pacer is None or pacer.allow_adaptation()
+
+        # Update all agents
+        for agent in active_agents:
+            start = time.perf_counter()
+            agent.compute_control_output(step, adapt)
+            agent.update_dynamics(step)
+            elapsed = time.perf_counter() - start
+            progress.add_time(agent.agent_type, elapsed)
+            if pacer is not None: pacer.add_latency(agent.agent_type, elapsed)
+        if not precomputed_target: target.update_dynamics(step)
+        if metrics is not None: metrics.update(step, active_agents)
+
+        # Save data
+        time_sim: float = step * time_step_delta
+        run_logger.save_state(step, time_sim, active_agents, None if precomputed_target else target)
+        run_logger.save_nn(step, time_sim, active_agents)
+        if pacer is not None: pacer.end_step(step)
+
+        # Settling checks
+        if early_stopping:
+            settled = [agent for agent in active_agents if monitors[id(agent)].update(step, agent.tracking_error, agent.neural_network.weights)]
+            if early_stopping_scope == 'run' and len(settled) < len(active_agents): settled = []
+            for agent in settled: agent.stop_reason, agent.stop_time = 'settled', time_sim
+            active_agents = [agent for agent in active_agents if agent.stop_reason is None]
+            if not active_agents:
+                print(f'\nAll agents settled at t = {time_sim:.3f} s.')
+                break
+
+        # Progress display, throttled to `progress_interval`
+        progress.update(step)
+
+    progress.update(step, force=True)
+    progress.close()
+    print("\nSimulation completed.")
+    if pacer is not None:
+        report = pacer.report()
+        print(format_pacing_report(report))
+        run_logger.write_pacing_summary([(stats.ID, stats.steps, stats.mean, stats.p99, stats.maximum, *((report.deadline_misses, report.mean_jitter, report.max_jitter, report.degraded_steps) if stats.ID == 'step' else ()))
+                                          for stats in report.latencies])
+    if owns_logger: run_logger.close()
+    if early_stopping:
+        for agent in active_agents: agent.stop_reason, agent.stop_time = 'final_time', (time_steps - 1) * time_step_delta
+        run_logger.save_stop_summary(agents)
+    finish_run(agents, configs, None if precomputed_target else target, run_logger, metrics, start_time)
+    return agents
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional, cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..core.entity import Target
+from ..core.neural_network import parameter_count
+from ..core.storage import TRAJECTORY_DIR_NAME
+from ..io import data_manager
+from ..io.catalog import CATALOG_FILE
+from ..io.weight_store import WEIGHT_STORE_DIR_NAME
+from . import dynamics
+from .runner import run_simulation_from_configs
+
+EXECUTORS: dict[str, Callable[..., Executor]] = {'process': ProcessPoolExecutor, 'thread': ThreadPoolExecutor}
+# Settings that shape a scenario's target, which all of its jobs share
+TARGET_KEYS = ('dynamics_type', 'dynamics_parameters', 'num_states', 'final_time', 'time_step_delta', 'integration_method')
+
+
+class ScenarioJob(NamedTuple):
+    scenario: str
+    config: dict[str, Any]
+    output_dir: str
+    cost: int
+
+
+class JobResult(NamedTuple):
+    scenario: str
+    ID: str
+    output_dir: str
+    cost: int
+    elapsed: float
+    stop_reason: Optional[str]
+    stop_time: Optional[float]
+
+
+def scenario_name(scenario: dict[str, Any]) -> str:
+    """Directory-safe name of a scenario: its `name` key, else its dynamics type."""
+    return re.sub(r'[^\w.-]+', '_', str(scenario.get('name', scenario['dynamics_type'])))
+
+def estimate_cost(config: dict[str, Any]) -> int:
+    """Relative cost of one job: adapted parameter count × number of steps (1 × steps for Proportional agents)."""
+    time_steps = int(config['final_time'] / config['time_step_delta'])
+    return time_steps * (1 if config['ID'] == "Proportional" else parameter_count(config))
+
+def build_jobs(scenarios: list[dict[str, Any]], configs: list[dict[str, Any]], output_root: str) -> list[ScenarioJob]:
+    """Scenario × controller jobs, longest first; scenario keys override the controller config."""
+    jobs = []
+    for scenario in scenarios:
+        name = scenario_name(scenario)
+        overrides = {key: value for key, value in scenario.items() if key != 'name'}
+        for config in configs:
+            job_config = {**config, **overrides}
+            jobs.append(ScenarioJob(name, job_config, os.path.join(output_root, name), estimate_cost(job_config)))
+    return sorted(jobs, key=lambda job: job.cost, reverse=True)
+
+def precompute_target(config: dict[str, Any]) -> Target:
+    """Integrate the scenario target over the whole horizon once, so every job can share its trajectory."""
+    time_steps = int(config['final_time'] / config['time_step_delta'])
+    target = Target(np.array(dynamics.get_initial_conditions(config['dynamics_type'], config['num_states'])), time_steps, {**config, 'trajectory_storage': 'full'})
+    for step in range(1, time_steps): target.update_dynamics(step)
+    return target
+
+def save_target(target: Target, config: dict[str, Any], output_dir: str) -> None:
+    """Write the target state file of a scenario in the same format as a single run."""
+    time_steps = int(config['final_time'] / config['time_step_delta'])
+    with data_manager.RunLogger(output_dir) as logger:
+        for step in range(1, time_steps): logger.save_state(step, step * config['time_step_delta'], [], target)
+
+def run_job(job: ScenarioJob, target_positions: NDArray[np.float64], target_velocities: NDArray[np.float64]) -> JobResult:
+    """Run one controller against a precomputed scenario target, logging into the scenario directory."""
+    time_steps = int(job.config['final_time'] / job.config['time_step_delta'])
+    target = Target(target_positions[:, 0], time_steps, {**job.config, 'trajectory_storage': 'full'})
+    target.positions, target.velocities = target_positions, target_velocities
+
+    start = time.perf_counter()
+    with data_manager.RunLogger(job.output_dir) as logger:
+        agent, = run_simulation_from_configs([job.config], target, logger)
+    return JobResult(job.scenario, job.config['ID'], job.output_dir, job.cost, time.perf_counter() - start, agent.stop_reason, agent.stop_time)
+
+def run_scenarios(scenarios: list[dict[str, Any]], configs: list[dict[str, Any]], max_workers: Optional[int] = None, output_root: Optional[str] = None,
+                  executor: str = 'process') -> list[JobResult]:
+    """Run every controller config on every scenario across a process (or, with `executor='thread'`, thread) pool.
+
+    Each scenario is a dict of config overrides (at least `dynamics_type`, optionally `name`,
+    `final_time`, `time_step_delta`, `seed`, ...) and writes to `<output_root>/<name>/`. Targets are
+    integrated once per scenario in the parent; jobs are submitted longest first by `estimate_cost`
+    so the biggest networks do not end up running alone at the tail. `max_workers=1` runs serially
+    in this process. Every job logs through its own `RunLogger`, so threads never share files.
+    """
+    output_root = data_manager.DATA_DIR if output_root is None else output_root
+    # Every job registers in one catalog and shares one weight store at the output root
+    configs = [{'catalog_path': os.path.join(output_root, CATALOG_FILE), 'weight_store_dir': os.path.join(output_root, WEIGHT_STORE_DIR_NAME), **config} for config in configs]
+    jobs = build_jobs(scenarios, configs, output_root)
+    # Memory-mapped trajectories stay inside each scenario, so one controller ID on two scenarios never shares a file
+    jobs = [job._replace(config={**job.config, 'trajectory_dir': os.path.join(job.config['trajectory_dir'], job.scenario) if 'trajectory_dir' in job.config
+                                 else os.path.join(job.output_dir, TRAJECTORY_DIR_NAME)}) for job in jobs]
+    # One target per scenario, so its jobs must agree on everything that shapes it
+    scenario_jobs: dict[str, ScenarioJob] = {}
+    for job in jobs:
+        first = scenario_jobs.setdefault(job.scenario, job)
+        conflicts = [key for key in TARGET_KEYS if job.config.get(key) != first.config.get(key)]
+        if conflicts: raise ValueError(f"Controllers {first.config['ID']!r} and {job.config['ID']!r} disagree on {', '.join(conflicts)} in scenario {job.scenario!r}; set them in the scenario")
+    targets: dict[str, tuple[NDArray[np.float64], NDArray[np.float64]]] = {}
+    for name, job in scenario_jobs.items():
+        target = precompute_target(job.config)
+        save_target(target, job.config, job.output_dir)
+        targets[name] = cast(NDArray[np.float64], target.positions), cast(NDArray[np.float64], target.velocities)
+
+    if executor not in EXECUTORS: raise ValueError(f"Unknown executor: {executor}")
+    if max_workers == 1:
+        results = [run_job(job, *targets[job.scenario]) for job in jobs]
+    else:
+        with EXECUTORS[executor](max_workers=max_workers) as pool:
+            futures = [pool.submit(run_job, job, *targets[job.scenario]) for job in jobs]
+            results = [future.result() for future in futures]
+
+    # Per-job summaries only hold one agent, so each scenario's summary is rewritten with all of them
+    if configs and configs[0].get('early_stopping', False):
+        for name in targets:
+            data_manager.RunLogger(os.path.join(output_root, name)).write_stop_summary((r.ID, r.stop_reason, r.stop_time) for r in results if r.scenario == name)
+    return results
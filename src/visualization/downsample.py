@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+DOWNSAMPLE_METHODS = ('minmax', 'lttb')
+ENVELOPE_PERCENTILES = (5.0, 95.0)
+
+class WeightEnvelope(NamedTuple):
+    time: NDArray[np.float64]
+    minimum: NDArray[np.float64]
+    lower: NDArray[np.float64]
+    median: NDArray[np.float64]
+    upper: NDArray[np.float64]
+    maximum: NDArray[np.float64]
+
+def _bucket_layout(num_points: int, num_buckets: int) -> tuple[int, int]:
+    """Return (bucket size, padded length) for splitting `num_points` into equal buckets."""
+    bucket_size = int(np.ceil(num_points / num_buckets))
+    return bucket_size, bucket_size * int(np.ceil(num_points / bucket_size))
+
+def _pad_to(values: NDArray[np.float64], length: int) -> NDArray[np.float64]:
+    """Pad along the first axis by repeating the last row so it can be reshaped into buckets."""
+    if values.shape[0] == length: return values
+    pad_width = [(0, length - values.shape[0])] + [(0, 0)] * (values.ndim - 1)
+    return np.pad(values, pad_width, mode='edge')
+
+def min_max_indices(values: NDArray[np.float64], max_points: int) -> NDArray[np.intp]:
+    """Indices keeping the minimum and maximum of every bucket (per column for 2D input)."""
+    values = np.asarray(values, dtype=np.float64)
+    columns = values.reshape(values.shape[0], -1)
+    num_points, num_columns = columns.shape
+    num_buckets = max_points // (2 * num_columns)
+    if num_points <= max_points or num_buckets < 1: return np.arange(num_points)
+    bucket_size, padded_length = _bucket_layout(num_points, num_buckets)
+    buckets = _pad_to(columns, padded_length).reshape(-1, bucket_size, num_columns)
+    offsets = (np.arange(buckets.shape[0]) * bucket_size)[:, None]
+    extremes = np.concatenate((np.argmin(buckets, axis=1) + offsets, np.argmax(buckets, axis=1) + offsets, [[0], [num_points - 1]]), axis=None)
+    return np.unique(np.minimum(extremes, num_points - 1))
+
+def lttb_indices(x: NDArray[np.float64], y: NDArray[np.float64], max_points: int) -> NDArray[np.intp]:
+    """Indices selected by Largest-Triangle-Three-Buckets downsampling."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    num_points = x.shape[0]
+    if num_points <= max_points or max_points < 3: return np.arange(num_points)
+    edges = np.linspace(1, num_points - 1, max_points - 1).astype(np.intp)
+    indices = np.empty(max_points, dtype=np.intp)
+    indices[0], indices[-1] = 0, num_points - 1
+    anchor = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        if bucket == max_points - 3:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            next_end = max(edges[bucket + 2], end + 1)
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs((x[anchor] - next_x) * (y[start:end] - y[anchor]) - (x[anchor] - x[start:end]) * (next_y - y[anchor]))
+        anchor = start + int(np.argmax(areas))
+        indices[bucket + 1] = anchor
+    return indices
+
+def downsample_indices(x: NDArray[np.float64], y: NDArray[np.float64], max_points: int, method: str = 'minmax') -> NDArray[np.intp]:
+    """Indices of a shape-preserving subset of at most roughly `max_points` samples."""
+    if method == 'minmax':
+        return min_max_indices(y, max_points)
+    elif method == 'lttb':
+        return lttb_indices(x, y, max_points)
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+def downsample(x: NDArray[np.float64], y: NDArray[np.float64], max_points: int, method: str = 'minmax') -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Return the downsampled (x, y) series."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    indices = downsample_indices(x, y, max_points, method)
+    return x[indices], y[indices]
+
+def weight_envelope(time: NDArray[np.float64], weights: NDArray[np.float64], max_points: int, percentiles: tuple[float, float] = ENVELOPE_PERCENTILES) -> WeightEnvelope:
+    """Summarize a (samples, weights) history as min/max and percentile bands over at most `max_points` buckets."""
+    time = np.asarray(time, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64).reshape(time.shape[0], -1)
+    lower, median, upper = np.percentile(weights, [percentiles[0], 50.0, percentiles[1]], axis=1)
+    minimum, maximum = weights.min(axis=1), weights.max(axis=1)
+    num_buckets = max(1, min(max_points, time.shape[0]))
+    bucket_size, padded_length = _bucket_layout(time.shape[0], num_buckets)
+
+    def bucketed(values: NDArray[np.float64]) -> NDArray[np.float64]:
+        return _pad_to(values, padded_length).reshape(-1, bucket_size)
+
+    return WeightEnvelope(
+        time=bucketed(time)[:, 0],
+        minimum=bucketed(minimum).min(axis=1),
+        lower=bucketed(lower).mean(axis=1),
+        median=bucketed(median).mean(axis=1),
+        upper=bucketed(upper).mean(axis=1),
+        maximum=bucketed(maximum).max(axis=1),
+    )
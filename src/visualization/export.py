@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple, Optional, Sequence
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from . import plotter
+
+# Headless export defaults
+FIGURE_FORMATS = ('png', 'pdf')
+FIGURE_DIR_NAME = 'figures'
+MANIFEST_FILE = 'export_manifest.json'
+DEFAULT_EXPORT_DPI = 300
+
+
+class FigureJob(NamedTuple):
+    name: str                  # output file stem
+    kind: str                  # 'tracking_error', 'trajectories', 'weights' or one of `plotter.NN_METRIC_FIGURES`
+    agent: Optional[str]       # agent of a weight figure
+    inputs: tuple[str, ...]    # CSV files the figure is drawn from
+
+
+class ExportReport(NamedTuple):
+    rendered: list[str]
+    skipped: list[str]
+    files: list[str]
+
+
+def file_stem(name: str) -> str:
+    return re.sub(r'[^\w.-]+', '_', name)
+
+def figure_jobs(data_dir: str) -> list[FigureJob]:
+    """Every figure of `plot_from_csv` as an independent job, weight figures one per agent."""
+    state_files = tuple(os.path.join(data_dir, f'{agent}{plotter.STATE_DATA_SUFFIX}') for agent in plotter.state_agent_types(data_dir))
+    nn_types = plotter.nn_agent_types(data_dir)
+    nn_files = tuple(os.path.join(data_dir, f'{agent}{plotter.NN_DATA_SUFFIX}') for agent in nn_types)
+    jobs = [FigureJob('tracking_error', 'tracking_error', None, state_files),
+            FigureJob('trajectories', 'trajectories', None, (*state_files, os.path.join(data_dir, plotter.TARGET_STATE_FILE)))]
+    jobs += [FigureJob(f'weights_{file_stem(agent)}', 'weights', agent, (nn_file,)) for agent, nn_file in zip(nn_types, nn_files)]
+    jobs += [FigureJob(name, name, None, nn_files) for name in plotter.NN_METRIC_FIGURES]
+    return jobs
+
+def job_signature(job: FigureJob, options: dict[str, Any]) -> str:
+    """Hash of the inputs' modification times and sizes and of the render options; unchanged means the figure is current."""
+    stats = [(os.path.basename(path), os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in job.inputs]
+    return hashlib.sha1(json.dumps([job.kind, job.agent, stats, options], sort_keys=True).encode()).hexdigest()
+
+def output_names(job: FigureJob, num_figures: int) -> list[str]:
+    """File stems of a job's figures; the trajectory job adds pairwise projections above three states."""
+    return [job.name] + [f'{job.name}_projections' for _ in range(num_figures - 1)]
+
+def _init_worker(latex: bool) -> None:
+    """Non-interactive backend and the plotting style, once per worker."""
+    plt.switch_backend('Agg')
+    plotter.configure_plot()
+    plt.rcParams['text.usetex'] = latex
+
+def render_job(job: FigureJob, data_dir: str, output_dir: str, formats: Sequence[str], max_points: Optional[int], method: str, envelope: bool,
+               dpi: int = DEFAULT_EXPORT_DPI) -> list[str]:
+    """Draw one job's figures and save them in every format; returns the written files."""
+    figures: list[Figure]
+    if job.kind == 'weights' and job.agent is not None:
+        figures = [plotter.figure_weights(job.agent, max_points, method, envelope, data_dir)]
+    elif job.kind in ('tracking_error', 'trajectories'):
+        agent_types, states, target = plotter.get_simulation_data(None, data_dir)
+        color_map = plotter.get_color_map(agent_types)
+        if job.kind == 'tracking_error': figures = [plotter.figure_tracking_error(agent_types, states, color_map, max_points, method)]
+        else: figures = plotter.figure_trajectories(agent_types, states, target, color_map, max_points, method)
+    else:
+        column, ylabel = plotter.NN_METRIC_FIGURES[job.kind]
+        nn_types, nn_data = plotter.get_nn_data(plotter.NN_METRIC_COLUMNS, data_dir)
+        figures = [plotter.figure_nn_metric(column, ylabel, nn_types, nn_data, plotter.get_color_map(plotter.state_agent_types(data_dir)), max_points, method)]
+
+    written = []
+    for stem, figure in zip(output_names(job, len(figures)), figures):
+        for file_format in formats:
+            path = os.path.join(output_dir, f'{stem}.{file_format}')
+            figure.savefig(path, format=file_format, dpi=dpi)
+            written.append(path)
+        plt.close(figure)
+    return written
+
+def _read_manifest(path: str) -> dict[str, Any]:
+    try:
+        with open(path, 'r') as f: manifest: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest
+
+def export_figures(data_dir: Optional[str] = None, output_dir: Optional[str] = None, formats: Sequence[str] = ('png',), max_workers: Optional[int] = None,
+                   max_points: Optional[int] = None, method: str = 'minmax', envelope: bool = False, latex: bool = False, force: bool = False) -> ExportReport:
+    """Render every figure of a run to files across a process pool, without a display.
+
+    Each figure (tracking error, trajectories, one weight figure per agent, FAE, learning-rate norm,
+    network output) is an independent job on the Agg backend, written as `<output_dir>/<name>.<format>`
+    (default `<data_dir>/figures`). A manifest records each job's input signature, so figures whose
+    CSV inputs and options are unchanged since the last export are skipped unless `force` is set.
+    `max_workers=1` renders serially in this process. `latex` keeps the style's LaTeX text rendering,
+    which needs a TeX installation on the node.
+    """
+    data_dir = plotter.DATA_DIR if data_dir is None else data_dir
+    output_dir = os.path.join(data_dir, FIGURE_DIR_NAME) if output_dir is None else output_dir
+    unknown = [f for f in formats if f not in FIGURE_FORMATS]
+    if unknown: raise ValueError(f"Unsupported figure formats: {', '.join(unknown)}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = figure_jobs(data_dir)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    previous = _read_manifest(manifest_path)
+    # Colors follow the agent list, so adding or removing an agent redraws every figure
+    options = {'formats': sorted(formats), 'max_points': max_points, 'method': method, 'envelope': envelope, 'latex': latex,
+               'agents': plotter.state_agent_types(data_dir)}
+    signatures = {job.name: job_signature(job, options) for job in jobs}
+    pending, skipped, files = [], [], []
+    for job in jobs:
+        entry = previous.get(job.name)
+        if not force and entry is not None and entry['signature'] == signatures[job.name] and all(os.path.exists(path) for path in entry['files']):
+            skipped.append(job.name)
+            files += entry['files']
+        else:
+            pending.append(job)
+
+    written: dict[str, list[str]] = {}
+    arguments = (data_dir, output_dir, tuple(formats), max_points, method, envelope)
+    if pending and max_workers == 1:
+        # Rendering in this process must not leave the caller on Agg or with the export style
+        backend = plt.get_backend()
+        try:
+            with plt.rc_context():
+                _init_worker(latex)
+                written = {job.name: render_job(job, *arguments) for job in pending}
+        finally:
+            plt.switch_backend(backend)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(latex,)) as pool:
+            futures = {job.name: pool.submit(render_job, job, *arguments) for job in pending}
+            written = {name: future.result() for name, future in futures.items()}
+    for paths in written.values(): files += paths
+
+    manifest = {job.name: {'signature': signatures[job.name], 'files': written.get(job.name, previous.get(job.name, {}).get('files', []))} for job in jobs}
+    tmp_path = f'{manifest_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f: json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return ExportReport([job.name for job in pending], skipped, sorted(files))
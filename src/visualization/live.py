@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Optional, Sequence
+
+import matplotlib.pyplot as plt
+import numpy as np
+from numpy.typing import NDArray
+
+from .downsample import min_max_indices
+
+# Live view defaults
+DEFAULT_REFRESH_INTERVAL = 1.0     # seconds between figure updates
+DEFAULT_LIVE_POINTS = 2000         # points kept per series
+STATE_DATA_SUFFIX = '_state_data.csv'
+NN_DATA_SUFFIX = '_nn_data.csv'
+LIVE_SERIES = ((STATE_DATA_SUFFIX, 'Tracking Error Norm'), (NN_DATA_SUFFIX, 'Learning Rate Spectral Norm'))
+
+
+class CSVTail:
+    """Incremental reader of a growing CSV file: each `read_new` parses only the complete rows appended
+    since the previous call, tracked by byte offset. A file that shrinks or is replaced starts over."""
+
+    def __init__(self, file_path: str, columns: Sequence[str]) -> None:
+        self.file_path = file_path
+        self.columns = list(columns)
+        self.offset = 0
+        self._indices: Optional[list[int]] = None
+        self._inode: Optional[int] = None
+
+    def read_new(self) -> tuple[NDArray[np.float64], bool]:
+        """New rows as a (rows, columns) array, and whether the file was restarted since the last read."""
+        empty = np.empty((0, len(self.columns)))
+        try: stat = os.stat(self.file_path)
+        except FileNotFoundError: return empty, False
+        restarted = self._inode is not None and (stat.st_ino != self._inode or stat.st_size < self.offset)
+        if restarted or self._inode is None: self.offset, self._indices, self._inode = 0, None, stat.st_ino
+        if stat.st_size == self.offset: return empty, restarted
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        end = chunk.rfind(b'\n') + 1    # a partially written last row is left for the next read
+        if end == 0: return empty, restarted
+        self.offset += end
+        lines = chunk[:end].decode().splitlines()
+        if self._indices is None:
+            header = lines.pop(0).split(',')
+            self._indices = [header.index(column) for column in self.columns]
+        fields = [line.split(',') for line in lines if line]
+        rows = np.array([[float(row[i]) for i in self._indices] for row in fields]) if fields else empty
+        return rows, restarted
+
+
+class DecimatingBuffer:
+    """Bounded (time, value) series: once `capacity` points are held it is reduced to half by min-max
+    decimation, so memory and drawing cost stay constant however long the run grows."""
+
+    def __init__(self, capacity: int = DEFAULT_LIVE_POINTS) -> None:
+        self.capacity = max(capacity, 8)
+        self.time: NDArray[np.float64] = np.empty(0)
+        self.values: NDArray[np.float64] = np.empty(0)
+
+    def extend(self, time_values: NDArray[np.float64], values: NDArray[np.float64]) -> None:
+        self.time = np.concatenate((self.time, time_values))
+        self.values = np.concatenate((self.values, values))
+        if self.time.shape[0] > self.capacity:
+            keep = min_max_indices(self.values, self.capacity // 2)
+            self.time, self.values = self.time[keep], self.values[keep]
+
+    def clear(self) -> None:
+        self.time, self.values = np.empty(0), np.empty(0)
+
+
+class LiveDashboard:
+    """Tracking error and learning-rate norm of every agent in `data_dir`, updated while a run writes them.
+
+    Each `refresh` discovers new agent files, reads only their appended rows and redraws at most
+    `max_points` points per series.
+    """
+
+    def __init__(self, data_dir: str, max_points: int = DEFAULT_LIVE_POINTS) -> None:
+        self.data_dir = data_dir
+        self.max_points = max_points
+        self.tails: dict[tuple[str, str], CSVTail] = {}
+        self.buffers: dict[tuple[str, str], DecimatingBuffer] = {}
+        self.lines: dict[tuple[str, str], Any] = {}
+        self.figure, axes = plt.subplots(2, 1, figsize=(8, 8), sharex=True)
+        self.axes = dict(zip((column for _, column in LIVE_SERIES), axes))
+        for column, ax in self.axes.items(): ax.set_ylabel(column)
+        axes[-1].set_xlabel('Time (s)')
+
+    def _discover(self) -> None:
+        if not os.path.isdir(self.data_dir): return
+        for name in sorted(os.listdir(self.data_dir)):
+            for suffix, column in LIVE_SERIES:
+                if not name.endswith(suffix) or name.startswith('target'): continue
+                key = (name[:-len(suffix)], column)
+                if key in self.tails: continue
+                self.tails[key] = CSVTail(os.path.join(self.data_dir, name), ['Time', column])
+                self.buffers[key] = DecimatingBuffer(self.max_points)
+                self.lines[key], = self.axes[column].plot([], [], label=key[0])
+                self.axes[column].legend(loc='best')
+
+    def refresh(self) -> int:
+        """Read appended rows of every series and redraw; returns the number of new rows."""
+        self._discover()
+        new_rows = 0
+        for key, tail in self.tails.items():
+            rows, restarted = tail.read_new()
+            if restarted: self.buffers[key].clear()
+            if not rows.shape[0] and not restarted: continue
+            new_rows += rows.shape[0]
+            self.buffers[key].extend(rows[:, 0], rows[:, 1])
+            self.lines[key].set_data(self.buffers[key].time, self.buffers[key].values)
+        if new_rows:
+            for ax in self.axes.values():
+                ax.relim()
+                ax.autoscale_view()
+            self.figure.canvas.draw_idle()
+        return new_rows
+
+    def run(self, refresh_interval: float = DEFAULT_REFRESH_INTERVAL, duration: Optional[float] = None) -> None:
+        """Refresh every `refresh_interval` seconds until the window is closed or `duration` has passed."""
+        start = time.perf_counter()
+        plt.show(block=False)
+        while plt.fignum_exists(self.figure.number):
+            if duration is not None and time.perf_counter() - start >= duration: break
+            self.refresh()
+            plt.pause(refresh_interval)
+
+
+def watch(data_dir: str, refresh_interval: float = DEFAULT_REFRESH_INTERVAL, max_points: int = DEFAULT_LIVE_POINTS, duration: Optional[float] = None) -> None:
+    LiveDashboard(data_dir, max_points).run(refresh_interval, duration)
@@ -1,17 +1,33 @@
 import os
-from typing import Any, Dict, List, Tuple, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import scienceplots  # type: ignore
+from numpy.typing import NDArray
+
+from ..io.csv_cache import read_columns, read_header
+from .downsample import downsample, min_max_indices, weight_envelope
 
 # Constants for data access
 DATA_DIR = 'simulation_data'
 STATE_DATA_SUFFIX = '_state_data.csv'
 NN_DATA_SUFFIX = '_nn_data.csv'
-TARGET_FILE = f'{DATA_DIR}/target_state_data.csv'
+TARGET_STATE_FILE = 'target_state_data.csv'
+
+# Columns each figure needs, so weights are only parsed for the weight figures
+NN_METRIC_COLUMNS = ['Time', 'Learning Rate Spectral Norm', 'Function Approximation Error Norm', 'Neural Network Output']
+# Above three states, trajectories are drawn as projections; beyond this many pairs only consecutive ones are shown
+MAX_PROJECTION_PANELS = 15
+# Overlaid network figures: name -> (logged column, axis label)
+NN_METRIC_FIGURES = {
+    'function_approximation_error': ('Function Approximation Error Norm', 'Function Approximation Error Norm'),
+    'learning_rate_norm': ('Learning Rate Spectral Norm', 'Learning Rate Spectral Norm'),
+    'nn_output': ('Neural Network Output', 'Neural Network Output $(m/s^2)$'),
+}
 
 def configure_plot() -> None:
     """Configure matplotlib for IEEE standard plotting."""
@@ -29,23 +45,53 @@ def configure_plot() -> None:
         'legend.edgecolor': 'black',
     })
 
-def get_simulation_data() -> Tuple[List[str], List[pd.DataFrame], pd.DataFrame]:
-    """Load simulation state data from CSV files."""
-    csv_state_files = [f for f in os.listdir(DATA_DIR) if f.endswith(STATE_DATA_SUFFIX) and not f.startswith('target')]
-    csv_state_files.sort()
-    agent_types = [f.replace(STATE_DATA_SUFFIX, '') for f in csv_state_files]
-    agents_state_data = [pd.read_csv(os.path.join(DATA_DIR, f)) for f in csv_state_files]
-    target_state_data = pd.read_csv(TARGET_FILE)
+def _select_columns(file_path: str, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    """Load the requested columns that exist in `file_path` (all columns when None)."""
+    if columns is None: return read_columns(file_path)
+    header = read_header(file_path)
+    return read_columns(file_path, [c for c in columns if c in header])
+
+def state_agent_types(data_dir: Optional[str] = None) -> List[str]:
+    """Agents with a state file in `data_dir` (default `DATA_DIR`), sorted."""
+    data_dir = DATA_DIR if data_dir is None else data_dir
+    return sorted(f.replace(STATE_DATA_SUFFIX, '') for f in os.listdir(data_dir) if f.endswith(STATE_DATA_SUFFIX) and not f.startswith('target'))
+
+def nn_agent_types(data_dir: Optional[str] = None) -> List[str]:
+    """Agents with a neural network file in `data_dir` (default `DATA_DIR`), sorted."""
+    data_dir = DATA_DIR if data_dir is None else data_dir
+    return sorted(f.replace(NN_DATA_SUFFIX, '') for f in os.listdir(data_dir) if f.endswith(NN_DATA_SUFFIX))
+
+def get_simulation_data(columns: Optional[Sequence[str]] = None, data_dir: Optional[str] = None) -> Tuple[List[str], List[pd.DataFrame], pd.DataFrame]:
+    """Load simulation state data from CSV files, optionally restricted to `columns`."""
+    # Resolved at call time so a redirected DATA_DIR is also used for the target file
+    data_dir = DATA_DIR if data_dir is None else data_dir
+    agent_types = state_agent_types(data_dir)
+    agents_state_data = [_select_columns(os.path.join(data_dir, f'{agent_type}{STATE_DATA_SUFFIX}'), columns) for agent_type in agent_types]
+    target_state_data = _select_columns(os.path.join(data_dir, TARGET_STATE_FILE), columns)
     return agent_types, agents_state_data, target_state_data
 
-def get_nn_data() -> Tuple[List[str], List[pd.DataFrame]]:
-    """Load neural network data from CSV files."""
-    csv_nn_files = [f for f in os.listdir(DATA_DIR) if f.endswith(NN_DATA_SUFFIX)]
-    csv_nn_files.sort()
-    agent_types = [f.replace(NN_DATA_SUFFIX, '') for f in csv_nn_files]
-    agents_nn_data = [pd.read_csv(os.path.join(DATA_DIR, f)) for f in csv_nn_files]
+def get_nn_data(columns: Optional[Sequence[str]] = None, data_dir: Optional[str] = None) -> Tuple[List[str], List[pd.DataFrame]]:
+    """Load neural network data from CSV files, optionally restricted to `columns`."""
+    data_dir = DATA_DIR if data_dir is None else data_dir
+    agent_types = nn_agent_types(data_dir)
+    agents_nn_data = [_select_columns(os.path.join(data_dir, f'{agent_type}{NN_DATA_SUFFIX}'), columns) for agent_type in agent_types]
     return agent_types, agents_nn_data
 
+def get_nn_weight_data(agent_type: str, data_dir: Optional[str] = None) -> pd.DataFrame:
+    """Load the time column and all `Weight_*` columns of one agent."""
+    nn_file = os.path.join(DATA_DIR if data_dir is None else data_dir, f'{agent_type}{NN_DATA_SUFFIX}')
+    return read_columns(nn_file, ['Time'] + [c for c in read_header(nn_file) if c.startswith('Weight_')])
+
+def position_columns(columns: Sequence[str]) -> List[str]:
+    """State columns (`Position X/Y/Z` or `Position 1..n`) in logged order."""
+    return [c for c in columns if c.startswith('Position ')]
+
+def projection_pairs(num_states: int, max_panels: int = MAX_PROJECTION_PANELS) -> List[Tuple[int, int]]:
+    """Component pairs for 2D projections: all pairs if they fit in `max_panels`, else consecutive pairs."""
+    pairs = [(i, j) for i in range(num_states) for j in range(i + 1, num_states)]
+    if len(pairs) <= max_panels: return pairs
+    return [(i, i + 1) for i in range(num_states - 1)][:max_panels]
+
 def get_color_map(agent_types: List[str]) -> Dict[str, Tuple[float, ...]]:
     """Create a chronological color map by pulling from a standard, discrete color list."""
     cmap = plt.get_cmap('tab20')
@@ -56,96 +102,145 @@ def get_color_map(agent_types: List[str]) -> Dict[str, Tuple[float, ...]]:
         color_map[agent_type] = standard_colors[i % len(standard_colors)]
     return color_map
 
-def plot_from_csv() -> None:
-    """Generate all plots from CSV simulation data."""
+def reduce_series(x: Any, y: Any, max_points: int | None, method: str) -> Tuple[NDArray[Any], NDArray[Any]]:
+    """Downsample a series for rendering, or return it unchanged when `max_points` is None."""
+    if max_points is None: return np.asarray(x), np.asarray(y)
+    return downsample(np.asarray(x), np.asarray(y), max_points, method)
+
+def plot_from_csv(max_points: int | None = None, method: str = 'minmax', envelope: bool = False, data_dir: Optional[str] = None) -> None:
+    """Generate all plots from the CSV simulation data in `data_dir` (default `DATA_DIR`).
+
+    With `max_points` set, every series is downsampled with a shape-preserving algorithm
+    (`method` is 'minmax' or 'lttb') before drawing. With `envelope` set, each agent's weight
+    figure shows min/max and percentile bands instead of one line per weight.
+    """
     configure_plot()
-    agent_types, agents_state_data, target_state_data = get_simulation_data()
-    nn_agent_types, agents_nn_data = get_nn_data()
+    agent_types, agents_state_data, target_state_data = get_simulation_data(None, data_dir)
+    nn_types, agents_nn_data = get_nn_data(NN_METRIC_COLUMNS, data_dir)
 
     color_map = get_color_map(agent_types)
-    time_vals = agents_state_data[0]['Time']
 
-    # ─── Tracking Error Norm ───
+    figure_tracking_error(agent_types, agents_state_data, color_map, max_points, method)
+    figure_trajectories(agent_types, agents_state_data, target_state_data, color_map, max_points, method)
+    for nn_agent_type in nn_types: figure_weights(nn_agent_type, max_points, method, envelope, data_dir)
+    for column, ylabel in NN_METRIC_FIGURES.values(): figure_nn_metric(column, ylabel, nn_types, agents_nn_data, color_map, max_points, method)
+
+    plt.show()
+
+def figure_tracking_error(agent_types: List[str], agents_state_data: List[pd.DataFrame], color_map: Dict[str, Tuple[float, ...]], max_points: int | None, method: str) -> Figure:
+    """Tracking error norm of every agent, largest RMS first in the legend."""
     fig_te, ax_te = plt.subplots(figsize=(8, 6))
     plot_data = []
     for i, ad in enumerate(agents_state_data):
         te = ad['Tracking Error Norm']
         rms = np.sqrt(np.mean(te**2))
-        plot_data.append((agent_types[i], te, rms))
-    plot_data.sort(key=lambda x: x[2], reverse=True)
-    for agent_type, te, rms in plot_data:
-        ax_te.plot(time_vals, te, label=f'{agent_type.title()}: RMS {rms:.4f} m', color=color_map[agent_type], linestyle='solid')
+        plot_data.append((agent_types[i], ad['Time'], te, rms))
+    plot_data.sort(key=lambda x: x[3], reverse=True)
+    for agent_type, time_vals, te, rms in plot_data:
+        ax_te.plot(*reduce_series(time_vals, te, max_points, method), label=f'{agent_type.title()}: RMS {rms:.4f} m', color=color_map[agent_type], linestyle='solid')
     ax_te.set_xlabel('Time (s)')
     ax_te.set_ylabel('Tracking Error Norm (m)')
     ax_te.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
-    plt.tight_layout()
+    fig_te.tight_layout()
+    return fig_te
+
+def figure_weights(nn_agent_type: str, max_points: int | None, method: str, envelope: bool, data_dir: Optional[str] = None) -> Figure:
+    """All `Weight_*` series of one agent, or their envelope."""
+    nn = get_nn_weight_data(nn_agent_type, data_dir)
+    fig_nn_w, ax_nn_w = plt.subplots(figsize=(8, 6))
+    time_nn = nn['Time']
+    weight_cols = [c for c in nn.columns if c.startswith('Weight_')]
+    if envelope:
+        _plot_weight_envelope(ax_nn_w, time_nn, nn[weight_cols].to_numpy(), max_points)
+    else:
+        for col in weight_cols:
+            ax_nn_w.plot(*reduce_series(time_nn, nn[col], max_points, method), linestyle='solid')
+    ax_nn_w.set_title(f'Neural Network Weights for {nn_agent_type.title()}')
+    ax_nn_w.set_xlabel('Time (s)')
+    ax_nn_w.set_ylabel('Weight Value')
+    fig_nn_w.tight_layout()
+    return fig_nn_w
+
+def figure_nn_metric(column: str, ylabel: str, nn_types: List[str], agents_nn_data: List[pd.DataFrame], color_map: Dict[str, Tuple[float, ...]],
+                     max_points: int | None, method: str) -> Figure:
+    """One logged network metric (`column`) of every agent, overlaid."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    for agent_id, nn in zip(nn_types, agents_nn_data):
+        ax.plot(*reduce_series(nn['Time'], nn[column], max_points, method), label=agent_id.title(), color=color_map.get(agent_id, 'k'), linestyle='solid')
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel(ylabel)
+    ax.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
+    fig.tight_layout()
+    return fig
+
+def _reduce_trajectory(data: pd.DataFrame, max_points: int | None, columns: Sequence[str]) -> NDArray[Any]:
+    """Return the position columns as (points, components), keeping per-bucket extremes of every component when downsampling."""
+    positions: NDArray[Any] = data[list(columns)].to_numpy()
+    if max_points is not None: positions = positions[min_max_indices(positions, max_points)]
+    return positions
+
+def figure_trajectories(agent_types: List[str], agents_state_data: List[pd.DataFrame], target_state_data: pd.DataFrame, color_map: Dict[str, Tuple[float, ...]], max_points: int | None, method: str) -> List[Figure]:
+    """Draw state trajectories: 3D for three states, projections of the first three and pairwise components above that."""
+    columns = position_columns(target_state_data.columns)
+    labels = [c.replace('Position ', '') for c in columns]
+    series: List[Tuple[str, pd.DataFrame, Dict[str, Any]]] = [(agent_type.title(), ad, {'linestyle': 'solid', 'color': color_map[agent_type]}) for agent_type, ad in zip(agent_types, agents_state_data)]
+    series.append(('Target Trajectory', target_state_data, {'linestyle': 'dotted', 'color': 'black', 'linewidth': 2.0}))
+
+    if len(columns) == 1:
+        fig_series, ax_series = plt.subplots(figsize=(8, 6))
+        for label, data, style in series: ax_series.plot(*reduce_series(data['Time'], data[columns[0]], max_points, method), label=label, **style)
+        ax_series.set_xlabel('Time (s)')
+        ax_series.set_ylabel(f'{labels[0]} Position (m)')
+        ax_series.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
+        plt.tight_layout()
+        return [fig_series]
 
-    # ─── Spatial Trajectories over Time ───
     fig_traj = plt.figure(figsize=(8, 6))
-    ax_traj = fig_traj.add_subplot(111, projection='3d')
-    for i, pos in enumerate(agents_state_data):
-        x_vals = cast(Any, pos['Position X'].values)
-        y_vals = cast(Any, pos['Position Y'].values)
-        z_vals = cast(Any, pos['Position Z'].values)
-        ax_traj.plot(x_vals, y_vals, z_vals, label=agent_types[i].title(), linestyle='solid', color=color_map[agent_types[i]])
-    target_x = cast(Any, target_state_data['Position X'])
-    target_y = cast(Any, target_state_data['Position Y'])
-    target_z = cast(Any, target_state_data['Position Z'])
-    ax_traj.plot(target_x, target_y, target_z, label='Target Trajectory', linestyle='dotted', color='black', linewidth=2.0)
-    ax_traj.set_xlabel('X Position (m)')
-    ax_traj.set_ylabel('Y Position (m)')
-    ax_traj.set_zlabel('Z Position (m)')
+    ax_traj: Any
+    if len(columns) == 2:
+        ax_traj = fig_traj.add_subplot(111)
+    else:
+        ax_traj = fig_traj.add_subplot(111, projection='3d')
+    shown = columns[:3]
+    for label, data, style in series:
+        ax_traj.plot(*_reduce_trajectory(data, max_points, shown).T, label=label, **style)
+    ax_traj.set_xlabel(f'{labels[0]} Position (m)')
+    ax_traj.set_ylabel(f'{labels[1]} Position (m)')
+    if len(columns) >= 3:
+        ax_traj.set_zlabel(f'{labels[2]} Position (m)')
+        ax_traj.set_box_aspect((1, 1, 1))
+    if len(columns) > 3: ax_traj.set_title(f'Projection onto States {", ".join(labels[:3])}')
     ax_traj.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
-    ax_traj.set_box_aspect((1, 1, 1))
     plt.tight_layout()
-
-    # ─── Neural Network Weights (One Plot Per ID) ───
-    for i, nn in enumerate(agents_nn_data):
-        fig_nn_w, ax_nn_w = plt.subplots(figsize=(8, 6))
-        time_nn = nn['Time']
-        weight_cols = [c for c in nn.columns if c.startswith('Weight_')]
-        for col in weight_cols:
-            ax_nn_w.plot(time_nn, nn[col], linestyle='solid')
-        ax_nn_w.set_title(f'Neural Network Weights for {nn_agent_types[i].title()}')
-        ax_nn_w.set_xlabel('Time (s)')
-        ax_nn_w.set_ylabel('Weight Value')
-        plt.tight_layout()
-
-    # ─── Overlaid NN-related Plots ───
-    fig_fae, ax_fae = plt.subplots(figsize=(8, 6))
-    fig_lrs, ax_lrs = plt.subplots(figsize=(8, 6))
-    fig_nno, ax_nno = plt.subplots(figsize=(8, 6))
-
-    for i, nn in enumerate(agents_nn_data):
-        agent_id = nn_agent_types[i]
-        color = color_map.get(agent_id, 'k')
-        time_nn = nn['Time']
-        label = agent_id.title()
-
-        ax_fae.plot(time_nn, nn['Function Approximation Error Norm'], label=label, color=color, linestyle='solid')
-        ax_lrs.plot(time_nn, nn['Learning Rate Spectral Norm'], label=label, color=color, linestyle='solid')
-        ax_nno.plot(time_nn, nn['Neural Network Output'], label=label, color=color, linestyle='solid')
-
-    ax_fae.set_xlabel('Time (s)')
-    ax_fae.set_ylabel('Function Approximation Error Norm')
-    ax_fae.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
-    fig_fae.tight_layout()
-
-    ax_lrs.set_xlabel('Time (s)')
-    ax_lrs.set_ylabel('Learning Rate Spectral Norm')
-    ax_lrs.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
-    fig_lrs.tight_layout()
-
-    ax_nno.set_xlabel('Time (s)')
-    ax_nno.set_ylabel('Neural Network Output $(m/s^2)$')
-    ax_nno.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
-    fig_nno.tight_layout()
-
-    plt.show()
-
-def results() -> None:
+    if len(columns) <= 3: return [fig_traj]
+
+    # ─── Pairwise Projections ───
+    pairs = projection_pairs(len(columns))
+    num_cols = int(np.ceil(np.sqrt(len(pairs))))
+    num_rows = int(np.ceil(len(pairs) / num_cols))
+    fig_proj, axes = plt.subplots(num_rows, num_cols, figsize=(3 * num_cols, 3 * num_rows), squeeze=False)
+    reduced = [(label, _reduce_trajectory(data, max_points, columns), style) for label, data, style in series]
+    for ax, (i, j) in zip(axes.flat, pairs):
+        for label, positions, style in reduced: ax.plot(positions[:, i], positions[:, j], label=label, **style)
+        ax.set_xlabel(f'State {labels[i]}')
+        ax.set_ylabel(f'State {labels[j]}')
+    for ax in list(axes.flat)[len(pairs):]: ax.set_visible(False)
+    handles, legend_labels = axes.flat[0].get_legend_handles_labels()
+    fig_proj.legend(handles, legend_labels, loc='upper center', ncol=min(len(series), 4), frameon=True, edgecolor='black')
+    fig_proj.tight_layout(rect=(0, 0, 1, 0.92))
+    return [fig_traj, fig_proj]
+
+def _plot_weight_envelope(ax: Any, time_nn: Any, weights: NDArray[Any], max_points: int | None) -> None:
+    """Draw the min/max and percentile bands of all weights instead of individual lines."""
+    env = weight_envelope(np.asarray(time_nn), weights, max_points if max_points is not None else len(time_nn))
+    ax.fill_between(env.time, env.minimum, env.maximum, color='tab:blue', alpha=0.2, linewidth=0, label='Min/Max')
+    ax.fill_between(env.time, env.lower, env.upper, color='tab:blue', alpha=0.4, linewidth=0, label='5th-95th Percentile')
+    ax.plot(env.time, env.median, color='tab:blue', linestyle='solid', label='Median')
+    ax.legend(loc='best', fontsize=12, frameon=True, edgecolor='black')
+
+def results(max_points: int | None = None, method: str = 'minmax', envelope: bool = False, data_dir: Optional[str] = None) -> None:
     """Generate all results plots and visualizations."""
-    plot_from_csv()
+    plot_from_csv(max_points, method, envelope, data_dir)
 
 if __name__ == "__main__":
     results()
\ No newline at end of file
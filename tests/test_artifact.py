@@ -0,0 +1,97 @@
+"""
+Inference artifacts: a trained network exported to a versioned binary file, memory-mapped back
+as a frozen network that reproduces its outputs, and restorable into a network for more training.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.core.neural_network import NeuralNetwork
+from src.io import data_manager
+from src.io.artifact import ARTIFACT_MAGIC, ARTIFACT_SUFFIX, export_artifact, load_artifact, read_header
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.2,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 2,
+    "num_layers": 2,
+    "num_neurons": 4,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+    "catalog": False,
+}
+
+
+def test_run_exports_artifact_that_reproduces_the_trained_network() -> None:
+    inputs = np.random.default_rng(0).normal(size=(50, 3))
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        agent, _ = run_simulation_from_configs([{**TEST_CONFIG, "export_artifact": True}, {**TEST_CONFIG, "ID": "Proportional", "export_artifact": True}])
+        path = os.path.join(tmp, "Residual" + ARTIFACT_SUFFIX)
+        assert not os.path.exists(os.path.join(tmp, "Proportional" + ARTIFACT_SUFFIX))
+
+        start = time.perf_counter()
+        frozen = load_artifact(path)
+        assert time.perf_counter() - start < 0.1
+        assert isinstance(frozen.weights, np.memmap)
+        network = agent.neural_network
+        np.testing.assert_array_equal(frozen.weights, np.ravel(network.weights))
+        np.testing.assert_array_equal(frozen.learning_rate, network.learning_rate[agent.last_step])
+        np.testing.assert_allclose(frozen.predict_batch(inputs), network.forward_batch(inputs)[0], rtol=1e-12, atol=1e-14)
+        np.testing.assert_allclose(frozen.predict(inputs[0]), network.forward_batch(inputs[:1])[0][0], rtol=1e-12, atol=1e-14)
+        assert frozen.metadata["ID"] == "Residual" and frozen.metadata["learning_rate_step"] == agent.last_step
+
+        with open(path, "rb") as f: assert f.read(8) == ARTIFACT_MAGIC
+        header, data_start = read_header(path)
+        assert header["plan"]["num_blocks"] == 2 and data_start % 64 == 0
+
+        # Restoring continues training from the exported state
+        restored = NeuralNetwork(lambda step: np.zeros(3), {**TEST_CONFIG, "seed": 5})
+        frozen.restore(restored)
+        np.testing.assert_array_equal(restored.weights, network.weights)
+        np.testing.assert_array_equal(restored.learning_rate[0], network.learning_rate[agent.last_step])
+        with pytest.raises(ValueError):
+            frozen.restore(NeuralNetwork(lambda step: np.zeros(3), {**TEST_CONFIG, "num_neurons": 3}))
+
+
+def test_float32_masked_network_round_trip_and_format_checks() -> None:
+    config = {**TEST_CONFIG, "dtype": "float32"}
+    network = NeuralNetwork(lambda step: np.zeros(3), config)
+    mask = np.random.default_rng(1).random(network.weights.size) < 0.7
+    network.apply_mask(mask)
+    inputs = np.random.default_rng(2).normal(size=(10, 3))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = export_artifact(network, os.path.join(tmp, "masked" + ARTIFACT_SUFFIX), learning_rate_step=0)
+        frozen = load_artifact(path, mmap=False)
+        assert frozen.dtype == np.float32 and frozen.learning_rate is not None and frozen.learning_rate.shape == (network.num_active, network.num_active)
+        np.testing.assert_allclose(frozen.predict_batch(inputs), network.forward_batch(inputs)[0], rtol=1e-5)
+
+        restored = NeuralNetwork(lambda step: np.zeros(3), config)
+        frozen.restore(restored)
+        assert restored.mask is not None and network.mask is not None and np.array_equal(restored.mask, network.mask) and restored.num_active == network.num_active
+
+        with open(path, "r+b") as f: f.write(b"NOTANART")
+        with pytest.raises(ValueError):
+            load_artifact(path)
@@ -0,0 +1,62 @@
+"""
+Residual backward pass: the single sweep over recorded running sums gives the exact output
+Jacobian of deep residual stacks.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from src.core.neural_network import NeuralNetwork
+
+DEEP_CONFIG: dict[str, Any] = {
+    "time_step_delta": 0.01,
+    "final_time": 0.02,
+    "seed": 0,
+    "output_size": 3,
+    "num_blocks": 8,
+    "num_layers": 2,
+    "num_neurons": 3,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "sigmoid",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+}
+
+
+def _input(step: int) -> np.ndarray:
+    return np.array([0.4, -0.3, 0.2])
+
+
+def test_deep_jacobian_matches_finite_differences() -> None:
+    nn = NeuralNetwork(_input, DEEP_CONFIG)
+    weights = nn.weights.copy()
+    jacobian = nn.jacobian_raw(1)
+
+    epsilon = 1e-6
+    finite_difference = np.zeros_like(jacobian)
+    for k in range(weights.size):
+        shift = np.zeros_like(weights)
+        shift[k] = epsilon
+        nn.set_weights(weights + shift)
+        upper = nn.forward_raw(1)
+        nn.set_weights(weights - shift)
+        lower = nn.forward_raw(1)
+        finite_difference[:, k] = ((upper - lower) / (2 * epsilon)).ravel()
+    np.testing.assert_allclose(jacobian, finite_difference, atol=1e-7, rtol=1e-5)
+
+
+def test_forward_pass_records_block_inputs() -> None:
+    nn = NeuralNetwork(_input, DEEP_CONFIG)
+    _, (_, output, _, unactivated_layers_blocks, _, residual_sums) = nn._forward(1)
+    assert len(residual_sums) == DEEP_CONFIG["num_blocks"]
+    block_outputs = np.cumsum([block[-1] for block in unactivated_layers_blocks], axis=0)
+    np.testing.assert_allclose(np.array(residual_sums), block_outputs[:-1])
+    np.testing.assert_allclose(output, block_outputs[-1])
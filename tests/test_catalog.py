@@ -0,0 +1,109 @@
+"""
+Run catalog: every run registers its merged config, config hash, code version and summary
+metrics in SQLite, pointing at its output files, and runs can be ranked by any metric.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import main, run_simulation_from_configs
+from src.io import data_manager
+from src.io.catalog import CATALOG_FILE, config_hash, rank_runs
+from src.simulation import scheduler
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.3,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def test_config_hash_ignores_bookkeeping_keys() -> None:
+    assert config_hash(TEST_CONFIG) == config_hash({**TEST_CONFIG, "progress": False, "catalog_path": "elsewhere.sqlite"})
+    assert config_hash(TEST_CONFIG) != config_hash({**TEST_CONFIG, "k1": 2})
+    assert len(config_hash({**TEST_CONFIG, "weight_mask": np.ones(5)})) == 16
+
+
+def test_runs_register_metrics_matching_their_output_files() -> None:
+    configs = [TEST_CONFIG, {**TEST_CONFIG, "ID": "Proportional"}]
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        run_simulation_from_configs(configs)
+        run_simulation_from_configs([{**TEST_CONFIG, "ID": "Wide", "num_neurons": 6}])
+        rows = rank_runs(os.path.join(tmp, CATALOG_FILE), limit=None)
+        assert sorted(row["agent_id"] for row in rows) == ["Proportional", "Residual", "Wide"]
+        assert len({row["run_id"] for row in rows}) == 2
+        assert [row["rms_tracking_error"] for row in rows] == sorted(row["rms_tracking_error"] for row in rows)
+
+        residual = next(row for row in rows if row["agent_id"] == "Residual")
+        states = pd.read_csv(os.path.join(residual["output_dir"], residual["state_file"]))
+        network = pd.read_csv(os.path.join(residual["output_dir"], residual["nn_file"]))
+        assert residual["steps"] == len(states) == 29
+        assert residual["rms_tracking_error"] == pytest.approx(np.sqrt(np.mean(states["Tracking Error Norm"] ** 2)))
+        assert residual["final_fae"] == pytest.approx(network["Function Approximation Error Norm"].iloc[-1])
+        assert 0 <= residual["projection_fraction"] <= 1 and residual["wall_time"] > 0
+        assert residual["config_hash"] == config_hash(TEST_CONFIG) and residual["code_version"]
+
+        proportional = next(row for row in rows if row["agent_id"] == "Proportional")
+        assert proportional["final_fae"] is None and proportional["nn_file"] is None
+        assert [row["agent_id"] for row in rank_runs(os.path.join(tmp, CATALOG_FILE), "final_fae", agent_id="Wide")] == ["Wide"]
+        with pytest.raises(ValueError):
+            rank_runs(os.path.join(tmp, CATALOG_FILE), "config; DROP TABLE runs")
+
+        with sqlite3.connect(os.path.join(tmp, CATALOG_FILE)) as connection:
+            plan = " ".join(str(row) for row in connection.execute("EXPLAIN QUERY PLAN SELECT * FROM runs WHERE dynamics_type = 'chua' ORDER BY rms_tracking_error"))
+        assert "runs_dynamics_rms" in plan
+
+        main(["catalog", "--output-dir", tmp, "--metric", "final_fae"])
+        printed = " ".join(str(call.args[0]) for call in print.call_args_list)  # type: ignore[attr-defined]
+        assert "Residual" in printed and "Wide" in printed
+
+
+def test_catalog_can_be_disabled() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        run_simulation_from_configs([{**TEST_CONFIG, "catalog": False}])
+        assert not os.path.exists(os.path.join(tmp, CATALOG_FILE))
+
+
+def test_run_with_its_own_logger_registers_next_to_its_outputs() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        with data_manager.RunLogger(os.path.join(tmp, "own")) as logger:
+            run_simulation_from_configs([TEST_CONFIG], logger=logger)
+        assert not os.path.exists(os.path.join(tmp, CATALOG_FILE))
+        assert [row["output_dir"] for row in rank_runs(os.path.join(tmp, "own", CATALOG_FILE))] == [os.path.abspath(os.path.join(tmp, "own"))]
+
+
+def test_sweep_registers_every_job_in_one_catalog() -> None:
+    scenarios = [{"dynamics_type": "chua"}, {"dynamics_type": "trophic_dynamics"}]
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        scheduler.run_scenarios(scenarios, [TEST_CONFIG, {**TEST_CONFIG, "ID": "Proportional"}], max_workers=2, output_root=tmp)
+        rows = rank_runs(os.path.join(tmp, CATALOG_FILE), limit=None)
+    assert sorted((row["dynamics_type"], row["agent_id"]) for row in rows) == [
+        ("chua", "Proportional"), ("chua", "Residual"), ("trophic_dynamics", "Proportional"), ("trophic_dynamics", "Residual")]
+    assert {os.path.basename(row["output_dir"]) for row in rows} == {"chua", "trophic_dynamics"}
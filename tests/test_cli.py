@@ -0,0 +1,94 @@
+"""
+Command-line interface: subcommands, config directory/file arguments, output directory and
+lazy loading of the plotting stack.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import build_parser, load_configurations, main
+from src.io import data_manager
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+AGENT_CONFIG: dict[str, Any] = {
+    "ID": "CLI Agent",
+    "num_blocks": 0,
+    "num_layers": 1,
+    "num_neurons": 1,
+}
+COMMON_CONFIG: dict[str, Any] = {
+    "final_time": 0.05,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "chua",
+    "output_size": 3,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def _write_configs(config_dir: Path) -> Path:
+    config_dir.mkdir()
+    (config_dir / "config_common.json").write_text(json.dumps(COMMON_CONFIG))
+    (config_dir / "agent.json").write_text(json.dumps(AGENT_CONFIG))
+    (config_dir / "other.json").write_text(json.dumps({**AGENT_CONFIG, "ID": "Other"}))
+    return config_dir / "agent.json"
+
+
+def test_single_config_file_merges_baseline() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = _write_configs(Path(tmp) / "configs")
+        configs = load_configurations(config_file)
+        assert len(configs) == 1
+        assert configs[0]["ID"] == "CLI Agent" and configs[0]["dynamics_type"] == "chua"
+        assert [c["ID"] for c in load_configurations(config_file.parent)] == ["CLI Agent", "Other"]
+
+
+def test_parser_defaults_and_subcommands() -> None:
+    parser = build_parser()
+    args = parser.parse_args(["run", "--no-plot", "--output-dir", "out"])
+    assert (args.command, args.no_plot, args.output_dir, args.config) == ("run", True, "out", "configurations")
+    args = parser.parse_args(["sweep", "--scenario", "chua", "--scenario", "lorenz96", "--workers", "2"])
+    assert args.scenario == ["chua", "lorenz96"] and args.workers == 2
+
+
+def test_headless_run_skips_plotting_imports() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = _write_configs(Path(tmp) / "configs")
+        output_dir = os.path.join(tmp, "out")
+        probe = (
+            "import sys; import main; "
+            f"main.main(['run', '--config', {str(config_file)!r}, '--output-dir', {output_dir!r}, '--no-plot']); "
+            "print(sorted(m for m in ('matplotlib', 'pandas', 'scienceplots') if m in sys.modules))"
+        )
+        completed = subprocess.run([sys.executable, "-c", probe], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        assert completed.stdout.strip().splitlines()[-1] == "[]"
+        assert sorted(os.listdir(output_dir)) == ["CLI Agent_nn_data.csv", "CLI Agent_state_data.csv", "catalog.sqlite", "target_state_data.csv"]
+
+
+def test_run_writes_every_output_to_output_dir_without_changing_globals() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        config_file = _write_configs(Path(tmp) / "configs")
+        config_file.write_text(json.dumps({**AGENT_CONFIG, "store_weights": True}))
+        output_dir = os.path.join(tmp, "out")
+        data_dir = data_manager.DATA_DIR
+        main(["run", "--config", str(config_file), "--output-dir", output_dir, "--no-plot"])
+        assert data_manager.DATA_DIR == data_dir
+        assert {"CLI Agent_state_data.csv", "catalog.sqlite", "weight_store"} <= set(os.listdir(output_dir))
+        assert len(os.listdir(os.path.join(output_dir, "weight_store"))) == 1
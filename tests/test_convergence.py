@@ -0,0 +1,97 @@
+"""
+Steady-state detection: windowed settling criteria, per-agent freezing and whole-run
+early termination with recorded stop reasons.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+from src.simulation.convergence import ConvergenceMonitor
+
+BASE_CONFIG: dict[str, Any] = {
+    "final_time": 1.0,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "output_size": 3,
+    "num_blocks": 0,
+    "num_layers": 1,
+    "num_neurons": 1,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+    "early_stopping": True,
+    "settling_window": 0.1,
+}
+
+
+def test_monitor_requires_full_quiet_window() -> None:
+    monitor = ConvergenceMonitor({"time_step_delta": 0.01, "settling_window": 0.05,
+                                  "settling_error_tolerance": 0.1, "settling_weight_rate_tolerance": 1.0})
+    weights = np.zeros((4, 1))
+    quiet = np.full(3, 0.01)
+
+    assert not any(monitor.update(step, quiet, weights) for step in range(1, 5))
+    assert monitor.update(5, quiet, weights)
+
+    jumped = weights + 1.0    # weight rate of 200 per second stays in the window for 5 steps
+    assert not monitor.update(6, quiet, jumped)
+    assert not any(monitor.update(step, quiet, jumped) for step in range(7, 11))
+    assert monitor.update(11, quiet, jumped)
+    assert monitor.settled_step == 5
+
+
+def _run(configs: list[dict[str, Any]], tmp: str) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+    with patch("builtins.print"):
+        run_simulation_from_configs(configs)
+    data_dir = Path(data_manager.DATA_DIR)
+    states = {c["ID"]: pd.read_csv(data_dir / f"{c['ID']}_state_data.csv") for c in configs}
+    return states, pd.read_csv(data_dir / data_manager.RUN_SUMMARY_FILE)
+
+
+def test_settled_agents_are_frozen_and_recorded() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_cwd = Path.cwd()
+        orig_data_dir = data_manager.DATA_DIR
+        data_manager.DATA_DIR = os.path.join(tmp, "simulation_data")
+        try:
+            os.chdir(tmp)
+            loose = {**BASE_CONFIG, "ID": "Proportional", "settling_error_tolerance": 1e6, "settling_weight_rate_tolerance": 1e6}
+            strict = {**BASE_CONFIG, "ID": "Strict", "settling_error_tolerance": 0.0}
+            states, summary = _run([loose, strict], tmp)
+
+            assert len(states["Proportional"]) == 10
+            assert len(states["Strict"]) == 99
+            rows = summary.set_index("ID")
+            assert rows.loc["Proportional", "Stop Reason"] == "settled"
+            assert np.isclose(rows.loc["Proportional", "Stop Time"], 0.1)
+            assert rows.loc["Strict", "Stop Reason"] == "final_time"
+
+            # With run scope nothing stops until every agent has settled
+            states, summary = _run([{**loose, "early_stopping_scope": "run"}, strict], tmp)
+            assert len(states["Proportional"]) == 99
+            assert set(summary["Stop Reason"]) == {"final_time"}
+
+            states, summary = _run([{**loose, "early_stopping_scope": "run"}, {**loose, "ID": "Other"}], tmp)
+            assert len(states["Proportional"]) == len(states["Other"]) == 10
+        finally:
+            os.chdir(orig_cwd)
+            data_manager.DATA_DIR = orig_data_dir
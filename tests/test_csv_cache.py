@@ -0,0 +1,71 @@
+"""
+Column-selective CSV loading with an mtime/size-invalidated sidecar cache.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from src.io import csv_cache
+
+
+def _write_csv(path: Path, rows: int, offset: float = 0.0) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "Time": np.arange(rows) * 0.001,
+        "Tracking Error Norm": np.linspace(1.0, 0.0, rows) + offset,
+        "Weight_1": np.full(rows, 0.5),
+        "Weight_2": np.full(rows, -0.5),
+    })
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_selective_load_populates_and_reuses_cache() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Agent_nn_data.csv"
+        expected = _write_csv(path, 50)
+
+        df = csv_cache.read_columns(str(path), ["Time", "Tracking Error Norm"])
+        assert list(df.columns) == ["Time", "Tracking Error Norm"]
+        np.testing.assert_allclose(df["Tracking Error Norm"], expected["Tracking Error Norm"])
+        assert os.path.exists(csv_cache.cache_path(str(path)))
+
+        # Cached columns must be served without parsing the CSV again
+        with patch("src.io.csv_cache.pd.read_csv", side_effect=AssertionError("CSV re-parsed")):
+            cached = csv_cache.read_columns(str(path), ["Tracking Error Norm", "Time"])
+        np.testing.assert_allclose(cached["Time"], expected["Time"])
+
+        # New columns are parsed once and merged into the existing cache
+        csv_cache.read_columns(str(path), ["Weight_2"])
+        with patch("src.io.csv_cache.pd.read_csv", side_effect=AssertionError("CSV re-parsed")):
+            merged = csv_cache.read_columns(str(path), ["Time", "Weight_2"])
+        np.testing.assert_allclose(merged["Weight_2"], expected["Weight_2"])
+
+
+def test_cache_invalidated_when_csv_changes() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Agent_state_data.csv"
+        _write_csv(path, 20)
+        csv_cache.read_columns(str(path), ["Tracking Error Norm"])
+
+        updated = _write_csv(path, 30, offset=1.0)
+        df = csv_cache.read_columns(str(path), ["Tracking Error Norm"])
+
+        assert len(df) == 30
+        np.testing.assert_allclose(df["Tracking Error Norm"], updated["Tracking Error Norm"])
+
+
+def test_unknown_column_raises() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Agent_state_data.csv"
+        _write_csv(path, 5)
+        with pytest.raises(ValueError):
+            csv_cache.read_columns(str(path), ["Position Q"])
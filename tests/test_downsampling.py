@@ -0,0 +1,116 @@
+"""
+Downsampled rendering: shape-preserving reduction keeps extremes and endpoints, and
+the plotter renders long runs with downsampling and weight envelopes enabled.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import matplotlib
+import numpy as np
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation
+from src.io import data_manager
+from src.visualization.downsample import downsample, lttb_indices, min_max_indices, weight_envelope
+
+TEST_CONFIG = {
+    "final_time": 0.5,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "chua",
+    "ID": "Test Agent",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def test_min_max_preserves_extremes_and_endpoints() -> None:
+    rng = np.random.default_rng(0)
+    x = np.linspace(0.0, 90.0, 90_000)
+    y = np.sin(x) + 0.1 * rng.standard_normal(x.size)
+    y[12_345] = 5.0
+    y[54_321] = -5.0
+
+    xd, yd = downsample(x, y, 1_000, "minmax")
+
+    assert len(xd) <= 1_002
+    assert xd[0] == x[0] and xd[-1] == x[-1]
+    assert yd.max() == y.max() and yd.min() == y.min()
+    assert np.all(np.diff(xd) > 0)
+
+    columns = np.column_stack((y, -y, y**2))
+    indices = min_max_indices(columns, 600)
+    for k in range(columns.shape[1]):
+        assert columns[indices, k].max() == columns[:, k].max()
+        assert columns[indices, k].min() == columns[:, k].min()
+
+
+def test_lttb_returns_requested_count() -> None:
+    x = np.linspace(0.0, 10.0, 5_000)
+    y = np.exp(-x) * np.cos(5 * x)
+
+    indices = lttb_indices(x, y, 200)
+
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert int(np.argmax(y)) in indices
+
+
+def test_weight_envelope_bounds() -> None:
+    rng = np.random.default_rng(1)
+    time = np.linspace(0.0, 1.0, 1_001)
+    weights = rng.standard_normal((time.size, 40))
+
+    env = weight_envelope(time, weights, 100)
+
+    assert env.time.shape == env.maximum.shape and len(env.time) <= 100
+    assert env.maximum.max() == weights.max() and env.minimum.min() == weights.min()
+    assert np.all(env.minimum <= env.lower) and np.all(env.upper <= env.maximum)
+
+
+def test_plotting_with_downsampling_and_envelope() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_cwd = Path.cwd()
+        orig_data_dir = data_manager.DATA_DIR
+        data_manager.DATA_DIR = os.path.join(tmp, "simulation_data")
+        saved_style_use = plt.style.use
+        saved_usetex = plt.rcParams.get("text.usetex", False)
+
+        try:
+            plt.style.use = lambda *_: None
+            plt.rcParams["text.usetex"] = False
+
+            os.chdir(tmp)
+            with patch("builtins.print"):
+                run_simulation(TEST_CONFIG)
+
+            with patch("matplotlib.pyplot.show"):
+                from src.visualization.plotter import plot_from_csv
+                plot_from_csv(max_points=20, method="lttb", envelope=True)
+        finally:
+            os.chdir(orig_cwd)
+            data_manager.DATA_DIR = orig_data_dir
+            plt.style.use = saved_style_use
+            plt.rcParams["text.usetex"] = saved_usetex
+            plt.close("all")
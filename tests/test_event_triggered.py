@@ -0,0 +1,70 @@
+"""
+Event-triggered learning: updates only run when the tracking-error trigger holds, the network
+is frozen in between, and per-agent counters report the triggered fraction.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.core.entity import Agent
+from src.io import data_manager
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.5,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def _run(config: dict[str, Any]) -> Agent:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        agent, = run_simulation_from_configs([config])
+    return agent
+
+
+def test_always_triggered_run_matches_continuous_learning() -> None:
+    continuous = _run(TEST_CONFIG)
+    triggered = _run({**TEST_CONFIG, "event_triggered": True, "trigger_error_threshold": 0.0})
+    np.testing.assert_array_equal(triggered.neural_network.weights, continuous.neural_network.weights)
+    np.testing.assert_array_equal(triggered.positions[:, :triggered.last_step + 1], continuous.positions[:, :continuous.last_step + 1])
+    assert triggered.learning_updates == triggered.adaptive_steps == 49 and triggered.learning_fraction == 1.0
+    assert continuous.learning_fraction == 1.0
+
+
+def test_untriggered_steps_keep_the_network_frozen() -> None:
+    once = {**TEST_CONFIG, "event_triggered": True, "trigger_error_threshold": 1e9, "trigger_error_growth": 1e9}
+    for hold_output in (False, True):
+        # only the first step triggers, so the weights stay those after one update
+        first_update = _run({**TEST_CONFIG, "final_time": 0.02, "fused_integration": hold_output}).neural_network.weights
+        agent = _run({**once, "event_hold_output": hold_output, "fused_integration": hold_output})
+        assert agent.learning_updates == 1 and agent.adaptive_steps == 49
+        np.testing.assert_array_equal(agent.neural_network.weights, first_update)
+        np.testing.assert_array_equal(agent.neural_network.learning_rate[agent.last_step], agent.neural_network.learning_rate[1])
+
+    # the tracking error falls from about 41 below 10 within the first second, after which learning stops
+    thresholded = _run({**TEST_CONFIG, "final_time": 2.0, "event_triggered": True, "trigger_error_threshold": 10.0, "trigger_error_growth": 1e9})
+    assert 50 < thresholded.learning_updates < 150 and thresholded.adaptive_steps == 199
@@ -0,0 +1,76 @@
+"""
+Headless figure export: every figure rendered as an independent job on the Agg backend, written
+as PNG/PDF files, and skipped on the next export while its CSV inputs are unchanged.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import main, run_simulation_from_configs
+from src.io import data_manager
+from src.visualization.export import MANIFEST_FILE, export_figures
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.2,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+    "catalog": False,
+}
+FIGURES = ["function_approximation_error", "learning_rate_norm", "nn_output", "tracking_error", "trajectories", "weights_Proportional", "weights_Residual"]
+
+
+def test_export_writes_every_figure_and_skips_unchanged_ones() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        run_simulation_from_configs([TEST_CONFIG, {**TEST_CONFIG, "ID": "Proportional"}])
+        figure_dir = os.path.join(tmp, "figures")
+
+        report = export_figures(tmp, formats=("png", "pdf"), max_workers=2)
+        assert sorted(report.rendered) == FIGURES and not report.skipped
+        assert sorted(os.listdir(figure_dir)) == sorted([MANIFEST_FILE, *(f"{name}.{ext}" for name in FIGURES for ext in ("png", "pdf"))])
+        assert all(os.path.getsize(path) > 0 for path in report.files)
+
+        again = export_figures(tmp, formats=("png", "pdf"), max_workers=2)
+        assert not again.rendered and sorted(again.skipped) == FIGURES and again.files == report.files
+
+        # A rerun of one agent only redraws the figures that read its files
+        os.utime(os.path.join(tmp, "Residual_nn_data.csv"), ns=(0, 0))
+        backend, rc_params = plt.get_backend(), plt.rcParams.copy()
+        try:
+            plt.switch_backend("pdf")
+            partial = export_figures(tmp, formats=("png", "pdf"), max_workers=1)
+            # Serial export renders in this process but leaves its backend and style alone
+            assert plt.get_backend() == "pdf" and plt.rcParams == {**rc_params, "backend": "pdf"}
+        finally:
+            plt.switch_backend(backend)
+        assert sorted(partial.rendered) == ["function_approximation_error", "learning_rate_norm", "nn_output", "weights_Residual"]
+
+        os.remove(os.path.join(figure_dir, "tracking_error.png"))
+        assert export_figures(tmp, formats=("png", "pdf"), max_workers=1).rendered == ["tracking_error"]
+        assert sorted(export_figures(tmp, formats=("png",), max_workers=1).rendered) == FIGURES
+
+        main(["export", "--output-dir", tmp, "--workers", "1", "--force"])
+        assert "Exported 7 figures" in print.call_args[0][0]  # type: ignore[attr-defined]
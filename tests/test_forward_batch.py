@@ -0,0 +1,67 @@
+"""
+Batched forward evaluation: N samples with shared weights or a weight history match the
+per-step outputs and Jacobians.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from src.core.neural_network import NeuralNetwork
+
+CONFIG: dict[str, Any] = {
+    "time_step_delta": 0.01,
+    "final_time": 0.4,
+    "seed": 0,
+    "output_size": 3,
+    "num_blocks": 2,
+    "num_layers": 2,
+    "num_neurons": 4,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "sigmoid",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+}
+
+INPUTS = np.random.default_rng(1).normal(size=(40, 3))
+
+
+def test_batch_matches_per_step_with_shared_weights() -> None:
+    nn = NeuralNetwork(lambda step: INPUTS[step], CONFIG)
+    outputs, jacobians = nn.forward_batch(INPUTS, jacobian=True)
+    assert outputs.shape == (40, 3) and jacobians is not None and jacobians.shape == (40, 3, nn.weights.size)
+    for step in range(1, 40):
+        np.testing.assert_allclose(outputs[step], nn.forward_raw(step)[:, 0], atol=1e-12)
+        np.testing.assert_allclose(jacobians[step], nn.jacobian_raw(step), atol=1e-12)
+    assert nn.forward_batch(INPUTS)[1] is None
+
+
+def test_batch_matches_per_step_with_weight_history() -> None:
+    nn = NeuralNetwork(lambda step: INPUTS[step], CONFIG)
+    history = nn.weights[:, 0] + 0.3 * np.random.default_rng(2).normal(size=(40, nn.weights.size))
+    outputs, jacobians = nn.forward_batch(INPUTS, history, jacobian=True)
+    assert jacobians is not None
+    for step in range(1, 40, 7):
+        nn.set_weights(history[step].reshape(-1, 1))
+        np.testing.assert_allclose(outputs[step], nn.forward_raw(step)[:, 0], atol=1e-12)
+        np.testing.assert_allclose(jacobians[step], nn.jacobian_raw(step), atol=1e-12)
+    with pytest.raises(ValueError):
+        nn.forward_batch(INPUTS, history[:10])
+
+
+def test_masked_batch_jacobians_cover_the_active_weights() -> None:
+    nn = NeuralNetwork(lambda step: INPUTS[step], CONFIG)
+    nn.apply_mask(np.random.default_rng(3).random(nn.weights.size) < 0.5)
+    outputs, jacobians = nn.forward_batch(INPUTS, jacobian=True)
+    assert jacobians is not None and jacobians.shape == (40, 3, nn.num_active) and nn.num_active < nn.weights.size
+    for step in range(1, 40, 7):
+        np.testing.assert_allclose(outputs[step], nn.forward_raw(step)[:, 0], atol=1e-12)
+        np.testing.assert_allclose(jacobians[step], nn.jacobian_raw(step), atol=1e-12)
@@ -0,0 +1,57 @@
+"""
+Memoized forward and Jacobian evaluation: repeated queries for the same input and weight
+version reuse one forward pass, and any weight change invalidates the cache.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from src.core.neural_network import NeuralNetwork
+from tests.test_resnet_reference import CONFIG, EXPECTED_DTHETA, EXPECTED_Y, REFERENCE_WEIGHTS, _input
+
+
+def test_repeated_queries_reuse_one_forward_pass() -> None:
+    nn = NeuralNetwork(_input, CONFIG)
+    nn.set_weights(REFERENCE_WEIGHTS)
+
+    with patch.object(nn, "_run_forward_pass", wraps=nn._run_forward_pass) as forward, \
+         patch.object(nn, "_run_backward_pass", wraps=nn._run_backward_pass) as backward:
+        y = nn.forward_raw(0)
+        dtheta = nn.jacobian_raw(0)
+        nn.forward_raw(0)
+        nn.jacobian_raw(0)
+        assert forward.call_count == 1
+        assert backward.call_count == 1
+
+        np.testing.assert_allclose(y.ravel(), EXPECTED_Y, atol=1e-6, rtol=1e-6)
+        np.testing.assert_allclose(dtheta, EXPECTED_DTHETA, atol=1e-6, rtol=1e-6)
+
+        # train_step reuses the forward pass and Jacobian already computed for this step
+        nn.train_step(1, np.ones((3, 1)))
+        assert forward.call_count == 1
+        assert backward.call_count == 1
+
+        # the weight update bumped the version, so the next query recomputes
+        nn.forward_raw(1)
+        assert forward.call_count == 2
+
+
+def test_set_weights_invalidates_cache() -> None:
+    nn = NeuralNetwork(_input, CONFIG)
+    nn.set_weights(REFERENCE_WEIGHTS)
+    version = nn.weights_version
+    before = nn.forward_raw(0)
+
+    nn.set_weights(-REFERENCE_WEIGHTS)
+    assert nn.weights_version > version
+    after = nn.forward_raw(0)
+    assert not np.allclose(before, after)
+
+    # returned arrays are copies, so callers cannot corrupt cached results
+    after[:] = 0.0
+    assert not np.allclose(nn.forward_raw(0), 0.0)
@@ -0,0 +1,70 @@
+"""
+Fused per-agent integration: position, weights and the packed symmetric learning rate
+advance in one solver call per step and agree with the separate integrations over a step.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from src.core.entity import Agent, Target
+from src.simulation import integrate
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.1,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "chua",
+    "ID": "Residual Neural Network",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def _make_agent(fused: bool) -> Agent:
+    config = {**TEST_CONFIG, "fused_integration": fused}
+    time_steps = int(config["final_time"] / config["time_step_delta"])
+    target = Target(np.array([0.2, 0.0, 0.0]), time_steps, config)
+    target.update_dynamics(1)
+    return Agent(np.zeros(3), time_steps, config, target, config["ID"])
+
+
+def test_fused_step_uses_one_solver_call() -> None:
+    # entity and neural_network bind integrate_step by name, so count solver calls where it makes them
+    for fused, solver_calls in ((True, 1), (False, 3)):
+        agent = _make_agent(fused)
+        with patch.object(integrate, "solve_step", wraps=integrate.solve_step) as calls:
+            agent.compute_control_output(1)
+            agent.update_dynamics(1)
+        assert calls.call_count == solver_calls
+
+
+def test_fused_step_matches_separate_integration() -> None:
+    fused, separate = _make_agent(fused=True), _make_agent(fused=False)
+    for agent in (fused, separate):
+        agent.compute_control_output(1)
+        agent.update_dynamics(1)
+
+    learning_rate = fused.neural_network.learning_rate[1]
+    np.testing.assert_allclose(learning_rate, learning_rate.T)
+    np.testing.assert_allclose(learning_rate, separate.neural_network.learning_rate[1], rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(fused.positions[:, 1], separate.positions[:, 1], rtol=1e-9, atol=1e-12)
+    # the fused weight ODE sees the evolving learning rate instead of the value at the start of the step
+    np.testing.assert_allclose(fused.neural_network.weights, separate.neural_network.weights, rtol=0, atol=1e-5)
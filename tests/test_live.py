@@ -0,0 +1,86 @@
+"""
+Live dashboard: incremental CSV tailing by byte offset, bounded decimating buffers and
+refreshes against a run's output directory.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import matplotlib
+import numpy as np
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+from src.visualization.live import CSVTail, DecimatingBuffer, LiveDashboard
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.5,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def test_tail_reads_only_complete_appended_rows() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "a_state_data.csv")
+        with open(path, "w") as f: f.write("Time,Position X,Tracking Error Norm\n0.01,5,1.5\n0.02,6,")
+        tail = CSVTail(path, ["Time", "Tracking Error Norm"])
+        rows, restarted = tail.read_new()
+        np.testing.assert_array_equal(rows, [[0.01, 1.5]])
+        assert not restarted and tail.read_new()[0].shape == (0, 2)
+
+        with open(path, "a") as f: f.write("2.5\n0.03,7,3.5\n")
+        np.testing.assert_array_equal(tail.read_new()[0], [[0.02, 2.5], [0.03, 3.5]])
+
+        os.remove(path)
+        with open(path, "w") as f: f.write("Time,Position X,Tracking Error Norm\n0.01,1,9\n")
+        rows, restarted = tail.read_new()
+        assert restarted
+        np.testing.assert_array_equal(rows, [[0.01, 9.0]])
+
+
+def test_decimating_buffer_is_bounded_and_keeps_extremes() -> None:
+    buffer = DecimatingBuffer(100)
+    time_values = np.arange(10_000, dtype=np.float64) * 0.01
+    values = np.sin(time_values).astype(np.float64)
+    values[7777] = 50.0
+    for start in range(0, 10_000, 250): buffer.extend(time_values[start:start + 250], values[start:start + 250])
+    assert buffer.time.shape[0] <= 100
+    assert buffer.values.max() == 50.0 and np.all(np.diff(buffer.time) > 0)
+
+
+def test_dashboard_follows_run_output() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        dashboard = LiveDashboard(tmp, max_points=20)
+        assert dashboard.refresh() == 0
+        run_simulation_from_configs([TEST_CONFIG])
+        assert dashboard.refresh() == 2 * 49
+        assert dashboard.refresh() == 0
+        for key, line in dashboard.lines.items():
+            assert key[0] == "Residual" and 0 < len(line.get_xdata()) <= 20
+    plt.close("all")
@@ -0,0 +1,67 @@
+"""
+Real-time pacing: the loop holds the wall-clock step period, records latency, jitter and
+deadline misses, and the 'degrade' policy skips adaptation on late steps.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.2,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+    "real_time": True,
+}
+
+
+def test_paced_run_holds_the_step_period() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        start = time.perf_counter()
+        agent, = run_simulation_from_configs([TEST_CONFIG])
+        elapsed = time.perf_counter() - start
+        summary = pd.read_csv(os.path.join(tmp, "pacing_summary.csv"))
+    # step 19 is released 0.18 s after the start
+    assert elapsed >= 0.18
+    assert list(summary["ID"]) == ["Residual", "step"]
+    step_row = summary.iloc[1]
+    assert step_row["Steps"] == 19 and 0 <= step_row["Deadline Misses"] <= 19 and step_row["Degraded Steps"] == 0
+    assert 0 < summary.iloc[0]["Mean Latency"] <= summary.iloc[0]["Max Latency"]
+    assert agent.learning_updates == 19
+
+
+def test_degrade_policy_skips_adaptation_when_behind() -> None:
+    # a 10 µs period cannot be held, so every step after the first is released late
+    overloaded = {**TEST_CONFIG, "real_time_scale": 1e-3, "overrun_policy": "degrade"}
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        agent, = run_simulation_from_configs([overloaded])
+        step_row = pd.read_csv(os.path.join(tmp, "pacing_summary.csv")).iloc[-1]
+    assert step_row["Deadline Misses"] == 19 and step_row["Degraded Steps"] >= 18
+    assert agent.learning_updates == 19 - step_row["Degraded Steps"] and agent.adaptive_steps == 19
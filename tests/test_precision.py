@@ -0,0 +1,65 @@
+"""
+Single-precision mode: the network state is stored in float32, plant integration stays in
+float64, and the tracking error drifts from the float64 reference by less than the
+documented tolerance.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from src.core.entity import Agent, Target
+from src.simulation.precision import PRECISION_DRIFT_TOLERANCE, measure_precision_drift
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.5,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual Neural Network",
+    "output_size": 3,
+    "num_blocks": 2,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def test_float32_network_with_float64_plant() -> None:
+    config = {**TEST_CONFIG, "dtype": "float32"}
+    time_steps = int(config["final_time"] / config["time_step_delta"])
+    target = Target(np.array([40.0, 9.0, 2.0]), time_steps, config)
+    agent = Agent(np.zeros(3), time_steps, config, target, config["ID"])
+
+    for step in range(1, 5):
+        agent.compute_control_output(step)
+        agent.update_dynamics(step)
+        target.update_dynamics(step)
+
+    network = agent.neural_network
+    assert network.weights.dtype == np.float32
+    assert network.learning_rate.dtype == np.float32
+    assert network.neural_network_gradient_wrt_weights.dtype == np.float32
+    assert agent.positions.dtype == np.float64
+    assert target.positions.dtype == np.float64
+
+
+def test_float32_drift_against_float64_reference() -> None:
+    report = measure_precision_drift(TEST_CONFIG)
+
+    assert report["relative_rms_drift"] <= PRECISION_DRIFT_TOLERANCE
+    assert report["memory_bytes_float32"] * 2 == report["memory_bytes_float64"]
+    assert report["step_time_float32"] > 0.0 and report["step_time_float64"] > 0.0
@@ -0,0 +1,83 @@
+"""
+Preflight estimator: per-structure memory predictions, ring learning-rate storage and the
+memory budget that switches storage modes or refuses a run.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.core.neural_network import parameter_count
+from src.io import data_manager
+from src.simulation.preflight import OpCosts, estimate_resources, preflight
+
+COSTS = OpCosts(solver_call=1e-4, numpy_call=1e-6, flop=1e-9, logged_value=1e-7)
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.5,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+    "trajectory_buffer_size": 8,
+}
+
+
+def test_learning_rate_bytes_follow_storage_mode() -> None:
+    num_parameters = parameter_count(TEST_CONFIG)
+    full = estimate_resources(TEST_CONFIG, COSTS)
+    ring = estimate_resources({**TEST_CONFIG, "learning_rate_storage": "ring"}, COSTS)
+    assert full.learning_rate_bytes == 50 * num_parameters**2 * 8
+    assert ring.learning_rate_bytes == 8 * num_parameters**2 * 8
+    assert full.trajectory_bytes == 2 * 3 * 50 * 8
+    assert full.runtime_seconds > 0 and full.output_bytes > 0
+
+
+def test_budget_switches_to_ring_storage_or_refuses() -> None:
+    configs = [TEST_CONFIG, {**TEST_CONFIG, "ID": "Wide", "num_neurons": 6}]
+    estimates = [estimate_resources(config, COSTS) for config in configs]
+    # room for everything except the larger learning-rate history
+    budget_mb = (sum(e.memory_bytes for e in estimates) - estimates[1].learning_rate_bytes / 2) / 2**20
+    assert preflight(configs, COSTS) is configs
+
+    with patch("builtins.print"):
+        adjusted = preflight([{**configs[0], "memory_budget_mb": budget_mb}, configs[1]], COSTS)
+    assert adjusted[1]["learning_rate_storage"] == "ring"
+    assert "learning_rate_storage" not in adjusted[0] and "learning_rate_storage" not in configs[1]
+
+    with pytest.raises(ValueError):
+        preflight([{**configs[0], "memory_budget_mb": budget_mb, "memory_budget_action": "refuse"}, configs[1]], COSTS)
+    with pytest.raises(ValueError), patch("builtins.print"):
+        preflight([{**configs[0], "memory_budget_mb": 1e-6}, configs[1]], COSTS)
+
+
+def test_ring_learning_rate_storage_matches_full_storage() -> None:
+    agents = {}
+    for mode in ("full", "ring"):
+        with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+            agents[mode], = run_simulation_from_configs([{**TEST_CONFIG, "learning_rate_storage": mode}])
+    full, ring = agents["full"], agents["ring"]
+    np.testing.assert_array_equal(ring.neural_network.weights, full.neural_network.weights)
+    np.testing.assert_array_equal(ring.neural_network.learning_rate[ring.last_step], full.neural_network.learning_rate[full.last_step])
@@ -0,0 +1,73 @@
+"""
+Progress reporting: wall-clock throttling, per-agent step times and JSON-lines telemetry to a
+file and a UDP socket.
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+from src.io.progress import ProgressReporter
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.2,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def test_reporter_is_throttled_and_reports_agent_step_times() -> None:
+    stream = io.StringIO()
+    reporter = ProgressReporter(100, {"progress_interval": 3600}, stream)
+    reporter.add_time("Deep", 0.02)
+    assert reporter.update(1) is None
+    assert stream.getvalue() == ""
+
+    reporter.add_time("Deep", 0.02)
+    record = reporter.update(2, force=True)
+    assert record is not None and record["step"] == 2
+    assert abs(record["agent_step_ms"]["Deep"] - 20.0) < 1e-9
+    assert "steps/s" in stream.getvalue() and "slowest Deep" in stream.getvalue()
+
+
+def test_telemetry_goes_to_json_lines_and_socket() -> None:
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(5)
+    port = receiver.getsockname()[1]
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        log_path = os.path.join(tmp, "progress.jsonl")
+        run_simulation_from_configs([{**TEST_CONFIG, "progress_interval": 0, "progress_log": log_path, "progress_socket": f":{port}"}])
+        with open(log_path) as f: records = [json.loads(line) for line in f]
+    datagram = json.loads(receiver.recv(65536))
+    receiver.close()
+
+    assert [record["step"] for record in records] == list(range(1, 20))
+    assert records[-1]["eta"] == 0 and set(records[0]["agent_step_ms"]) == {"Residual"}
+    assert datagram == records[0]
@@ -0,0 +1,90 @@
+"""
+Run-scoped logging: each run writes through its own `RunLogger`, so runs sharing one interpreter
+and thread pool produce the same files as the same runs one after another.
+"""
+
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+from src.io.data_manager import RunLogger
+from src.simulation import scheduler
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.3,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+RUNS = {
+    "a": [TEST_CONFIG, {**TEST_CONFIG, "ID": "Proportional"}],
+    "b": [{**TEST_CONFIG, "seed": 3, "num_neurons": 4}],
+    "c": [{**TEST_CONFIG, "dynamics_type": "chua", "seed": 7}],
+}
+
+
+def read_files(directory: str) -> dict[str, str]:
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".csv"): continue
+        with open(os.path.join(directory, name)) as f: files[name] = f.read()
+    return files
+
+
+def test_logger_owns_its_directory_and_closes_on_exit() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        with RunLogger(os.path.join(tmp, "run"), buffer_size=5) as logger:
+            run_simulation_from_configs([{**TEST_CONFIG, "catalog": False}], logger=logger)
+            assert logger._file_handles and not any(handle.closed for handle in logger._file_handles.values())
+        assert not logger._file_handles
+        assert not os.path.exists(os.path.join(tmp, "simulation_data"))
+        assert sorted(os.listdir(os.path.join(tmp, "run"))) == ["Residual_nn_data.csv", "Residual_state_data.csv", "target_state_data.csv"]
+
+
+def test_concurrent_runs_match_sequential_runs() -> None:
+    def run(root: str, name: str) -> None:
+        with RunLogger(os.path.join(root, name)) as logger: run_simulation_from_configs(RUNS[name], logger=logger)
+
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        for name in RUNS: run(os.path.join(tmp, "sequential"), name)
+        with ThreadPoolExecutor(max_workers=len(RUNS)) as pool:
+            for future in [pool.submit(run, os.path.join(tmp, "threaded"), name) for name in RUNS]: future.result()
+
+        for name in RUNS:
+            assert read_files(os.path.join(tmp, "threaded", name)) == read_files(os.path.join(tmp, "sequential", name))
+        # Each run registers in a catalog next to its own outputs, not under DATA_DIR
+        assert sorted(os.listdir(tmp)) == ["sequential", "threaded"]
+        assert all(os.path.exists(os.path.join(tmp, mode, name, "catalog.sqlite")) for mode in ("sequential", "threaded") for name in RUNS)
+
+
+def test_thread_executor_scenarios_match_serial_scenarios() -> None:
+    scenarios = [{"dynamics_type": "chua"}, {"dynamics_type": "trophic_dynamics"}]
+    configs = [TEST_CONFIG, {**TEST_CONFIG, "ID": "Wide", "num_neurons": 4}]
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        scheduler.run_scenarios(scenarios, configs, max_workers=1, output_root=os.path.join(tmp, "serial"))
+        scheduler.run_scenarios(scenarios, configs, max_workers=2, output_root=os.path.join(tmp, "threaded"), executor="thread")
+        for name in ("chua", "trophic_dynamics"):
+            assert read_files(os.path.join(tmp, "threaded", name)) == read_files(os.path.join(tmp, "serial", name))
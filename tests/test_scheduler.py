@@ -0,0 +1,96 @@
+"""
+Multi-scenario scheduler: scenario × controller jobs ordered longest first, one precomputed
+target per scenario and one output directory per scenario.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+from src.simulation import scheduler
+
+BASE_CONFIG: dict[str, Any] = {
+    "final_time": 0.1,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+CONFIGS: list[dict[str, Any]] = [{**BASE_CONFIG, "ID": "Small"}, {**BASE_CONFIG, "ID": "Large", "num_neurons": 4}, {**BASE_CONFIG, "ID": "Proportional"}]
+SCENARIOS: list[dict[str, Any]] = [{"dynamics_type": "chua"}, {"name": "long trophic", "dynamics_type": "trophic_dynamics", "final_time": 0.2}]
+
+
+def test_jobs_are_ordered_longest_first() -> None:
+    jobs = scheduler.build_jobs(SCENARIOS, CONFIGS, "out")
+    assert [(job.scenario, job.config["ID"]) for job in jobs[:2]] == [("long_trophic", "Large"), ("long_trophic", "Small")]
+    assert [job.cost for job in jobs] == sorted((job.cost for job in jobs), reverse=True)
+    assert jobs[0].output_dir == os.path.join("out", "long_trophic")
+    assert jobs[0].config["final_time"] == 0.2 and jobs[-1].config["final_time"] == 0.1
+
+
+def test_scenarios_write_separate_directories_matching_single_runs() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        results = scheduler.run_scenarios(SCENARIOS, CONFIGS, max_workers=2, output_root=tmp)
+        assert len(results) == len(SCENARIOS) * len(CONFIGS)
+
+        for name in ("chua", "long_trophic"):
+            files = sorted(os.listdir(os.path.join(tmp, name)))
+            assert "target_state_data.csv" in files
+            assert {"Small_state_data.csv", "Large_nn_data.csv", "Proportional_state_data.csv"} <= set(files)
+
+        # A scheduled job reproduces a standalone run of the same controller on the same system
+        reference_dir = os.path.join(tmp, "reference")
+        data_dir, data_manager.DATA_DIR = data_manager.DATA_DIR, reference_dir
+        try:
+            run_simulation_from_configs([{**CONFIGS[1], "dynamics_type": "chua"}])
+        finally:
+            data_manager.DATA_DIR = data_dir
+        for file_name in ("Large_state_data.csv", "Large_nn_data.csv", "target_state_data.csv"):
+            pd.testing.assert_frame_equal(pd.read_csv(os.path.join(tmp, "chua", file_name)), pd.read_csv(os.path.join(reference_dir, file_name)))
+
+
+def test_memmap_sweep_keeps_each_scenario_trajectory_separate() -> None:
+    configs = [{**CONFIGS[0], "trajectory_storage": "memmap", "trajectory_buffer_size": 2}]
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        scheduler.run_scenarios(SCENARIOS, configs, max_workers=2, output_root=tmp, executor="thread")
+        for scenario in SCENARIOS:
+            name = scheduler.scenario_name(scenario)
+            positions = np.load(os.path.join(tmp, name, "trajectories", "Small_positions.npy"))
+            states = pd.read_csv(os.path.join(tmp, name, "Small_state_data.csv"))
+            assert positions.shape[0] == int(scenario.get("final_time", BASE_CONFIG["final_time"]) / BASE_CONFIG["time_step_delta"])
+            # each spilled trajectory is the one its own scenario's state file logged
+            np.testing.assert_allclose(positions[:len(states), 0], states["Position X"], rtol=1e-5, atol=1e-6)
+
+
+def test_jobs_of_one_scenario_must_share_the_target_horizon() -> None:
+    configs = [CONFIGS[0], {**CONFIGS[1], "final_time": 0.3}]
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        with pytest.raises(ValueError, match="final_time"):
+            scheduler.run_scenarios([{"dynamics_type": "chua"}], configs, max_workers=1, output_root=tmp)
+        # A scenario override gives every job the same horizon
+        results = scheduler.run_scenarios([{"dynamics_type": "chua", "final_time": 0.2}], configs, max_workers=1, output_root=tmp)
+        assert len(results) == 2
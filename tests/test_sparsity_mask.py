@@ -0,0 +1,89 @@
+"""
+Sparsity masks: masked networks skip pruned neurons, adapt only the active weights with a
+reduced learning-rate matrix, and prune by magnitude after a warm-up window.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.core.neural_network import NeuralNetwork, layer_weight_indices
+from src.io import data_manager
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.5,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 2,
+    "num_neurons": 4,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+INPUTS = np.random.default_rng(1).normal(size=(5, 3))
+
+
+def _mask(network: NeuralNetwork) -> np.ndarray:
+    mask = np.random.default_rng(3).random(np.size(network.weights)) > 0.3
+    first_layer = layer_weight_indices(3, 4, 2, 3, 1)[0][0]
+    mask[first_layer[:, 0]] = False    # no inputs or bias left for the first neuron of the first layer
+    return mask
+
+
+def test_masked_network_matches_dense_network_on_active_weights() -> None:
+    dense = NeuralNetwork(lambda step: INPUTS[step], TEST_CONFIG)
+    masked = NeuralNetwork(lambda step: INPUTS[step], TEST_CONFIG)
+    masked.apply_mask(_mask(masked))
+    dense.set_weights(masked.weights)
+    assert masked.mask is not None and masked._kept_layers is not None
+    assert masked._kept_layers[0][0][1].shape == (3,) and masked._kept_layers[0][1][0].shape == (4,)    # neuron dropped from both layers
+    assert masked.num_active == np.count_nonzero(masked.mask) < np.count_nonzero(_mask(masked))
+
+    np.testing.assert_allclose(masked.forward_raw(2), dense.forward_raw(2), atol=1e-14)
+    np.testing.assert_allclose(masked.jacobian_raw(2), dense.jacobian_raw(2)[:, masked.active_weights_index()], atol=1e-14)
+    assert masked.learning_rate_derivative(np.eye(masked.num_active), np.ones((3, masked.num_active))).shape == (masked.num_active, masked.num_active)
+
+
+def test_mask_file_run_keeps_masked_weights_at_zero() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        mask = _mask(NeuralNetwork(lambda step: INPUTS[step], TEST_CONFIG))
+        mask_path = os.path.join(tmp, "mask.npy")
+        np.save(mask_path, mask)
+        for fused in (False, True):
+            agent, = run_simulation_from_configs([{**TEST_CONFIG, "weight_mask": mask_path, "fused_integration": fused}])
+            network = agent.neural_network
+            assert network.learning_rate[agent.last_step].shape == (network.num_active, network.num_active)
+            assert np.all(network.weights[~mask] == 0) and np.all(network.weights[network.mask] != 0)
+
+
+def test_magnitude_pruning_after_warm_up() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        warm_up, = run_simulation_from_configs([{**TEST_CONFIG, "final_time": 0.21}])
+        pruned, = run_simulation_from_configs([{**TEST_CONFIG, "prune_threshold": 0.5, "prune_time": 0.2}])
+    before = np.ravel(warm_up.neural_network.weights)
+    network = pruned.neural_network
+    assert network.mask is not None
+    assert not np.any(network.mask[np.abs(before) < 0.5]) and 0 < network.num_active < np.size(network.weights)
+    assert network.learning_rate[pruned.last_step].shape == (network.num_active, network.num_active)
+    assert np.all(network.weights[~network.mask] == 0)
+    assert not np.allclose(np.ravel(network.weights)[network.mask], before[network.mask])    # active weights keep adapting
@@ -0,0 +1,86 @@
+"""
+Arbitrary state dimension: dimension-agnostic CSV headers, row-sliced state logging and
+projection plots for more than three states.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+from src.visualization import plotter
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.1,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 6,
+    "control_size": 6,
+    "dynamics_type": "lorenz96",
+    "ID": "Residual",
+    "output_size": 6,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def test_position_headers() -> None:
+    assert data_manager.position_headers(2) == ["Position X", "Position Y"]
+    assert data_manager.position_headers(3) == ["Position X", "Position Y", "Position Z"]
+    assert data_manager.position_headers(6) == [f"Position {i}" for i in range(1, 7)]
+    assert plotter.projection_pairs(4) == [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]
+    assert plotter.projection_pairs(12) == [(i, i + 1) for i in range(11)]
+
+
+def test_six_state_run_is_logged_and_plotted() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_data_dir = data_manager.DATA_DIR
+        orig_plot_dir = plotter.DATA_DIR
+        saved_style_use = plt.style.use
+        saved_usetex = plt.rcParams.get("text.usetex", False)
+        data_manager.DATA_DIR = plotter.DATA_DIR = tmp
+        try:
+            with patch("builtins.print"):
+                agent, = run_simulation_from_configs([TEST_CONFIG])
+
+            state = pd.read_csv(os.path.join(tmp, "Residual_state_data.csv"))
+            assert list(state.columns) == ["Time", *[f"Position {i}" for i in range(1, 7)], "Tracking Error Norm"]
+            np.testing.assert_allclose(state.iloc[-1, 1:7].to_numpy(), agent.positions[:, agent.last_step - 1])
+            target = pd.read_csv(os.path.join(tmp, "target_state_data.csv"))
+            assert list(target.columns) == ["Time", *[f"Position {i}" for i in range(1, 7)]]
+
+            plt.style.use = lambda *_: None
+            plt.rcParams["text.usetex"] = False
+            with patch("matplotlib.pyplot.show"):
+                plotter.plot_from_csv(max_points=20)
+            # trajectory projection of the first three states plus one panel per state pair
+            projection_figure = [plt.figure(n) for n in plt.get_fignums() if len(plt.figure(n).axes) > 1][0]
+            assert sum(ax.get_visible() for ax in projection_figure.axes) == 15
+        finally:
+            data_manager.DATA_DIR = orig_data_dir
+            plotter.DATA_DIR = orig_plot_dir
+            plt.style.use = saved_style_use
+            plt.rcParams["text.usetex"] = saved_usetex
+            plt.close("all")
@@ -0,0 +1,111 @@
+"""
+Successive halving: candidates ranked by tracking-error RMS at growing horizons, survivors
+continued from their in-memory state so their output matches a full run, schedule logged.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager
+from src.io.artifact import ARTIFACT_SUFFIX, load_artifact
+from src.io.data_manager import HALVING_SCHEDULE_FILE, RUN_SUMMARY_FILE, RunLogger
+from src.simulation.halving import rung_end_steps, rung_end_times, run_successive_halving, survivors_count
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.4,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+    "catalog": False,
+    "halving_initial_time": 0.1,
+}
+CANDIDATES = [
+    {**TEST_CONFIG, "ID": "Slow", "k1": 0.2},
+    {**TEST_CONFIG, "ID": "Residual"},
+    {**TEST_CONFIG, "ID": "Fast", "k1": 3},
+    {**TEST_CONFIG, "ID": "Wide", "num_neurons": 4, "k1": 2},
+    {**TEST_CONFIG, "ID": "Proportional", "k1": 0.5},
+]
+
+
+def test_schedule() -> None:
+    assert rung_end_times(0.4, 0.1, 2) == [0.1, 0.2, 0.4]
+    assert rung_end_times(1.0, 0.3, 3) == pytest.approx([0.3, 0.9, 1.0])
+    assert rung_end_times(0.3, 0.1, 3) == pytest.approx([0.1, 0.3])
+    assert survivors_count(5, 0.5, 1) == 3 and survivors_count(2, 0.25, 1) == 1 and survivors_count(4, 0.25, 2) == 2
+    with pytest.raises(ValueError):
+        rung_end_times(1.0, 0.1, 1.0)
+
+    # Rungs that would simulate no steps merge into the next one
+    assert rung_end_steps([0.1, 0.2, 0.4], 0.01, 40) == [10, 20, 39]
+    assert rung_end_steps([0.001, 0.002, 0.011, 0.012, 0.4], 0.01, 40) == [1, 39]
+
+
+def test_survivors_continue_and_match_full_runs() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        result = run_successive_halving(CANDIDATES)
+        with RunLogger(os.path.join(tmp, "reference")) as logger:
+            run_simulation_from_configs([CANDIDATES[0], CANDIDATES[2]], logger=logger)
+        schedule = pd.read_csv(os.path.join(tmp, HALVING_SCHEDULE_FILE))
+        summary = pd.read_csv(os.path.join(tmp, RUN_SUMMARY_FILE)).set_index("ID")
+        survivor = result.survivors[0].agent_type
+        eliminated_first = [entry.ID for entry in result.schedule if entry.rung == 0 and entry.decision == "eliminated"]
+
+        # 5 -> 3 -> 2 candidates, ranked by RMS at every rung
+        assert [len([e for e in result.schedule if e.rung == rung]) for rung in range(3)] == [5, 3, 2]
+        assert len(result.survivors) == 2 and len(eliminated_first) == 2
+        for rung in range(3):
+            rms = [e.rms_tracking_error for e in result.schedule if e.rung == rung]
+            assert rms == sorted(rms)
+        assert result.agent_steps == 10 * 5 + 10 * 3 + 19 * 2 < 39 * 5
+        assert list(schedule.columns) == ["Rung", "End Time", "ID", "RMS Tracking Error", "Rank", "Decision"] and len(schedule) == 10
+        assert summary.loc[survivor, "Stop Reason"] == "final_time"
+        assert set(summary.index[summary["Stop Reason"] == "eliminated"]) == {e.ID for e in result.schedule if e.decision == "eliminated"}
+
+        # Surviving (and eliminated) candidates log exactly what a full run of the same config logs, up to their stop
+        for agent in result.agents:
+            if agent.agent_type not in ("Slow", "Fast"): continue
+            for suffix in ("_state_data.csv", "_nn_data.csv"):
+                raced = pd.read_csv(os.path.join(tmp, agent.agent_type + suffix))
+                full = pd.read_csv(os.path.join(tmp, "reference", agent.agent_type + suffix))
+                pd.testing.assert_frame_equal(raced, full.iloc[:len(raced)])
+                assert len(raced) == (39 if agent.stop_reason == "final_time" else 10 if agent.agent_type in eliminated_first else 20)
+
+
+def test_race_stores_and_exports_like_a_run_and_rejects_unsupported_modes() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        candidates = [{**config, "export_artifact": True, "store_weights": True, "weight_store_dir": os.path.join(tmp, "store")} for config in CANDIDATES[:3]]
+        result = run_successive_halving(candidates)
+        for agent in result.agents:
+            assert os.path.exists(os.path.join(tmp, agent.agent_type + ARTIFACT_SUFFIX))
+            assert load_artifact(os.path.join(tmp, agent.agent_type + ARTIFACT_SUFFIX)).metadata["learning_rate_step"] == agent.last_step
+        assert len(os.listdir(os.path.join(tmp, "store"))) > 0
+
+        for key in ("early_stopping", "real_time"):
+            with pytest.raises(ValueError, match=key):
+                run_successive_halving([{**CANDIDATES[0], key: True}, CANDIDATES[1]])
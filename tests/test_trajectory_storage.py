@@ -0,0 +1,96 @@
+"""
+Bounded-memory trajectory storage: ring buffers keep only recent steps, memory-mapped
+storage spills history to disk, and both reproduce the full-storage simulation.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation
+from src.core.storage import MemmapTrajectory, RingTrajectory
+from src.io import data_manager
+
+TEST_CONFIG: dict[str, Any] = {
+    "final_time": 0.3,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "chua",
+    "ID": "Residual Neural Network",
+    "output_size": 3,
+    "num_blocks": 2,
+    "num_layers": 1,
+    "num_neurons": 1,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 2,
+    "k1": 1,
+}
+
+
+def test_ring_trajectory_keeps_recent_steps() -> None:
+    ring = RingTrajectory(3, 100, capacity=4)
+    ring[:, 0] = np.array([1.0, 2.0, 3.0])
+    for step in range(1, 10):
+        ring[:, step] = ring[:, step - 1] + 1.0
+    ring[1, 9] = -1.0
+
+    np.testing.assert_array_equal(ring[:, 9], [10.0, -1.0, 12.0])
+    assert ring[2, 8] == 11.0
+    np.testing.assert_array_equal(ring[:, 50], np.zeros(3))
+    with pytest.raises(IndexError):
+        ring[:, 2]
+
+
+def test_memmap_trajectory_spills_history_to_disk() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "agent_positions.npy")
+        traj = MemmapTrajectory(2, 20, capacity=3, path=path)
+        for step in range(20):
+            traj[:, step] = np.array([step, -step], dtype=float)
+
+        np.testing.assert_array_equal(traj[:, 2], [2.0, -2.0])
+        history = traj.history()
+        assert history is not None
+        np.testing.assert_array_equal(history[0], np.arange(20))
+        traj.close()
+        np.testing.assert_array_equal(np.load(path)[:, 1], -np.arange(20))
+
+
+@pytest.mark.parametrize("storage", ["ring", "memmap"])
+def test_bounded_storage_matches_full_storage(storage: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        orig_cwd = Path.cwd()
+        orig_data_dir = data_manager.DATA_DIR
+        try:
+            os.chdir(tmp)
+            results = {}
+            for mode in ("full", storage):
+                data_manager.DATA_DIR = os.path.join(tmp, mode)
+                config = {**TEST_CONFIG, "trajectory_storage": mode, "trajectory_buffer_size": 2,
+                          "trajectory_dir": os.path.join(tmp, mode, "trajectories")}
+                with patch("builtins.print"):
+                    run_simulation(config)
+                results[mode] = pd.read_csv(Path(data_manager.DATA_DIR) / "Residual Neural Network_state_data.csv")
+
+            pd.testing.assert_frame_equal(results["full"], results[storage])
+            if storage == "memmap":
+                assert (Path(tmp) / storage / "trajectories" / "target_positions.npy").exists()
+        finally:
+            os.chdir(orig_cwd)
+            data_manager.DATA_DIR = orig_data_dir
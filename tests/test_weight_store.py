@@ -0,0 +1,92 @@
+"""
+Warm-start weight store: entries keyed by architecture, dynamics and config hash, closest-entry
+lookup, least-recently-used size eviction and warm-started runs.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+
+from main import run_simulation_from_configs
+from src.io import data_manager, weight_store
+
+BASE_CONFIG: dict[str, Any] = {
+    "final_time": 1.0,
+    "time_step_delta": 0.01,
+    "seed": 0,
+    "num_states": 3,
+    "control_size": 3,
+    "dynamics_type": "trophic_dynamics",
+    "ID": "Residual",
+    "output_size": 3,
+    "num_blocks": 1,
+    "num_layers": 1,
+    "num_neurons": 2,
+    "inner_activation": "swish",
+    "output_activation": "tanh",
+    "shortcut_activation": "swish",
+    "minimum_singular_value": 0.01,
+    "initial_learning_rate": 1,
+    "maximum_singular_value": 8,
+    "weight_bounds": 4,
+    "k1": 1,
+}
+
+
+def test_closest_entry_prefers_exact_hash_then_dynamics() -> None:
+    with tempfile.TemporaryDirectory() as store:
+        weights, learning_rate = np.ones((5, 1)), np.eye(5)
+        chua_k2 = weight_store.save_entry({**BASE_CONFIG, "dynamics_type": "chua", "k1": 2}, weights, learning_rate, 10, store)
+        trophic_k2 = weight_store.save_entry({**BASE_CONFIG, "k1": 2}, weights, learning_rate, 10, store)
+        weight_store.save_entry({**BASE_CONFIG, "num_neurons": 3}, weights, learning_rate, 10, store)
+
+        assert weight_store.find_closest({**BASE_CONFIG, "k1": 2}, store) == trophic_k2
+        assert weight_store.find_closest(BASE_CONFIG, store) == trophic_k2
+        assert weight_store.find_closest({**BASE_CONFIG, "dynamics_type": "chua"}, store) == chua_k2
+        assert weight_store.find_closest({**BASE_CONFIG, "num_blocks": 2}, store) is None
+
+
+def test_eviction_removes_least_recently_used() -> None:
+    with tempfile.TemporaryDirectory() as store:
+        weights, learning_rate = np.ones((100, 1)), np.eye(100)
+        paths = [weight_store.save_entry({**BASE_CONFIG, "k1": k1}, weights, learning_rate, 10, store) for k1 in (1, 2, 3)]
+        for age, path in enumerate(paths): os.utime(path, ns=(age * 10**9, age * 10**9))
+        weight_store.load_entry(paths[0])    # touching an entry makes it the most recently used
+
+        entry_bytes = os.path.getsize(paths[0])
+        removed = weight_store.evict(store, 2 * entry_bytes)
+        assert removed == [paths[1]]
+        assert sorted(os.listdir(store)) == sorted(os.path.basename(p) for p in (paths[0], paths[2]))
+
+
+def test_warm_started_run_starts_from_stored_state() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch("builtins.print"):
+        config = {**BASE_CONFIG, "weight_store_dir": os.path.join(tmp, "store")}
+        with patch.object(data_manager, "DATA_DIR", os.path.join(tmp, "cold")):
+            cold, = run_simulation_from_configs([{**config, "store_weights": True}])
+        stored_weights, stored_learning_rate, metadata = weight_store.load_entry(weight_store.entry_path(config, config["weight_store_dir"]))
+        np.testing.assert_array_equal(stored_weights, cold.neural_network.weights)
+        np.testing.assert_array_equal(stored_learning_rate, cold.neural_network.learning_rate[cold.last_step])
+        assert metadata["steps"] == cold.last_step
+
+        with patch.object(data_manager, "DATA_DIR", os.path.join(tmp, "warm")):
+            warm, = run_simulation_from_configs([{**config, "warm_start": True}])
+        cold_errors = pd.read_csv(os.path.join(tmp, "cold", "Residual_state_data.csv"))["Tracking Error Norm"]
+        warm_errors = pd.read_csv(os.path.join(tmp, "warm", "Residual_state_data.csv"))["Tracking Error Norm"]
+        assert not np.allclose(warm.neural_network.weights, cold.neural_network.weights)
+        assert np.sqrt(np.mean(warm_errors**2)) < np.sqrt(np.mean(cold_errors**2))
+
+
+def test_default_store_follows_the_data_directory() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(data_manager, "DATA_DIR", tmp), patch("builtins.print"):
+        run_simulation_from_configs([{**BASE_CONFIG, "store_weights": True, "catalog": False}])
+        assert weight_store.list_entries() and os.path.dirname(weight_store.list_entries()[0][0]) == os.path.join(tmp, "weight_store")
+        assert weight_store.find_closest(BASE_CONFIG) == weight_store.entry_path(BASE_CONFIG)